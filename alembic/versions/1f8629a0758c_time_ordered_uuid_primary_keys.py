@@ -0,0 +1,86 @@
+"""Time-ordered UUIDv7 primary keys
+
+Revision ID: 1f8629a0758c
+Revises: 208f379e48f6
+Create Date: 2026-10-16 23:45:12.402816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f8629a0758c'
+down_revision: Union[str, None] = '208f379e48f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing v4 keys stay as they are: v4 and v7 values share the uuid column
+# type, so only newly inserted rows pick up time-ordered keys.
+UUID_TABLES = [
+    'businesses',
+    'contacts',
+    'sources',
+    'coverage_zip_list',
+    'business_sources',
+    'source_contacts',
+    'business_contacts',
+    'emails',
+    'web_search_results',
+]
+
+# Tables that carried gen_random_uuid() defaults from 9c8dcbe11a51
+RANDOM_DEFAULT_TABLES = ['businesses', 'contacts', 'sources', 'coverage_zip_list']
+
+
+def _uuid_id_tables() -> list:
+    inspector = sa.inspect(op.get_bind())
+    tables = []
+    for table in UUID_TABLES:
+        if not inspector.has_table(table):
+            continue
+        if any(column['name'] == 'id' for column in inspector.get_columns(table)):
+            tables.append(table)
+    return tables
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite stores whatever the application generates; nothing to migrate
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    # Server-side v7 generator so raw SQL and COPY loads get ordered keys too
+    op.execute('''
+    CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+        SELECT encode(
+            set_bit(
+                set_bit(
+                    overlay(uuid_send(gen_random_uuid())
+                        placing substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6),
+                    52, 1),
+                53, 1),
+            'hex')::uuid;
+    $$ LANGUAGE SQL VOLATILE
+    ''')
+
+    for table in _uuid_id_tables():
+        op.alter_column(table, 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in _uuid_id_tables():
+        if table in RANDOM_DEFAULT_TABLES:
+            op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+        else:
+            op.alter_column(table, 'id', server_default=None)
+
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
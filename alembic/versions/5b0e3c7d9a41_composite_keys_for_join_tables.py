@@ -0,0 +1,79 @@
+"""Composite keys for join tables
+
+Revision ID: 5b0e3c7d9a41
+Revises: 1f8629a0758c
+Create Date: 2026-10-16 23:58:03.118274
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0e3c7d9a41'
+down_revision: Union[str, None] = '1f8629a0758c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table: (primary key columns, reverse index column)
+JOIN_TABLES = {
+    'business_sources': (['business_id', 'source_id'], 'source_id'),
+    'source_contacts': (['source_id', 'contact_id'], 'contact_id'),
+    'business_contacts': (['business_id', 'contact_id'], 'contact_id'),
+}
+
+
+def _remove_duplicates(table: str, columns: list) -> None:
+    """Keep one row per key pair so the composite primary key can be created."""
+    a, b = columns
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f'''
+            DELETE FROM {table} t USING {table} d
+            WHERE t.{a} = d.{a} AND t.{b} = d.{b} AND t.ctid > d.ctid
+        ''')
+    else:
+        op.execute(f'''
+            DELETE FROM {table} WHERE rowid NOT IN (
+                SELECT MIN(rowid) FROM {table} GROUP BY {a}, {b}
+            )
+        ''')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (columns, reverse) in JOIN_TABLES.items():
+        _remove_duplicates(table, columns)
+        with op.batch_alter_table(table) as batch_op:
+            # Dropping the surrogate key drops its primary key constraint with it
+            batch_op.drop_column('id')
+            batch_op.create_primary_key(f'{table}_pkey', columns)
+            batch_op.create_index(f'ix_{table}_{reverse}', [reverse], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for table, (columns, reverse) in JOIN_TABLES.items():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f'ix_{table}_{reverse}')
+            batch_op.drop_constraint(f'{table}_pkey', type_='primary')
+            batch_op.add_column(sa.Column('id', postgresql.UUID(as_uuid=True), nullable=True))
+
+        if bind.dialect.name == 'postgresql':
+            op.execute(f'UPDATE {table} SET id = gen_random_uuid()')
+        else:
+            a, b = columns
+            rows = bind.execute(sa.text(f'SELECT {a}, {b} FROM {table}')).all()
+            for row in rows:
+                bind.execute(
+                    sa.text(f'UPDATE {table} SET id = :id WHERE {a} = :a AND {b} = :b'),
+                    {'id': uuid.uuid4().hex, 'a': row[0], 'b': row[1]},
+                )
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('id', nullable=False)
+            batch_op.create_primary_key(f'{table}_pkey', ['id'])
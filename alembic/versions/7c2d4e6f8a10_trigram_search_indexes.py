@@ -0,0 +1,44 @@
+"""Trigram search indexes on businesses
+
+Revision ID: 7c2d4e6f8a10
+Revises: 5b0e3c7d9a41
+Create Date: 2026-10-17 00:06:41.527719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+from app.core.search import SEARCH_COLUMNS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d4e6f8a10'
+down_revision: Union[str, None] = '5b0e3c7d9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite gets its FTS5 search table from app.core.search at engine start
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        create_index_concurrently(
+            f'ix_businesses_{column}_trgm', 'businesses', [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in SEARCH_COLUMNS:
+        drop_index_concurrently(f'ix_businesses_{column}_trgm', 'businesses')
@@ -0,0 +1,42 @@
+"""Business facet counts
+
+Revision ID: a3f1c9e2b7d4
+Revises: 7c2d4e6f8a10
+Create Date: 2026-10-17 00:41:12.904381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.facets import rebuild
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9e2b7d4'
+down_revision: Union[str, None] = '7c2d4e6f8a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'business_facet_counts',
+        sa.Column('state', sa.String(length=255), nullable=False, server_default=''),
+        sa.Column('industry', sa.String(length=255), nullable=False, server_default=''),
+        sa.Column('source_id', sa.String(length=36), nullable=False, server_default=''),
+        sa.Column('has_email', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('has_phone', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('has_website', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('state', 'industry', 'source_id', 'has_email', 'has_phone', 'has_website'),
+    )
+    # Counts for the businesses already there; the write paths keep them current from here
+    rebuild(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('business_facet_counts')
@@ -0,0 +1,45 @@
+"""Business zip key
+
+Revision ID: a8d4c2e6b517
+Revises: f2c6d8e4a913
+Create Date: 2026-10-17 04:02:19.348126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import backfill_in_batches, create_index_concurrently, drop_index_concurrently
+from app.services.formatter import Formatter
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4c2e6b517'
+down_revision: Union[str, None] = 'f2c6d8e4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _zip_keys(rows) -> list[dict]:
+    format = Formatter()
+    return [{"id": row.id, "zip_key": format.zip_key(row.zip)} for row in rows]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('businesses', sa.Column('zip_key', sa.String(length=5), nullable=True))
+    backfill_in_batches(
+        'businesses',
+        transform=_zip_keys,
+        columns=('zip',),
+        where="zip_key IS NULL AND zip IS NOT NULL AND zip != ''",
+        name='businesses:zip_key',
+    )
+    create_index_concurrently('ix_businesses_zip_key_name_key', 'businesses', ['zip_key', 'name_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_businesses_zip_key_name_key', 'businesses')
+    op.drop_column('businesses', 'zip_key')
@@ -0,0 +1,58 @@
+"""Business lookup keys
+
+Revision ID: d5e8f2a6c391
+Revises: a3f1c9e2b7d4
+Create Date: 2026-10-17 01:52:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import backfill_in_batches, create_index_concurrently, drop_index_concurrently
+from app.services.formatter import Formatter
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8f2a6c391'
+down_revision: Union[str, None] = 'a3f1c9e2b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The keys as of this revision, each with its length and the column it is derived
+# from; later keys (zip_key) come with their own revisions
+_LENGTHS = {'phone_key': 20, 'domain_key': 255, 'email_key': 255, 'name_key': 255}
+_SOURCES = {'phone_key': 'phone', 'domain_key': 'website', 'email_key': 'email', 'name_key': 'name'}
+
+
+def _lookup_keys(rows) -> list[dict]:
+    format = Formatter()
+    return [
+        {"id": row.id, **{key: getattr(format, key)(getattr(row, column)) for key, column in _SOURCES.items()}}
+        for row in rows
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for key, length in _LENGTHS.items():
+        op.add_column('businesses', sa.Column(key, sa.String(length=length), nullable=True))
+    # Computed in Python by the same Formatter methods the write paths use
+    backfill_in_batches(
+        'businesses',
+        transform=_lookup_keys,
+        columns=tuple(_SOURCES.values()),
+        where="name_key IS NULL",
+        name='businesses:lookup_keys',
+    )
+    for key in _LENGTHS:
+        create_index_concurrently(f'ix_businesses_{key}', 'businesses', [key])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for key in _LENGTHS:
+        drop_index_concurrently(f'ix_businesses_{key}', 'businesses')
+    for key in _LENGTHS:
+        op.drop_column('businesses', key)
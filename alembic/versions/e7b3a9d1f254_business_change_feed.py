@@ -0,0 +1,47 @@
+"""Business change feed
+
+Revision ID: e7b3a9d1f254
+Revises: d5e8f2a6c391
+Create Date: 2026-10-17 02:31:08.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.migrations import backfill_in_batches, create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3a9d1f254'
+down_revision: Union[str, None] = 'd5e8f2a6c391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'business_tombstones',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('deleted', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_business_tombstones_deleted', 'business_tombstones', ['deleted'])
+    # The change feed cannot order rows without a timestamp
+    backfill_in_batches(
+        'businesses',
+        "updated = COALESCE(created, CURRENT_TIMESTAMP)",
+        where="updated IS NULL",
+    )
+    create_index_concurrently('ix_businesses_updated', 'businesses', ['updated'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_businesses_updated', 'businesses')
+    op.drop_index('ix_business_tombstones_deleted', table_name='business_tombstones')
+    op.drop_table('business_tombstones')
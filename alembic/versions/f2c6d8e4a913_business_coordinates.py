@@ -0,0 +1,50 @@
+"""Business coordinates
+
+Revision ID: f2c6d8e4a913
+Revises: e7b3a9d1f254
+Create Date: 2026-10-17 03:14:52.660317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.geo import geo_values, zip5, zip_centroids
+from app.core.migrations import backfill_in_batches, create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8e4a913'
+down_revision: Union[str, None] = 'e7b3a9d1f254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _locate(rows) -> list[dict]:
+    centroids = zip_centroids(op.get_bind(), (row.zip for row in rows))
+    return [{"id": row.id, **geo_values(centroids[zip5(row.zip)])} for row in rows if zip5(row.zip) in centroids]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('businesses', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('businesses', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('businesses', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    # ZIPs missing from zip_codes stay unlocated; POST /internal/geo/locate fills them in later
+    backfill_in_batches(
+        'businesses',
+        transform=_locate,
+        columns=('zip',),
+        where="latitude IS NULL AND zip IS NOT NULL AND zip != ''",
+        name='businesses:coordinates',
+    )
+    create_index_concurrently('ix_businesses_geo_cell', 'businesses', ['geo_cell'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_businesses_geo_cell', 'businesses')
+    op.drop_column('businesses', 'geo_cell')
+    op.drop_column('businesses', 'longitude')
+    op.drop_column('businesses', 'latitude')
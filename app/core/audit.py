@@ -0,0 +1,99 @@
+import os
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.config import config
+from app.services.logger import Logger
+
+log = Logger('core-audit', log_level='INFO')
+
+_APP_DIR = os.path.join(config.root_dir, 'app')
+
+_current_audit = ContextVar("query_audit", default=None)
+
+class QueryAuditError(AssertionError):
+    """Raised in `raise` mode when a request runs too many or repeated statements."""
+
+class QueryAudit:
+    """
+    Counts the SQL statements run inside one request (or `audit_queries()` block).
+
+    Flags the block when it runs more than `max_statements` statements in
+    total, or the same statement more than `max_repeats` times, which is what
+    a lazy relationship walked inside a loop looks like. Relationship lazy
+    loads are labelled (e.g. `Business.sources`) so the report says which
+    attribute to eager load.
+    """
+
+    def __init__(self, label: str = "", mode: str = None, max_statements: int = None, max_repeats: int = None):
+        self.label = label
+        self.mode = mode or config.query_audit["mode"]
+        self.max_statements = max_statements if max_statements is not None else config.query_audit["max_statements"]
+        self.max_repeats = max_repeats if max_repeats is not None else config.query_audit["max_repeats"]
+        self.statements = 0
+        self.repeats = Counter()
+        self.violations = []
+        self._relationship = None
+
+    def record(self, statement: str):
+        relationship, self._relationship = self._relationship, None
+        self.statements += 1
+        key = (relationship, statement)
+        self.repeats[key] += 1
+
+        if self.repeats[key] == self.max_repeats + 1:
+            if relationship:
+                self._violation(f"N+1: {relationship} lazy loaded more than {self.max_repeats} times")
+            else:
+                self._violation(f"Statement ran more than {self.max_repeats} times: {' '.join(statement.split())[:200]}")
+        if self.statements == self.max_statements + 1:
+            self._violation(f"More than {self.max_statements} statements")
+
+    def _violation(self, message: str):
+        if self.label:
+            message = f"{message} in {self.label}"
+        self.violations.append(message)
+        if self.mode == "raise":
+            raise QueryAuditError(message)
+        frames = [frame for frame in traceback.extract_stack()[:-3] if frame.filename.startswith(_APP_DIR)]
+        log.warning(f"{message}\n{''.join(traceback.format_list(frames))}")
+
+def get_query_audit() -> QueryAudit | None:
+    return _current_audit.get()
+
+@contextmanager
+def audit_queries(label: str = "", mode: str = None, max_statements: int = None, max_repeats: int = None):
+    """Audit the statements run inside the block; `mode="raise"` makes a test fail on an N+1."""
+    audit = QueryAudit(label, mode, max_statements, max_repeats)
+    token = _current_audit.set(audit)
+    try:
+        yield audit
+    finally:
+        _current_audit.reset(token)
+
+@contextmanager
+def audit_exempt():
+    """Stop auditing inside the block, for loops that repeat a statement per batch by design."""
+    token = _current_audit.set(None)
+    try:
+        yield
+    finally:
+        _current_audit.reset(token)
+
+@event.listens_for(Session, "do_orm_execute")
+def _label_relationship_load(orm_execute_state):
+    audit = _current_audit.get()
+    if audit is not None and orm_execute_state.is_relationship_load:
+        path = orm_execute_state.loader_strategy_path
+        audit._relationship = str(path[-1]) if path else None
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    audit = _current_audit.get()
+    if audit is not None:
+        audit.record(statement)
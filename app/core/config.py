@@ -6,6 +6,14 @@ class Config:
         self.root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
         self.download_dir = None
         self.db_url = None
+        self.db_pool = dict()
+        self.db_replica_urls = []
+        self.db_primary_pin_seconds = 0.0
+        self.sqlite = dict()
+        self.db_statement_timeouts = dict()
+        self.query_audit = dict()
+        self.db_profiling = dict()
+        self.bulk_ingest = dict()
         self.settings = dict()
         self.load()
         
@@ -16,6 +24,14 @@ class Config:
             raise Exception("Error loading environment file.")
         self.download_dir = self._setup_download_dir()
         self.db_url = self._get_db_url()
+        self.db_pool = self._get_db_pool_settings()
+        self.db_replica_urls = self._get_db_replica_urls()
+        self.db_primary_pin_seconds = float(os.getenv('DB_PRIMARY_PIN_SECONDS', 5))
+        self.sqlite = self._get_sqlite_settings()
+        self.db_statement_timeouts = self._get_statement_timeouts()
+        self.query_audit = self._get_query_audit_settings()
+        self.db_profiling = self._get_db_profiling_settings()
+        self.bulk_ingest = self._get_bulk_ingest_settings()
 
     def _get_env(self, filename: str = '.env'):
         """Load environment variables from a .env file."""
@@ -47,4 +63,95 @@ class Config:
     def _get_db_url(self):
         return os.getenv('DATABASE_URL', f"sqlite:///{self.root_dir}/bizlist.db")
 
+    def _get_db_replica_urls(self):
+        """Optional comma-separated list of read replica URLs."""
+        urls = os.getenv('DATABASE_REPLICA_URLS', '')
+        return [url.strip() for url in urls.split(',') if url.strip()]
+
+    def _get_sqlite_settings(self):
+        """Pragmas and write strategy used when the database is SQLite."""
+        try:
+            return {
+                "tuning": os.getenv('SQLITE_TUNING', 'true').lower() in ('1', 'true', 'yes'),
+                "journal_mode": os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+                "synchronous": os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+                "mmap_size": int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+                # Negative values are KiB, so the default is a 64 MiB page cache
+                "cache_size": int(os.getenv('SQLITE_CACHE_SIZE', -64000)),
+                "busy_timeout_ms": int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+                "single_writer": os.getenv('SQLITE_SINGLE_WRITER', 'true').lower() in ('1', 'true', 'yes'),
+                "search_index": os.getenv('SQLITE_SEARCH_INDEX', 'true').lower() in ('1', 'true', 'yes'),
+            }
+        except ValueError as e:
+            raise Exception(f"Error parsing SQLite settings: {e}")
+
+    def _get_statement_timeouts(self):
+        """Statement timeouts in milliseconds, a default plus per-route overrides.
+
+        DB_STATEMENT_TIMEOUTS is a comma-separated list of `[METHOD ]/path/prefix=ms`
+        entries, e.g. `GET /businesses/export=120000,/businesses=10000`. The longest
+        matching prefix wins and 0 disables the timeout."""
+        try:
+            routes = {}
+            for entry in os.getenv('DB_STATEMENT_TIMEOUTS', '').split(','):
+                if not entry.strip():
+                    continue
+                route, ms = entry.rsplit('=', 1)
+                routes[' '.join(route.split())] = int(ms)
+            return {
+                "default": int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000)),
+                "routes": routes,
+            }
+        except ValueError as e:
+            raise Exception(f"Error parsing statement timeout settings: {e}")
+
+    def _get_query_audit_settings(self):
+        """Per-request SQL statement audit for catching N+1 queries in dev and tests.
+
+        QUERY_AUDIT is `off` (default), `log` or `raise`."""
+        try:
+            mode = os.getenv('QUERY_AUDIT', 'off').lower()
+            if mode not in ('off', 'log', 'raise'):
+                raise ValueError(f"QUERY_AUDIT must be off, log or raise, not {mode!r}")
+            return {
+                "mode": mode,
+                "max_statements": int(os.getenv('QUERY_AUDIT_MAX_STATEMENTS', 50)),
+                "max_repeats": int(os.getenv('QUERY_AUDIT_MAX_REPEATS', 5)),
+            }
+        except ValueError as e:
+            raise Exception(f"Error parsing query audit settings: {e}")
+
+    def _get_db_profiling_settings(self):
+        """Statement profiling and the slow query log."""
+        try:
+            return {
+                "enabled": os.getenv('DB_PROFILING', 'true').lower() in ('1', 'true', 'yes'),
+                "slow_threshold_ms": float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 500)),
+                "top_n": int(os.getenv('SLOW_QUERY_TOP_N', 20)),
+            }
+        except ValueError as e:
+            raise Exception(f"Error parsing database profiling settings: {e}")
+
+    def _get_bulk_ingest_settings(self):
+        """Batching for POST /businesses/bulk: records per insert and per transaction."""
+        try:
+            return {
+                "batch_size": int(os.getenv('BULK_INGEST_BATCH_SIZE', 2000)),
+            }
+        except ValueError as e:
+            raise Exception(f"Error parsing bulk ingest settings: {e}")
+
+    def _get_db_pool_settings(self):
+        """Connection pool settings for the shared database engine."""
+        try:
+            return {
+                "pool_size": int(os.getenv('DB_POOL_SIZE', 5)),
+                "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', 10)),
+                "pool_timeout": int(os.getenv('DB_POOL_TIMEOUT', 30)),
+                "pool_recycle": int(os.getenv('DB_POOL_RECYCLE', 1800)),
+                "pool_pre_ping": os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+            }
+        except ValueError as e:
+            raise Exception(f"Error parsing database pool settings: {e}")
+
 config = Config()
\ No newline at end of file
@@ -1,32 +1,337 @@
-import os
-from dotenv import load_dotenv
-load_dotenv()
+import itertools
+import threading
+import time
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from app.core.config import config
+from app.core.facets import ensure_facets
+from app.core.profiling import install_query_profiling
+from app.core.search import ensure_sqlite_search
+from app.core.timeouts import install_statement_guards
 from app.models import Base
+from app.services.logger import Logger
+
+log = Logger('core-database', log_level='INFO')
+
+_engine = None
+_SessionLocal = None
+_async_engine = None
+_AsyncSessionLocal = None
+_engine_lock = threading.Lock()
+
+_replicas = None
+_replica_counter = itertools.count()
+_primary_pins = {}
+_pins_lock = threading.Lock()
+
+# How long a replica that refused a connection is skipped before it is retried
+REPLICA_RETRY_SECONDS = 30
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check out a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with self._wait_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+def _engine_options(url: str) -> dict:
+    """Build create_engine() keyword arguments for the given database URL."""
+    options = dict(config.db_pool)
+    if url.startswith("sqlite"):
+        if ":memory:" in url or url.rstrip("/") == "sqlite:":
+            # In-memory databases live and die with a single connection
+            return {}
+        options["connect_args"] = {
+            "check_same_thread": False,
+            # The driver-level busy handler, in seconds
+            "timeout": config.sqlite["busy_timeout_ms"] / 1000,
+        }
+    options["poolclass"] = TimedQueuePool
+    return options
+
+def configure_sqlite(engine: Engine, settings: dict = None) -> Engine:
+    """Apply the SQLite performance profile to every new connection of an engine.
+
+    WAL lets API reads proceed while a scraper is writing, synchronous=NORMAL
+    drops the fsync on every commit (still safe under WAL), and mmap/cache
+    sizing keeps hot pages out of the read() path."""
+    settings = settings if settings is not None else config.sqlite
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if sync_engine.dialect.name != "sqlite" or not settings.get("tuning"):
+        return engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={settings['synchronous']}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings['mmap_size'])}")
+        cursor.execute(f"PRAGMA cache_size={int(settings['cache_size'])}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings['busy_timeout_ms'])}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 
-def get_db_engine():
-    """Creates the SQLAlchemy engine only when called."""
-    DATABASE_URL = os.getenv("DATABASE_URL")
-    engine = create_engine(DATABASE_URL)
-    Base.metadata.create_all(bind=engine)
     return engine
 
+def _instrument(engine: Engine) -> Engine:
+    """Apply the SQLite profile, statement timeouts and query profiling to a new engine."""
+    return install_query_profiling(install_statement_guards(configure_sqlite(engine)))
+
+def is_sqlite() -> bool:
+    """Whether the primary database is SQLite."""
+    return make_url(config.db_url).get_backend_name() == "sqlite"
+
+def dialect_insert(db, table):
+    """An INSERT for the session's dialect, with on_conflict_do_nothing()/do_update() available."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+def get_db_engine() -> Engine:
+    """Return the process-wide SQLAlchemy engine, creating it on first use."""
+    global _engine, _SessionLocal
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = _instrument(create_engine(config.db_url, **_engine_options(config.db_url)))
+                Base.metadata.create_all(bind=engine)
+                ensure_sqlite_search(engine)
+                ensure_facets(engine)
+                _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+def get_sessionmaker() -> sessionmaker:
+    """Return the process-wide session factory bound to the shared engine."""
+    get_db_engine()
+    return _SessionLocal
+
+def _async_url(url: str) -> str:
+    """Swap the sync DBAPI driver in a database URL for its asyncio counterpart."""
+    db_url = make_url(url)
+    backend = db_url.get_backend_name()
+    if backend == "postgresql":
+        db_url = db_url.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        db_url = db_url.set(drivername="sqlite+aiosqlite")
+    return db_url.render_as_string(hide_password=False)
+
+def get_async_db_engine() -> AsyncEngine:
+    """Return the process-wide asyncio engine, creating it on first use."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        # The sync engine owns schema creation, so make sure it has run first
+        get_db_engine()
+        with _engine_lock:
+            if _async_engine is None:
+                options = _engine_options(config.db_url)
+                options.pop("poolclass", None)
+                engine = _instrument(create_async_engine(_async_url(config.db_url), **options))
+                _AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+                _async_engine = engine
+    return _async_engine
+
+class Replica:
+    """Lazily connected read replica with sync and async session factories."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = _instrument(create_engine(url, **_engine_options(url)))
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+        self.down_until = 0.0
+        self._lock = threading.Lock()
+
+    def get_async_sessionmaker(self) -> async_sessionmaker:
+        if self.async_engine is None:
+            with self._lock:
+                if self.async_engine is None:
+                    options = _engine_options(self.url)
+                    options.pop("poolclass", None)
+                    self.async_engine = _instrument(create_async_engine(_async_url(self.url), **options))
+                    self.AsyncSessionLocal = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        return self.AsyncSessionLocal
+
+    def is_available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, error: Exception):
+        log.warning(f"Read replica unavailable, falling back to primary for {REPLICA_RETRY_SECONDS}s: {error}")
+        self.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+
+def get_replicas() -> list[Replica]:
+    """Return the configured read replicas, creating their engines on first use."""
+    global _replicas
+    if _replicas is None:
+        with _engine_lock:
+            if _replicas is None:
+                _replicas = [Replica(url) for url in config.db_replica_urls]
+    return _replicas
+
+def client_session_key(request: Request = None) -> str | None:
+    """Identify the client session a request belongs to for primary pinning."""
+    if request is None:
+        return None
+    session_id = request.headers.get("x-client-session")
+    if session_id:
+        return session_id
+    return request.client.host if request.client else None
+
+def pin_to_primary(key: str | None):
+    """Route reads for this client session to the primary for a short window."""
+    if key is None or config.db_primary_pin_seconds <= 0:
+        return
+    now = time.monotonic()
+    with _pins_lock:
+        if len(_primary_pins) > 10000:
+            for expired in [k for k, until in _primary_pins.items() if until <= now]:
+                del _primary_pins[expired]
+        _primary_pins[key] = now + config.db_primary_pin_seconds
+
+def is_pinned_to_primary(key: str | None) -> bool:
+    if key is None:
+        return False
+    return _primary_pins.get(key, 0.0) > time.monotonic()
+
+def _choose_replica(key: str | None) -> Replica | None:
+    """Pick the next available replica round-robin, or None to use the primary."""
+    replicas = get_replicas()
+    if not replicas or is_pinned_to_primary(key):
+        return None
+    start = next(_replica_counter)
+    for offset in range(len(replicas)):
+        replica = replicas[(start + offset) % len(replicas)]
+        if replica.is_available():
+            return replica
+    return None
+
+def _pool_status(pool) -> dict:
+    status = {
+        "pool": pool.__class__.__name__,
+        "status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    if isinstance(pool, TimedQueuePool):
+        status.update({
+            "checkouts": pool.wait_count,
+            "wait_total_ms": round(pool.wait_total * 1000, 3),
+            "wait_avg_ms": round(pool.wait_total * 1000 / pool.wait_count, 3) if pool.wait_count else 0.0,
+            "wait_max_ms": round(pool.wait_max * 1000, 3),
+        })
+    return status
+
+def get_pool_status() -> dict:
+    """Report connection pool usage for the shared engines."""
+    status = _pool_status(get_db_engine().pool)
+    if _async_engine is not None:
+        status["async"] = _pool_status(_async_engine.pool)
+    if _replicas:
+        status["replicas"] = []
+        for replica in _replicas:
+            replica_status = _pool_status(replica.engine.pool)
+            replica_status.update(url=make_url(replica.url).render_as_string(), available=replica.is_available())
+            if replica.async_engine is not None:
+                replica_status["async"] = _pool_status(replica.async_engine.pool)
+            status["replicas"].append(replica_status)
+    return status
+
 def get_db():
-    """Creates the SQLAlchemy session only when called."""
-    engine = get_db_engine()
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    db = SessionLocal()
+    """Yield a session from the shared session factory."""
+    db = get_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """Yield an asyncio session from the shared async session factory."""
+    get_async_db_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+def open_read_session(request: Request = None) -> Session:
+    """Open a session for read-only work, on a replica when one is available.
+
+    Falls back to the primary when no replica is configured or reachable, and
+    while the client session is pinned to the primary after a recent write.
+    The caller closes the session."""
+    replica = _choose_replica(client_session_key(request))
+    if replica is not None:
+        db = replica.SessionLocal()
+        try:
+            db.connection()
+            return db
+        except OperationalError as e:
+            replica.mark_down(e)
+            db.close()
+    return get_sessionmaker()()
+
+def get_read_db(request: Request = None):
+    """Yield a read-only session from open_read_session()."""
+    db = open_read_session(request)
     try:
         yield db
     finally:
         db.close()
 
+async def open_async_read_session(request: Request = None) -> AsyncSession:
+    """Async variant of open_read_session(); the caller closes the session."""
+    replica = _choose_replica(client_session_key(request))
+    db = None
+    if replica is not None:
+        db = replica.get_async_sessionmaker()()
+        try:
+            await db.connection()
+        except OperationalError as e:
+            replica.mark_down(e)
+            await db.close()
+            db = None
+    if db is None:
+        get_async_db_engine()
+        db = _AsyncSessionLocal()
+    return db
+
+async def get_async_read_db(request: Request = None):
+    """Async variant of get_read_db()."""
+    db = await open_async_read_session(request)
+    try:
+        yield db
+    finally:
+        await db.close()
+
 def get_db_conn():
     """Get a database connection."""
     db = next(get_db())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
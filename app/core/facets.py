@@ -0,0 +1,126 @@
+"""
+Incrementally maintained business facet counts.
+
+`business_facet_counts` holds the number of businesses for every
+combination of state, industry, source and whether an email, phone or
+website is on file. It is small (one row per combination seen, not per
+business), so facet and total counts are a quick GROUP BY over it instead
+of a scan of businesses.
+
+Each business write path turns its change into deltas with
+business_deltas() and applies them with apply_deltas() in its own
+transaction. Writes made outside the services (raw SQL, manual fixes) are
+not seen, so rebuild() recomputes the table from scratch; it runs when the
+table is first created and can be triggered from POST /internal/facets/rebuild.
+"""
+from collections import Counter
+from typing import Any, Iterable
+
+from sqlalchemy import and_, case, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.contact import Business
+from app.models.facets import BusinessFacetCount
+from app.models.joins import BusinessSource
+from app.services.logger import Logger
+
+log = Logger('core-facets', log_level='INFO')
+
+# Facets a count can be grouped or filtered by
+FACETS = ("state", "industry", "source", "has_email", "has_phone", "has_website")
+
+# Business columns behind the has_* facets
+FLAG_COLUMNS = {"has_email": "email", "has_phone": "phone", "has_website": "website"}
+
+# source_id of the rows that count every business once
+ALL_SOURCES = ""
+
+_KEY_COLUMNS = ("state", "industry", "has_email", "has_phone", "has_website", "source_id")
+
+def facet_key(business: Any) -> tuple:
+    """(state, industry, has_email, has_phone, has_website) of a Business, row or values dict."""
+    get = business.get if isinstance(business, dict) else (lambda field: getattr(business, field, None))
+    return (
+        get("state") or "",
+        get("industry") or "",
+        bool(get("email")),
+        bool(get("phone")),
+        bool(get("website")),
+    )
+
+def business_deltas(business: Any, source_ids: Iterable = (), sign: int = 1, deltas: Counter = None, total: bool = True) -> Counter:
+    """Add (sign=1) or remove (sign=-1) one business from a set of deltas.
+
+    It counts once in the all-sources rows (unless total=False, for a new
+    source link on an existing business) and once per linked source."""
+    deltas = deltas if deltas is not None else Counter()
+    key = facet_key(business)
+    if total:
+        deltas[key + (ALL_SOURCES,)] += sign
+    for source_id in source_ids:
+        deltas[key + (str(source_id),)] += sign
+    return deltas
+
+def _insert(db):
+    bind = db.get_bind() if isinstance(db, Session) else db
+    return postgresql.insert(BusinessFacetCount) if bind.dialect.name == "postgresql" else sqlite.insert(BusinessFacetCount)
+
+def apply_deltas(db, deltas: Counter):
+    """Add the deltas to the stored counts, in the caller's transaction."""
+    # Sorted, so concurrent writers lock the counter rows in the same order
+    rows = [dict(zip(_KEY_COLUMNS, key), count=count) for key, count in sorted(deltas.items()) if count]
+    if not rows:
+        return
+    stmt = _insert(db)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_KEY_COLUMNS),
+        set_={"count": BusinessFacetCount.count + stmt.excluded["count"]},
+    )
+    db.execute(stmt, rows)
+    if any(row["count"] < 0 for row in rows):
+        db.execute(delete(BusinessFacetCount).where(BusinessFacetCount.count <= 0))
+
+def flag(column):
+    """SQL for whether a business column has a value, as the has_* facets count it."""
+    return case((and_(column.isnot(None), column != ""), True), else_=False)
+
+def key_columns() -> list:
+    """Business-side SQL for the facet key, in facet_key() order."""
+    return [
+        func.coalesce(Business.state, ""),
+        func.coalesce(Business.industry, ""),
+        *(flag(getattr(Business, column)) for column in FLAG_COLUMNS.values()),
+    ]
+
+def rebuild(db) -> int:
+    """Recompute every facet count from businesses and business_sources. Returns the rows written."""
+    columns = key_columns()
+    totals = db.execute(select(*columns, literal(ALL_SOURCES), func.count()).group_by(*columns)).all()
+    per_source = db.execute(
+        select(*columns, BusinessSource.source_id, func.count())
+        .join(BusinessSource, BusinessSource.business_id == Business.id)
+        .group_by(*columns, BusinessSource.source_id)
+    ).all()
+
+    rows = [
+        dict(zip(_KEY_COLUMNS, (state, industry, bool(email), bool(phone), bool(website), str(source_id))), count=count)
+        for state, industry, email, phone, website, source_id, count in [*totals, *per_source]
+    ]
+    db.execute(delete(BusinessFacetCount))
+    if rows:
+        db.execute(insert(BusinessFacetCount), rows)
+    log.info(f"Rebuilt business facet counts: {len(rows)} rows")
+    return len(rows)
+
+def ensure_facets(engine: Engine):
+    """Fill an empty facet table from existing businesses, e.g. on a database created before it existed."""
+    try:
+        with engine.begin() as conn:
+            if conn.execute(select(BusinessFacetCount.count).limit(1)).first() is not None:
+                return
+            if conn.execute(select(Business.id).limit(1)).first() is None:
+                return
+            rebuild(conn)
+    except Exception as e:
+        log.warning(f"Could not build business facet counts: {e}")
@@ -0,0 +1,112 @@
+"""
+Business coordinates and radius search.
+
+Businesses are placed at the centroid of their ZIP code (zip_codes latitude
+and longitude); they are located when written, and locate_missing() fills
+in the rest, e.g. after the ZIP table is loaded. Each located business also
+gets a grid cell, the index a radius search goes through: the cells a
+circle's bounding box overlaps are a handful of IN lookups on an indexed
+integer, the same on SQLite and Postgres. The bounding box then trims the
+candidates, and haversine_miles() computes exact distances for all of them
+in one numpy pass.
+"""
+import math
+import re
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, select, update
+from app.models.contact import Business
+from app.models.location import ZipCode
+from app.services.logger import Logger
+
+log = Logger('core-geo', log_level='INFO')
+
+EARTH_RADIUS_MILES = 3958.8
+# Grid cell size; about 35 miles north-south, so a typical search touches a few cells
+GRID_CELL_DEGREES = 0.5
+# Columns set from the ZIP centroid; they follow the business's zip
+GEO_COLUMNS = ("latitude", "longitude", "geo_cell")
+# Businesses located per batch by locate_missing()
+LOCATE_BATCH_SIZE = 1000
+
+def zip5(zip_code: Optional[str]) -> Optional[str]:
+    """The 5-digit ZIP of a ZIP or ZIP+4 value, or None."""
+    digits = re.sub(r"\D", "", zip_code or "")
+    return digits[:5] if len(digits) in (5, 9) else None
+
+def geo_cell(latitude: Optional[float], longitude: Optional[float]) -> Optional[int]:
+    """The grid cell of a point, as one indexable integer."""
+    if latitude is None or longitude is None:
+        return None
+    row = math.floor((latitude + 90) / GRID_CELL_DEGREES)
+    column = math.floor((longitude + 180) / GRID_CELL_DEGREES)
+    return row * 1000 + column
+
+def bounding_box(latitude: float, longitude: float, radius: float) -> tuple[float, float, float, float]:
+    """(min lat, max lat, min lon, max lon) around a circle of `radius` miles."""
+    degrees = math.degrees(radius / EARTH_RADIUS_MILES)
+    # Meridians converge towards the poles, so a mile is more degrees of longitude there
+    scale = max(math.cos(math.radians(latitude)), 1e-6)
+    return latitude - degrees, latitude + degrees, longitude - degrees / scale, longitude + degrees / scale
+
+def cells_within(latitude: float, longitude: float, radius: float) -> list[int]:
+    """Every grid cell a circle's bounding box overlaps."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+    low, high = geo_cell(max(min_lat, -90), max(min_lon, -180)), geo_cell(min(max_lat, 90), min(max_lon, 180))
+    return [row * 1000 + column for row in range(low // 1000, high // 1000 + 1) for column in range(low % 1000, high % 1000 + 1)]
+
+def haversine_miles(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances in miles from one point to arrays of points."""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def zip_centroids(db, zip_codes: Iterable[Optional[str]]) -> dict[str, tuple[float, float]]:
+    """{zip5: (latitude, longitude)} for the ZIPs the zip_codes table has coordinates for."""
+    zips = {zip_code for zip_code in map(zip5, zip_codes) if zip_code}
+    if not zips:
+        return {}
+    rows = db.execute(
+        select(ZipCode.zip, ZipCode.latitude, ZipCode.longitude)
+        .where(ZipCode.zip.in_(zips), ZipCode.latitude.is_not(None), ZipCode.longitude.is_not(None))
+    ).all()
+    return {zip_code: (latitude, longitude) for zip_code, latitude, longitude in rows}
+
+def geo_values(centroid: Optional[tuple[float, float]]) -> dict:
+    """The GEO_COLUMNS values for a ZIP centroid (all None without one)."""
+    latitude, longitude = centroid or (None, None)
+    return {"latitude": latitude, "longitude": longitude, "geo_cell": geo_cell(latitude, longitude)}
+
+def locate(db, rows: list[dict]) -> list[dict]:
+    """Set the GEO_COLUMNS of business value dicts from their zip, in place, with one ZIP query."""
+    centroids = zip_centroids(db, (row.get("zip") for row in rows))
+    for row in rows:
+        row.update(geo_values(centroids.get(zip5(row.get("zip")))))
+    return rows
+
+def locate_missing(db, batch_size: int = LOCATE_BATCH_SIZE, after=None) -> tuple[int, object]:
+    """Locate one batch of businesses that have a zip but no coordinates, in id order after `after`.
+
+    Returns the number located and the id to continue after (None when done).
+    Businesses whose ZIP has no centroid are passed over, not retried."""
+    query = select(Business.id, Business.zip).where(Business.latitude.is_(None), Business.zip.is_not(None), Business.zip != "")
+    if after is not None:
+        query = query.where(Business.id > after)
+    rows = db.execute(query.order_by(Business.id).limit(batch_size)).all()
+    if not rows:
+        return 0, None
+    centroids = zip_centroids(db, (zip_code for _, zip_code in rows))
+    values = [
+        {"business_id": business_id, **geo_values(centroids[zip5(zip_code)])}
+        for business_id, zip_code in rows if zip5(zip_code) in centroids
+    ]
+    if values:
+        table = Business.__table__
+        db.execute(
+            update(table).where(table.c.id == bindparam("business_id")),
+            values,
+        )
+    log.info(f"Located {len(values)} of {len(rows)} businesses from ZIP centroids")
+    return len(values), rows[-1][0] if len(rows) == batch_size else None
@@ -0,0 +1,154 @@
+import asyncio
+import json
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.audit import audit_queries
+from app.core.config import config
+from app.core.database import client_session_key, pin_to_primary
+from app.core.timeouts import QueryState, reset_query_state, set_query_state, statement_timeout_for
+from app.services.logger import Logger
+
+log = Logger('core-middleware', log_level='INFO')
+
+async def send_error(send: Send, code: int, error: str):
+    """Send a complete JSON error response in the API's envelope."""
+    body = json.dumps({
+        "status": "error",
+        "code": code,
+        "errors": [error],
+        "params": {},
+        "data": None
+    }).encode()
+    await send({
+        "type": "http.response.start",
+        "status": code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class PrimaryPinMiddleware:
+    """Pin a client's reads to the primary for a short window after it writes,
+    so it reads its own writes even while replicas lag behind."""
+
+    WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in self.WRITE_METHODS or not config.db_replica_urls:
+            await self.app(scope, receive, send)
+            return
+
+        key = client_session_key(Request(scope))
+        pin_to_primary(key)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Restart the window once the write has finished, however long it took
+            pin_to_primary(key)
+
+class QueryCancelMiddleware:
+    """Give every request its route's statement timeout, and cancel its
+    in-flight queries as soon as the client disconnects.
+
+    A request whose query hit the timeout is answered with a 503; one whose
+    client went away gets a 499 (nginx's "client closed request") if anything
+    is still listening."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = QueryState(statement_timeout_for(scope["method"], scope["path"]))
+        token = set_query_state(state)
+        messages = asyncio.Queue(maxsize=1)
+        response = {"started": False, "complete": False, "replaced": False}
+
+        async def listen_for_disconnect():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not response["complete"]:
+                        cancelled = state.cancel()
+                        log.info(f"Client disconnected from {scope['method']} {scope['path']}, cancelled {cancelled} queries")
+                        app_task.cancel()
+                    await messages.put(message)
+                    return
+                await messages.put(message)
+
+        async def guarded_receive() -> Message:
+            message = await messages.get()
+            if message["type"] == "http.disconnect":
+                # Every later receive() should see the disconnect too
+                messages.put_nowait(message)
+            return message
+
+        async def guarded_send(message: Message):
+            if state.cancelled or response["replaced"]:
+                return
+            if message["type"] == "http.response.start" and state.timed_out:
+                response["replaced"] = True
+                await send_error(send, 503, f"Query exceeded the {state.timeout_ms}ms statement timeout.")
+                response["started"] = response["complete"] = True
+                return
+            if message["type"] == "http.response.start":
+                response["started"] = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response["complete"] = True
+            await send(message)
+
+        app_task = asyncio.create_task(self.app(scope, guarded_receive, guarded_send))
+        listener = asyncio.create_task(listen_for_disconnect())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not state.cancelled:
+                raise
+            if not response["started"]:
+                await send_error(send, 499, "Client closed request.")
+        finally:
+            listener.cancel()
+            reset_query_state(token)
+
+class QueryAuditMiddleware:
+    """Count the SQL statements each request runs when QUERY_AUDIT is on.
+
+    Adds an X-Query-Count header and, in `raise` mode, answers with a 500
+    instead of the app's response when the request broke the limits, even if
+    a service caught the QueryAuditError, so test clients see N+1 regressions.
+    A streamed response is checked when it starts; statements it runs after
+    that are only logged."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or config.query_audit["mode"] == "off":
+            await self.app(scope, receive, send)
+            return
+
+        response = {"replaced": False}
+        with audit_queries(f"{scope['method']} {scope['path']}") as audit:
+            async def counted_send(message: Message):
+                if response["replaced"]:
+                    return
+                if message["type"] == "http.response.start":
+                    if audit.mode == "raise" and audit.violations:
+                        response["replaced"] = True
+                        await send_error(send, 500, "; ".join(audit.violations))
+                        return
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"x-query-count", str(audit.statements).encode())]
+                await send(message)
+
+            await self.app(scope, receive, counted_send)
+
+        if audit.mode == "raise" and audit.violations and not response["replaced"]:
+            log.error(f"Query audit failed after the response started: {'; '.join(audit.violations)}")
@@ -0,0 +1,197 @@
+"""
+Helpers for Alembic revisions that touch large tables.
+
+Data backfills run in keyset-ordered batches, each committed on its own, so
+no single transaction holds row locks on a whole table. Progress is saved
+after every batch in `alembic_backfill_progress`; if a migration fails part
+way, running it again picks up after the last committed batch.
+
+    from app.core.migrations import backfill_in_batches, create_index_concurrently
+
+    def upgrade():
+        op.add_column('businesses', sa.Column('phone_digits', sa.String(20)))
+        backfill_in_batches(
+            'businesses',
+            "phone_digits = regexp_replace(phone, '[^0-9]', '', 'g')",
+            where="phone_digits IS NULL",
+        )
+        create_index_concurrently('ix_businesses_phone_digits', 'businesses', ['phone_digits'])
+
+Both helpers commit the surrounding migration transaction first (Alembic's
+autocommit_block), so call them after any schema changes they depend on.
+"""
+import time
+from typing import Callable, Optional, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from app.services.logger import Logger
+
+log = Logger('core-migrations', log_level='INFO')
+
+PROGRESS_TABLE = 'alembic_backfill_progress'
+
+_progress = sa.Table(
+    PROGRESS_TABLE, sa.MetaData(),
+    sa.Column('name', sa.String(255), primary_key=True),
+    sa.Column('last_key', sa.String(255)),
+    sa.Column('rows_done', sa.BigInteger, nullable=False, default=0),
+    sa.Column('updated_at', sa.DateTime),
+)
+
+def _require_online():
+    if op.get_context().as_sql:
+        raise RuntimeError("Batched migrations need a live connection; they cannot run in --sql (offline) mode.")
+
+def _estimate_rows(bind, table: str, where: Optional[str]) -> Optional[int]:
+    if bind.dialect.name == 'postgresql' and not where:
+        # The planner's estimate is free; count(*) on a big table is not
+        estimate = bind.execute(sa.text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}).scalar()
+        if estimate is not None and estimate > 0:
+            return estimate
+    sql = f"SELECT count(*) FROM {table}" + (f" WHERE {where}" if where else "")
+    return bind.execute(sa.text(sql)).scalar()
+
+def _load_progress(bind, name: str) -> tuple[Optional[str], int]:
+    _progress.create(bind, checkfirst=True)
+    row = bind.execute(sa.select(_progress.c.last_key, _progress.c.rows_done).where(_progress.c.name == name)).first()
+    if row is None:
+        return None, 0
+    return row.last_key, row.rows_done
+
+def _save_progress(bind, name: str, last_key, rows_done: int):
+    values = {"last_key": str(last_key), "rows_done": rows_done, "updated_at": sa.func.now()}
+    updated = bind.execute(sa.update(_progress).where(_progress.c.name == name).values(**values))
+    if updated.rowcount == 0:
+        bind.execute(sa.insert(_progress).values(name=name, **values))
+
+def _clear_progress(bind, name: str):
+    bind.execute(sa.delete(_progress).where(_progress.c.name == name))
+
+def backfill_in_batches(
+    table: str,
+    set_sql: Optional[str] = None,
+    *,
+    transform: Optional[Callable[[list], list[dict]]] = None,
+    columns: Sequence[str] = (),
+    key: str = 'id',
+    where: Optional[str] = None,
+    batch_size: int = 1000,
+    pause: float = 0.0,
+    name: Optional[str] = None,
+) -> int:
+    """
+    Update every row of a table in committed, key-ordered batches.
+
+    Pass either `set_sql`, a SET clause run as one UPDATE per key range, or
+    `transform`, a function that gets each batch of rows (the key plus
+    `columns`) and returns dicts of new values including the key, for
+    backfills that need Python. `where` limits the rows touched and should
+    exclude rows that are already done so re-runs stay cheap. `pause` sleeps
+    between batches to leave I/O for live traffic.
+
+    Returns the number of rows processed. `name` identifies the backfill for
+    resuming; it defaults to the table and SET clause.
+    """
+    if (set_sql is None) == (transform is None):
+        raise ValueError("Pass exactly one of set_sql or transform.")
+    _require_online()
+    name = name or f"{table}:{set_sql or getattr(transform, '__name__', 'transform')}"[:255]
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # Keys are passed back exactly as the driver returned them (a resumed
+        # key as saved text), so both sides compare in the database's own terms
+        last_key, rows_done = _load_progress(bind, name)
+        if last_key is not None:
+            log.info(f"Resuming backfill {name!r} after {key}={last_key} ({rows_done} rows already done)")
+        total = _estimate_rows(bind, table, where)
+
+        condition = f" AND ({where})" if where else ""
+        select_cols = ", ".join([key, *columns])
+        first_batch = sa.text(f"SELECT {select_cols} FROM {table} WHERE 1 = 1{condition} ORDER BY {key} LIMIT :limit")
+        next_batch = sa.text(f"SELECT {select_cols} FROM {table} WHERE {key} > :last{condition} ORDER BY {key} LIMIT :limit")
+        update = sa.text(f"UPDATE {table} SET {set_sql} WHERE {key} >= :low AND {key} <= :high{condition}") if set_sql else None
+
+        started = time.monotonic()
+        resumed_at = rows_done
+        while True:
+            batch_started = time.monotonic()
+            if last_key is None:
+                rows = bind.execute(first_batch, {"limit": batch_size}).all()
+            else:
+                rows = bind.execute(next_batch, {"last": last_key, "limit": batch_size}).all()
+            # Autocommit: each statement commits on its own. A batch interrupted
+            # before its progress is saved is simply redone, so backfills must
+            # be idempotent.
+            if not rows:
+                _clear_progress(bind, name)
+                break
+            if set_sql is not None:
+                bind.execute(update, {"low": rows[0][0], "high": rows[-1][0]})
+            else:
+                values = transform(rows)
+                if values:
+                    assignments = ", ".join(f"{column} = :{column}" for column in values[0] if column != key)
+                    bind.execute(
+                        sa.text(f"UPDATE {table} SET {assignments} WHERE {key} = :{key}"),
+                        values,
+                    )
+            last_key = rows[-1][0]
+            rows_done += len(rows)
+            _save_progress(bind, name, last_key, rows_done)
+
+            elapsed = time.monotonic() - started
+            rate = (rows_done - resumed_at) / elapsed if elapsed else 0
+            progress = f"{rows_done}/{total} ({rows_done * 100 / total:.1f}%)" if total else str(rows_done)
+            log.info(f"Backfill {name!r}: {progress} rows, batch {time.monotonic() - batch_started:.2f}s, {rate:.0f} rows/s")
+
+            if len(rows) < batch_size:
+                _clear_progress(bind, name)
+                break
+            if pause:
+                time.sleep(pause)
+
+    log.info(f"Backfill {name!r} finished: {rows_done} rows")
+    return rows_done
+
+def create_index_concurrently(
+    index_name: str,
+    table: str,
+    columns: Sequence,
+    unique: bool = False,
+    **kw,
+):
+    """
+    Build an index without blocking writes to the table.
+
+    On Postgres this is CREATE INDEX CONCURRENTLY, which cannot run inside a
+    transaction; an invalid index left behind by an interrupted build is
+    dropped and rebuilt. Other databases get a plain CREATE INDEX. Extra
+    keyword arguments (postgresql_using, postgresql_where, postgresql_ops...)
+    are passed to op.create_index().
+    """
+    _require_online()
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.create_index(index_name, table, columns, unique=unique, if_not_exists=True, **kw)
+        return
+
+    with op.get_context().autocommit_block():
+        valid = bind.execute(sa.text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ), {"name": index_name}).scalar()
+        if valid is False:
+            log.warning(f"Dropping invalid index {index_name} left by an interrupted build")
+            op.drop_index(index_name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        log.info(f"Creating index {index_name} on {table} concurrently")
+        op.create_index(index_name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+def drop_index_concurrently(index_name: str, table: str):
+    """Drop an index without blocking writes (DROP INDEX CONCURRENTLY on Postgres)."""
+    _require_online()
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index(index_name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,96 @@
+"""
+Incremental parsing of streamed JSON request bodies.
+
+Bulk endpoints accept either newline-delimited JSON (one record per line) or
+a single JSON array of records. Both are decoded chunk by chunk as the body
+arrives, so a large upload is never held in memory as a whole.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+# A record that has not finished decoding after this much text is treated as malformed
+MAX_RECORD_CHARS = 1024 * 1024
+
+_WHITESPACE = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+def _parse_line(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+def _drain_array(buffer: str, final: bool) -> tuple[list, str, bool]:
+    """Decode the complete array elements at the start of `buffer`.
+
+    Returns the records, the undecoded remainder and whether the closing
+    bracket was reached."""
+    records = []
+    pos = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE + ',':
+            pos += 1
+        if pos == len(buffer):
+            return records, '', False
+        if buffer[pos] == ']':
+            return records, buffer[pos + 1:], True
+        try:
+            record, pos = _decoder.raw_decode(buffer, pos)
+        except ValueError as e:
+            # Usually the element is just split across chunks; wait for more
+            if final or len(buffer) - pos > MAX_RECORD_CHARS:
+                raise ValueError(f"Invalid JSON array: {e}") from e
+            return records, buffer[pos:], False
+        records.append(record)
+
+async def iter_json_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield the records of an NDJSON or JSON array body as they arrive.
+
+    The format is picked from the first non-blank character. A line of NDJSON
+    that does not parse is yielded as a ValueError so the caller can report it
+    and carry on; a malformed JSON array cannot be resynchronised, so it
+    raises ValueError.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    is_array = None
+    done = False
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        if is_array is None:
+            buffer = buffer.lstrip(_WHITESPACE + '\ufeff')
+            if not buffer:
+                continue
+            is_array = buffer[0] == '['
+            if is_array:
+                buffer = buffer[1:]
+
+        if is_array:
+            if done:
+                continue
+            records, buffer, done = _drain_array(buffer, final=False)
+            for record in records:
+                yield record
+        else:
+            *lines, buffer = buffer.split('\n')
+            if len(buffer) > MAX_RECORD_CHARS:
+                raise ValueError(f"NDJSON line longer than {MAX_RECORD_CHARS} characters")
+            for line in lines:
+                if line.strip():
+                    yield _parse_line(line)
+
+    buffer += decoder.decode(b'', final=True)
+    if is_array:
+        if not done:
+            records, buffer, done = _drain_array(buffer, final=True)
+            for record in records:
+                yield record
+            if not done:
+                raise ValueError("Invalid JSON array: missing closing ']'")
+        if buffer.strip():
+            raise ValueError("Unexpected data after the closing ']' of the JSON array")
+    elif buffer.strip():
+        yield _parse_line(buffer)
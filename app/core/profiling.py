@@ -0,0 +1,157 @@
+import functools
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import config
+from app.services.logger import Logger
+
+log = Logger('core-profiling', log_level='INFO')
+slow_log = Logger('db-slow-queries', log_file='slow-queries.log', log_level='INFO', console_log=False)
+
+# Code that counts as "the caller" of a statement, innermost frame first
+_CALLER_DIRS = tuple(os.path.join(config.root_dir, 'app', d) + os.sep for d in ('services', 'routers', 'helpers'))
+_LOGGER_FILE = os.path.join(config.root_dir, 'app', 'services', 'logger.py')
+
+# Fingerprints kept in memory; the least expensive ones are dropped beyond this
+MAX_FINGERPRINTS = 1000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_SPACE = re.compile(r"\s+")
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so the same query with different values groups together."""
+    text = _STRING.sub("?", statement)
+    text = _PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _LIST.sub("(?+)", text)
+    text = _ROWS.sub("(?+), ...", text)
+    return _SPACE.sub(" ", text).strip()
+
+def _calling_service() -> str | None:
+    """Qualified name of the innermost service/router function on the stack, e.g. BusinessService.get."""
+    frames = [sys._getframe(2)]
+    if greenlet is not None:
+        # AsyncSession runs statements in a child greenlet; the awaiting
+        # coroutines are on the stack of the greenlet that spawned it
+        parent = greenlet.getcurrent().parent
+        if parent is not None and parent.gr_frame is not None:
+            frames.append(parent.gr_frame)
+    for frame in frames:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(_CALLER_DIRS) and filename != _LOGGER_FILE:
+                return frame.f_code.co_qualname
+            frame = frame.f_back
+    return None
+
+def _record(statement: str, duration_ms: float, rows: int | None, dialect: str):
+    settings = config.db_profiling
+    key = fingerprint(statement)
+    slow = duration_ms >= settings["slow_threshold_ms"]
+    with _stats_lock:
+        stats = _stats.get(key)
+        is_new = stats is None
+    caller = _calling_service() if slow or is_new else None
+
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            if len(_stats) >= MAX_FINGERPRINTS:
+                del _stats[min(_stats, key=lambda k: _stats[k]["total_ms"])]
+            stats = _stats[key] = {
+                "id": hashlib.md5(key.encode()).hexdigest()[:12],
+                "fingerprint": key,
+                "dialect": dialect,
+                "caller": caller,
+                "calls": 0,
+                "slow_calls": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "last_rows": None,
+                "last_slow_at": None,
+            }
+        stats["calls"] += 1
+        stats["total_ms"] += duration_ms
+        stats["last_rows"] = rows
+        if duration_ms > stats["max_ms"]:
+            stats["max_ms"] = duration_ms
+        if caller:
+            stats["caller"] = caller
+        if slow:
+            stats["slow_calls"] += 1
+            stats["last_slow_at"] = datetime.now().isoformat(' ', 'seconds')
+
+    if slow:
+        slow_log.info(f"{duration_ms:.1f}ms rows={rows if rows is not None else '?'} caller={caller or '?'} [{stats['id']}] {key}")
+
+def get_slow_queries(order_by: str = "max", limit: int = None) -> list[dict]:
+    """Top statements by max, total or average duration."""
+    sort_keys = {
+        "max": lambda s: s["max_ms"],
+        "total": lambda s: s["total_ms"],
+        "avg": lambda s: s["total_ms"] / s["calls"],
+        "calls": lambda s: s["calls"],
+    }
+    if order_by not in sort_keys:
+        raise ValueError(f"order_by must be one of {', '.join(sort_keys)}")
+    limit = limit or config.db_profiling["top_n"]
+    with _stats_lock:
+        rows = sorted((dict(s) for s in _stats.values()), key=sort_keys[order_by], reverse=True)[:limit]
+    for row in rows:
+        row["avg_ms"] = round(row["total_ms"] / row["calls"], 3)
+        row["total_ms"] = round(row["total_ms"], 3)
+        row["max_ms"] = round(row["max_ms"], 3)
+    return rows
+
+def reset_slow_queries():
+    with _stats_lock:
+        _stats.clear()
+
+def install_query_profiling(engine: Engine) -> Engine:
+    """Time every statement the engine runs and feed the slow query log."""
+    if not config.db_profiling["enabled"]:
+        return engine
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    dialect = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        try:
+            _record(statement, duration_ms, rows, dialect)
+        except Exception as e:
+            log.error(f"Error recording query profile: {e}")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _drop_timer(context):
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+    return engine
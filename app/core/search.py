@@ -0,0 +1,105 @@
+"""
+Indexed substring search for the businesses filters.
+
+The list and export endpoints filter with `column ILIKE '%value%'`, which no
+B-tree index can serve. On Postgres the pg_trgm GIN indexes from migration
+7c2d4e6f8a10 let the planner answer those ILIKE filters directly, so the
+query is unchanged. SQLite has no such index type, so the searchable columns
+are mirrored into an FTS5 table with the trigram tokenizer (kept in sync by
+triggers) and filters are rewritten into a MATCH against it.
+"""
+import threading
+
+from sqlalchemy import ColumnElement, text
+from sqlalchemy.engine import Engine
+from app.core.config import config
+from app.services.logger import Logger
+
+log = Logger('core-search', log_level='INFO')
+
+# Columns covered by the trigram indexes / FTS table
+SEARCH_COLUMNS = ("name", "city", "industry", "state")
+
+SQLITE_SEARCH_TABLE = "businesses_search"
+
+# Trigram indexes cannot match anything shorter than one trigram
+MIN_TERM_LENGTH = 3
+
+_ready_lock = threading.Lock()
+_ready_databases = set()
+
+_SQLITE_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_SEARCH_TABLE} USING fts5(
+        {', '.join(SEARCH_COLUMNS)}, content='businesses', content_rowid='rowid', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_ai AFTER INSERT ON businesses BEGIN
+        INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES (new.rowid, {', '.join('new.' + c for c in SEARCH_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_ad AFTER DELETE ON businesses BEGIN
+        INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.rowid, {', '.join('old.' + c for c in SEARCH_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_au AFTER UPDATE OF {', '.join(SEARCH_COLUMNS)} ON businesses BEGIN
+        INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.rowid, {', '.join('old.' + c for c in SEARCH_COLUMNS)});
+        INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES (new.rowid, {', '.join('new.' + c for c in SEARCH_COLUMNS)});
+    END""",
+]
+
+def _database_key(engine: Engine) -> str:
+    return engine.url.database or ""
+
+def ensure_sqlite_search(engine: Engine, rebuild: bool = False) -> bool:
+    """Create the FTS5 search table and its triggers on a SQLite database.
+
+    A newly created table is filled from the existing rows. Pass rebuild=True
+    to re-index from scratch, e.g. after a VACUUM, which may renumber the
+    rowids the index is keyed on. Returns whether the search table is usable."""
+    if engine.dialect.name != "sqlite" or not config.sqlite.get("search_index", True):
+        return False
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SQLITE_SEARCH_TABLE}).first()
+            for ddl in _SQLITE_SEARCH_DDL:
+                conn.exec_driver_sql(ddl)
+            if not exists or rebuild:
+                log.info(f"Building {SQLITE_SEARCH_TABLE} search index")
+                conn.exec_driver_sql(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')")
+    except Exception as e:
+        # An SQLite build without FTS5 still works, just without the index
+        log.warning(f"SQLite search index unavailable, filters will scan: {e}")
+        return False
+    with _ready_lock:
+        _ready_databases.add(_database_key(engine))
+    return True
+
+def sqlite_search_ready(engine: Engine) -> bool:
+    return engine.dialect.name == "sqlite" and _database_key(engine) in _ready_databases
+
+def _fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+def search_filters(model, filters: dict, bind: Engine) -> list[ColumnElement]:
+    """
+    WHERE clauses for case-insensitive substring filters on `model`.
+
+    On SQLite with the search table in place, filters on the searchable
+    columns that are long enough to form a trigram are combined into one FTS5
+    MATCH; everything else (and every filter on other databases) is an ILIKE.
+    """
+    clauses = []
+    fts_terms = []
+    use_fts = bind is not None and sqlite_search_ready(bind) and model.__tablename__ == "businesses"
+    for key, value in filters.items():
+        column = getattr(model, key)
+        if use_fts and key in SEARCH_COLUMNS and len(value) >= MIN_TERM_LENGTH:
+            fts_terms.append(f"{key} : {_fts_phrase(value)}")
+        else:
+            clauses.append(column.ilike(f"%{value}%"))
+    if fts_terms:
+        clauses.append(text(
+            f"businesses.rowid IN (SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH :search_match)"
+        ).bindparams(search_match=" AND ".join(fts_terms)))
+    return clauses
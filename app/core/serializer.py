@@ -0,0 +1,50 @@
+"""
+Fast serialization for list and export responses.
+
+List endpoints select plain column tuples instead of ORM objects (no identity
+map, no instance state) and turn them into response dicts in one pass; the
+response body is encoded with orjson, which handles UUIDs and datetimes
+natively. Without orjson installed the standard library encoder is used.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps(), so content may hold UUIDs and datetimes."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def select_columns(query: Select, model, fields: Sequence[str]) -> Select:
+    """Swap an entity select for a select of just `fields`, keeping its filters and ordering."""
+    return query.with_only_columns(*(getattr(model, field) for field in fields))
+
+def rows_to_dicts(rows: Iterable[Sequence], fields: Sequence[str]) -> list[dict]:
+    """Column tuples to response dicts in `fields` order, with empty strings as null."""
+    return [
+        {field: (None if value == '' else value) for field, value in zip(fields, row)}
+        for row in rows
+    ]
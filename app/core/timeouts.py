@@ -0,0 +1,187 @@
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import config
+from app.services.logger import Logger
+
+log = Logger('core-timeouts', log_level='INFO')
+
+# SQLSTATE for query_canceled, raised for both statement_timeout and pg_cancel_backend
+PG_QUERY_CANCELED = "57014"
+
+# How many SQLite VM instructions run between deadline checks
+SQLITE_PROGRESS_STEPS = 10000
+
+_query_state = ContextVar("query_state", default=None)
+_stats_lock = threading.Lock()
+_stats = {"cancelled": 0, "timed_out": 0}
+
+class QueryState:
+    """Statement timeout and in-flight connections for one HTTP request."""
+
+    def __init__(self, timeout_ms: int = 0):
+        self.timeout_ms = timeout_ms
+        self.cancelled = False
+        self.timed_out = False
+        self._connections = set()
+        self._lock = threading.Lock()
+
+    def track(self, dbapi_connection):
+        with self._lock:
+            self._connections.add(dbapi_connection)
+
+    def release(self, dbapi_connection):
+        with self._lock:
+            self._connections.discard(dbapi_connection)
+
+    def cancel(self) -> int:
+        """Cancel every query this request still has running. Returns how many were cancelled."""
+        with self._lock:
+            self.cancelled = True
+            connections = list(self._connections)
+        cancelled = 0
+        for dbapi_connection in connections:
+            try:
+                if _cancel_connection(dbapi_connection):
+                    cancelled += 1
+            except Exception as e:
+                log.warning(f"Could not cancel query: {e}")
+        _count("cancelled", cancelled)
+        return cancelled
+
+def get_query_state() -> QueryState | None:
+    return _query_state.get()
+
+def set_query_state(state: QueryState | None):
+    return _query_state.set(state)
+
+def reset_query_state(token):
+    _query_state.reset(token)
+
+def get_query_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+def _count(key: str, amount: int = 1):
+    if amount:
+        with _stats_lock:
+            _stats[key] += amount
+
+def statement_timeout_for(method: str, path: str) -> int:
+    """Resolve the statement timeout (ms) for a request from config.db_statement_timeouts."""
+    timeouts = config.db_statement_timeouts
+    timeout_ms = timeouts.get("default", 0)
+    best = -1
+    for route, ms in timeouts.get("routes", {}).items():
+        route_method, _, prefix = route.rpartition(" ")
+        if route_method and route_method.upper() != method.upper():
+            continue
+        prefix = prefix.rstrip("/") or "/"
+        if path != prefix and not path.startswith(prefix if prefix == "/" else prefix + "/"):
+            continue
+        # Longest prefix wins; a method-specific entry beats a bare one of the same length
+        rank = len(prefix) * 2 + (1 if route_method else 0)
+        if rank > best:
+            best, timeout_ms = rank, ms
+    return timeout_ms
+
+def _driver_connection(dbapi_connection):
+    driver = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    # aiosqlite runs a plain sqlite3 connection on its own thread
+    return getattr(driver, "_conn", driver)
+
+def _cancel_connection(dbapi_connection) -> bool:
+    driver = _driver_connection(dbapi_connection)
+    if hasattr(driver, "interrupt"):
+        # sqlite3: safe to call from another thread
+        driver.interrupt()
+        return True
+    if callable(getattr(driver, "cancel", None)) and type(driver).__module__.startswith("psycopg2"):
+        # psycopg2: sends a cancel request to the backend, safe from another thread
+        driver.cancel()
+        return True
+    # asyncpg queries are cancelled along with the request task
+    return type(driver).__module__.startswith("asyncpg")
+
+def _is_cancellation(error: BaseException) -> bool:
+    for candidate in (error, error.__cause__):
+        if candidate is None:
+            continue
+        if getattr(candidate, "pgcode", None) == PG_QUERY_CANCELED or getattr(candidate, "sqlstate", None) == PG_QUERY_CANCELED:
+            return True
+        if "interrupted" in str(candidate):
+            return True
+    return False
+
+def renew_deadline(conn):
+    """Restart the SQLite statement deadline on a connection that is still streaming a result.
+
+    A streamed read is one statement on SQLite, so without this its timeout
+    would cover the whole stream; renewing it per fetched batch gives the same
+    per-FETCH behaviour as a Postgres server-side cursor."""
+    state = _query_state.get()
+    deadline = conn.info.get("sqlite_deadline")
+    if state is not None and deadline is not None:
+        deadline["at"] = time.monotonic() + state.timeout_ms / 1000 if state.timeout_ms else 0.0
+
+def install_statement_guards(engine: Engine) -> Engine:
+    """Apply per-request statement timeouts and make in-flight queries cancellable.
+
+    Postgres gets a `SET LOCAL statement_timeout` at the start of each
+    transaction; SQLite checks a deadline from a progress handler. Both only
+    apply to work done on behalf of a request (see QueryCancelMiddleware)."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    dialect = sync_engine.dialect.name
+
+    if dialect == "sqlite":
+        @event.listens_for(sync_engine, "connect")
+        def _install_deadline(dbapi_connection, connection_record):
+            driver = _driver_connection(dbapi_connection)
+            if not hasattr(driver, "set_progress_handler"):
+                return
+            deadline = {"at": 0.0}
+            driver.set_progress_handler(lambda: 1 if deadline["at"] and time.monotonic() > deadline["at"] else 0, SQLITE_PROGRESS_STEPS)
+            connection_record.info["sqlite_deadline"] = deadline
+
+    @event.listens_for(sync_engine, "begin")
+    def _new_transaction(conn):
+        conn.info.pop("statement_timeout_ms", None)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _guard_statement(conn, cursor, statement, parameters, context, executemany):
+        state = _query_state.get()
+        if state is None:
+            return
+        conn.info["query_state"] = state
+        state.track(conn.connection.dbapi_connection)
+        if dialect == "postgresql":
+            if state.timeout_ms and conn.info.get("statement_timeout_ms") != state.timeout_ms:
+                # SET LOCAL ends with the transaction, so pooled connections come back clean
+                cursor.execute(f"SET LOCAL statement_timeout = {int(state.timeout_ms)}")
+                conn.info["statement_timeout_ms"] = state.timeout_ms
+        elif "sqlite_deadline" in conn.info:
+            conn.info["sqlite_deadline"]["at"] = time.monotonic() + state.timeout_ms / 1000 if state.timeout_ms else 0.0
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _record_cancellation(context):
+        state = _query_state.get()
+        if state is None or not _is_cancellation(context.original_exception):
+            return
+        if not state.cancelled and not state.timed_out:
+            state.timed_out = True
+            _count("timed_out")
+            log.warning(f"Statement timed out after {state.timeout_ms}ms: {context.statement}")
+
+    @event.listens_for(sync_engine, "checkin")
+    def _release(dbapi_connection, connection_record):
+        state = connection_record.info.pop("query_state", None)
+        if state is not None:
+            state.release(dbapi_connection)
+        if "sqlite_deadline" in connection_record.info:
+            connection_record.info["sqlite_deadline"]["at"] = 0.0
+
+    return engine
@@ -0,0 +1,79 @@
+import functools
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from app.core.config import config
+from app.core.database import is_sqlite
+from app.services.logger import Logger
+
+log = Logger('core-writer', log_level='INFO')
+
+class WriteQueue:
+    """
+    Funnels database writes through one dedicated thread.
+
+    SQLite allows a single writer at a time; letting request threads and
+    scrapers race for the write lock turns into busy-timeout stalls and
+    "database is locked" errors. Queuing the writes instead keeps readers
+    (which WAL never blocks) fast and makes writers wait their turn in order.
+    On other databases submit() simply runs the write inline.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._enabled = None
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            self._enabled = is_sqlite() and config.sqlite["single_writer"]
+        return self._enabled
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            fn, args, kwargs, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn on the writer thread and wait for its result.
+
+        The caller blocks until the write is done, so a Session passed in
+        args is never used by two threads at once."""
+        if not self.enabled or threading.current_thread() is self._thread:
+            return fn(*args, **kwargs)
+
+        self._ensure_started()
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future.result()
+
+    def pending(self) -> int:
+        """Number of writes waiting for the writer thread."""
+        return self._queue.qsize()
+
+write_queue = WriteQueue()
+
+def single_writer(fn: Callable) -> Callable:
+    """Decorator that routes a write function through the shared write queue."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return write_queue.submit(fn, *args, **kwargs)
+    return wrapper
@@ -1,6 +1,7 @@
 # main.py
 from app.services.logger import Logger
 from app.core.config import config
+from app.core.middleware import PrimaryPinMiddleware, QueryAuditMiddleware, QueryCancelMiddleware
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -11,11 +12,15 @@ from app.routers.source import source_router
 from app.routers.business import business_router
 from app.routers.serpapi import serpapi_router
 from app.routers.owens import owenscorning
+from app.routers.internal import internal_router
 
 log = Logger('app-main')
 
 # Create FastAPI app
 app = FastAPI(title=config.settings['APP_NAME'], debug=True)
+app.add_middleware(PrimaryPinMiddleware)
+app.add_middleware(QueryCancelMiddleware)
+app.add_middleware(QueryAuditMiddleware)
 
 @app.get("/")
 def root():
@@ -26,6 +31,7 @@ app.include_router(source_router, prefix="/sources", tags=["sources"])
 app.include_router(business_router, prefix="/businesses", tags=["businesses"])
 app.include_router(serpapi_router, prefix="/serpapi", tags=["serpapi"])
 app.include_router(owenscorning, prefix="/scrape/owenscorning", tags=["scraper", "owenscorning"])
+app.include_router(internal_router, prefix="/internal", tags=["internal"])
 
 @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
 async def catch_all(request: Request, path: str):
@@ -1,10 +1,47 @@
 from sqlalchemy.orm import declarative_base
-from uuid import uuid4
+from uuid import UUID
+import os
+import threading
+import time
 
 Base = declarative_base()
 
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+def uuid7() -> UUID:
+    """Generate a time-ordered UUID (RFC 9562 version 7).
+
+    The first 48 bits are the Unix time in milliseconds, so new keys land at
+    the right-hand edge of the primary key index instead of scattering across
+    it. The 12-bit rand_a field is used as a counter to keep keys generated
+    within the same millisecond in order."""
+    global _uuid7_last_ms, _uuid7_counter
+    with _uuid7_lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _uuid7_last_ms:
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                # Counter exhausted, borrow the next millisecond
+                _uuid7_last_ms += 1
+                _uuid7_counter = 0
+            ms = _uuid7_last_ms
+        else:
+            _uuid7_last_ms = ms
+            _uuid7_counter = int.from_bytes(os.urandom(2), 'big') & 0x3FF
+        counter = _uuid7_counter
+
+    rand_b = int.from_bytes(os.urandom(8), 'big') & 0x3FFFFFFFFFFFFFFF
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= rand_b
+    return UUID(int=value)
+
 def generate_uuid():
-    return str(uuid4())
+    return uuid7()
 
 # Import all the models here to ensure they are registered with SQLAlchemy
 from .contact import Business, Contact
@@ -12,4 +49,6 @@ from .source import Source
 from .location import ZipCode, CoverageZipList
 from .email import EmailMessage
 from .cache import WebSearchCache
-from .joins import BusinessSource, SourceContact, BusinessContact
\ No newline at end of file
+from .joins import BusinessSource, SourceContact, BusinessContact
+from .facets import BusinessFacetCount
+from .changes import BusinessTombstone
@@ -0,0 +1,16 @@
+# /app/models/changes.py
+
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+from app.models import Base
+from datetime import datetime
+
+# One row per deleted business, so the change feed can tell sync clients
+# about deletes. Written by every business delete path (see
+# app/core/changes.py) and kept, since a client may sync rarely.
+
+class BusinessTombstone(Base):
+    __tablename__ = "business_tombstones"
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    name = Column(String(255), nullable=False)
+    deleted = Column(DateTime, nullable=False, default=datetime.now, index=True)
@@ -1,6 +1,6 @@
 # /app/models/contact.py
 
-from sqlalchemy import Column, String, ForeignKey, Table, DateTime
+from sqlalchemy import Column, String, ForeignKey, Table, DateTime, Float, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.models import Base, generate_uuid
@@ -21,12 +21,28 @@ class Business(Base):
     email = Column(String(255))
     notes = Column(String[String])
 
-    created = Column(DateTime, default=datetime.now())
-    updated = Column(DateTime, default=datetime.now(), onupdate=datetime.now())
+    # Exact-match lookup keys, derived from the columns above by Formatter at write time
+    phone_key = Column(String(20), index=True)
+    domain_key = Column(String(255), index=True)
+    email_key = Column(String(255), index=True)
+    name_key = Column(String(255), index=True)
+    zip_key = Column(String(5))
+
+    # ZIP centroid and its grid cell for radius searches (see app/core/geo.py)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geo_cell = Column(Integer, index=True)
+
+    # Callables, evaluated per row; updated orders the change feed (GET /businesses/changes)
+    created = Column(DateTime, default=datetime.now)
+    updated = Column(DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
     sources = relationship("BusinessSource", back_populates="business")
     contacts = relationship("BusinessContact", back_populates="business")
 
+    # ZIP plus name, the duplicate resolver's ZIP block (see app/services/resolver.py)
+    __table_args__ = (Index("ix_businesses_zip_key_name_key", "zip_key", "name_key"),)
+
 class Contact(Base):
     __tablename__ = "contacts"
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
@@ -0,0 +1,19 @@
+# /app/models/facets.py
+
+from sqlalchemy import BigInteger, Boolean, Column, String
+from app.models import Base
+
+# Business counts per combination of facet values, kept current by the
+# business write paths (see app/core/facets.py). Rows with an empty
+# source_id count each business once; the others count it once per linked
+# source, so per-source facets do not double count the totals.
+
+class BusinessFacetCount(Base):
+    __tablename__ = "business_facet_counts"
+    state = Column(String(255), primary_key=True, default="")
+    industry = Column(String(255), primary_key=True, default="")
+    source_id = Column(String(36), primary_key=True, default="")
+    has_email = Column(Boolean, primary_key=True, default=False)
+    has_phone = Column(Boolean, primary_key=True, default=False)
+    has_website = Column(Boolean, primary_key=True, default=False)
+    count = Column(BigInteger, nullable=False, default=0)
@@ -1,35 +1,45 @@
 # /app/models/joins.py
 
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Index, Table
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.models import Base, generate_uuid
+from app.models import Base
+
+# Each join table is keyed on its pair of foreign keys, so the primary key
+# serves lookups by the first column and a second index covers the reverse.
 
 class BusinessSource(Base):
     __tablename__ = "business_sources"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
-    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
-    source_id = Column(UUID(as_uuid=True), ForeignKey("sources.id"), nullable=False)
+    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), primary_key=True)
+    source_id = Column(UUID(as_uuid=True), ForeignKey("sources.id"), primary_key=True)
 
     business = relationship("Business", back_populates="sources")
     source = relationship("Source", back_populates="businesses")
+
+    __table_args__ = (
+        Index("ix_business_sources_source_id", "source_id"),
+    )
     
 class SourceContact(Base):
     __tablename__ = "source_contacts"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
-    source_id = Column(UUID(as_uuid=True), ForeignKey("sources.id"), nullable=False)
-    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id"), nullable=False)
+    source_id = Column(UUID(as_uuid=True), ForeignKey("sources.id"), primary_key=True)
+    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id"), primary_key=True)
 
     source = relationship("Source", back_populates="contacts")
     contact = relationship("Contact", back_populates="sources")
 
+    __table_args__ = (
+        Index("ix_source_contacts_contact_id", "contact_id"),
+    )
+
 class BusinessContact(Base):
     __tablename__ = "business_contacts"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
-    business_id =Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
-    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id"), nullable=False)
+    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), primary_key=True)
+    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id"), primary_key=True)
 
     business = relationship("Business", back_populates="contacts")
     contact = relationship("Contact", back_populates="businesses")
 
-
+    __table_args__ = (
+        Index("ix_business_contacts_contact_id", "contact_id"),
+    )
@@ -1,30 +1,42 @@
 from urllib.parse import unquote_plus
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi import Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.audit import audit_exempt
+from app.core.config import config
+from app.core.database import get_db, get_read_db, open_async_read_session, open_read_session
+from app.core.ndjson import iter_json_records
+from app.core.serializer import FastJSONResponse, select_columns
 
 from app.services.logger import Logger
-from app.services.exporter import Exporter
-from app.services.business import BusinessService
+from app.services.exporter import EXPORT_FIELDS, Exporter
+from app.services.business import BusinessIngest, BusinessService
+from app.services.changes import ChangeService
+from app.services.facets import FacetService
 
 from app.models.contact import Business
 from app.schemas.core import APIResponse, BusinessResponse
-from app.schemas.contact import BusinessSchema, BusinessSchemaCreate
+from app.schemas.contact import BusinessDeleteSchema, BusinessSchemaCreate
 
 log = Logger('router-business', log_level='DEBUG')
 
 business_router = APIRouter()
 
 @business_router.post("")
-async def add_business(business: BusinessSchemaCreate, db: Session = Depends(get_db)):
-    """Add a new business."""
+async def add_business(business: BusinessSchemaCreate, on_conflict: Optional[str] = None, db: Session = Depends(get_db)):
+    """Add a new business.
+
+    Pass `on_conflict=keep|fill|overwrite` to merge into a business with the
+    same name instead of getting a 409."""
     try:
         code = 200
         status = "success"
@@ -33,16 +45,16 @@ async def add_business(business: BusinessSchemaCreate, db: Session = Depends(get
         result = {}
 
         bus_service = BusinessService()
-        status, code, error_list, parameters, result = bus_service.add(db=db, data=business.model_dump())
+        status, code, error_list, parameters, result = bus_service.add(db=db, data=business.model_dump(), on_conflict=on_conflict)
         log.debug(f"Business creation response: {code}, {status}, {error_list}, {parameters}, {result}")
 
 
-        if parameters and isinstance(parameters, dict) and code == 200:
+        if parameters and isinstance(parameters, dict):
             for key, value in parameters.items():
                 if isinstance(value, UUID):
                     parameters[key] = str(value)
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=code,
             content={
                 "status": status,
@@ -55,7 +67,7 @@ async def add_business(business: BusinessSchemaCreate, db: Session = Depends(get
     except SQLAlchemyError as e:
         log.error(f"Error creating business: {e}")
         params = {k: str(v) if isinstance(v, UUID) else v for k, v in business.model_dump().items()}
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "status": "error",
@@ -68,7 +80,7 @@ async def add_business(business: BusinessSchemaCreate, db: Session = Depends(get
     except Exception as e:
         log.error(f"Unexpected error: {e}")
         params = {k: str(v) if isinstance(v, UUID) else v for k, v in business.model_dump().items()}
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "status": "error",
@@ -79,36 +91,292 @@ async def add_business(business: BusinessSchemaCreate, db: Session = Depends(get
             }
         )
 
+@business_router.post("/bulk")
+async def add_businesses_bulk(request: Request, db: Session = Depends(get_db)):
+    """Add many businesses from a streamed NDJSON body or JSON array of BusinessSchemaCreate records.
+
+    Records are written in batches of BULK_INGEST_BATCH_SIZE, each committed
+    on its own, and the response has one outcome per record in input order."""
+    batch_size = config.bulk_ingest["batch_size"]
+    ingest = BusinessIngest(db)
+    params = {"batch_size": batch_size}
+    batch = []
+    # A batched load repeats the same statements by design; keep it out of the N+1 audit
+    with audit_exempt():
+        try:
+            async for record in iter_json_records(request.stream()):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    await run_in_threadpool(ingest.add_batch, batch)
+                    batch = []
+            if batch:
+                await run_in_threadpool(ingest.add_batch, batch)
+            status, code, error_list, parameters, result = ingest.result(params)
+        except ValueError as e:
+            # The body stopped parsing part way; batches before it are already committed
+            log.error(f"Invalid bulk upload: {e}")
+            if batch:
+                await run_in_threadpool(ingest.add_batch, batch)
+            _, _, error_list, parameters, result = ingest.result(params)
+            status, code, error_list = "error", 400, error_list + [str(e)]
+
+    return FastJSONResponse(
+        status_code=code,
+        content={
+            "status": status,
+            "code": code,
+            "errors": error_list,
+            "params": parameters,
+            "data": result
+        }
+    )
+
 @business_router.get("", response_model=BusinessResponse)
-def read_businesses(request: Request, db: Session = Depends(get_db)):
-    """Read all businesses which match the parameters passed."""
+async def read_businesses(request: Request):
+    """Read all businesses which match the parameters passed.
+
+    Pass `fields=name,phone,city` to select only those columns and
+    `include=sources,contacts` to embed each business's sources and contacts."""
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return await run_in_threadpool(stream_businesses, request)
     query_params: Dict[str, Any] = dict(request.query_params)
 
+    # Opened here, not as a dependency: the NDJSON stream above reads through its own sync session
+    db = await open_async_read_session(request)
+    try:
+        bus_service = BusinessService()
+        code, status, error_list, parameters, results = await bus_service.get_async(db=db, params=query_params)
+    finally:
+        await db.close()
+    next_cursor = parameters.pop("next_cursor", None) if isinstance(parameters, dict) else None
+    total = parameters.pop("total", None) if isinstance(parameters, dict) else None
+    return FastJSONResponse(
+        status_code=code,
+        content={
+            "status": status,
+            "code": code,
+            "errors": error_list,
+            "params": parameters,
+            "data": results,
+            "next_cursor": next_cursor,
+            "total": total
+        }
+    )
+
+@business_router.get("/stream")
+def stream_businesses(request: Request):
+    """Stream every business matching the filters as NDJSON, one object per line.
+
+    Takes the same filters and `fields` as GET /businesses (also served
+    there for `Accept: application/x-ndjson`) but no paging: the whole result
+    set is sent, ordered by name, as fast as the client reads it."""
+    query_params: Dict[str, Any] = {k: v for k, v in request.query_params.items() if k not in ("limit", "skip", "cursor", "fields")}
+
     bus_service = BusinessService()
-    code, status, error_list, parameters, results = bus_service.get(db=db, params=query_params)
-    return JSONResponse(
+    try:
+        fields = bus_service.parse_fields(request.query_params.get("fields"))
+    except ValueError as e:
+        return FastJSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "code": 400,
+                "errors": [str(e)],
+                "params": dict(request.query_params),
+                "data": None
+            }
+        )
+
+    db = open_read_session(request)
+    query, invalid_params = bus_service.build_query(query_params, db.get_bind())
+    if invalid_params:
+        db.close()
+        log.warning(f"Invalid query parameters: {invalid_params}")
+        return FastJSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "code": 400,
+                "errors": [f"Invalid query parameters: {invalid_params}"],
+                "params": query_params,
+                "data": None
+            }
+        )
+    return StreamingResponse(bus_service.stream(db, query, fields=fields), media_type="application/x-ndjson")
+
+@business_router.get("/facets")
+def read_business_facets(request: Request, by: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """Count businesses per value of the `by` facets (comma separated: state,
+    industry, source, has_email, has_phone, has_website).
+
+    Other query parameters filter the businesses counted, e.g.
+    `?by=state&industry=roofing&has_email=true`."""
+    query_params: Dict[str, Any] = {k: v for k, v in request.query_params.items() if k != "by"}
+
+    facet_service = FacetService()
+    status, code, error_list, parameters, result = facet_service.get(db=db, by=by, params=query_params)
+    return FastJSONResponse(
         status_code=code,
         content={
             "status": status,
             "code": code,
             "errors": error_list,
             "params": parameters,
-            "data": results
+            "data": result
         }
     )
 
+@business_router.get("/near")
+def read_businesses_near(request: Request, db: Session = Depends(get_read_db)):
+    """Businesses within `radius` miles (default 25) of `zip` or of `lat` and `lon`, nearest first.
+
+    Other parameters filter as on GET /businesses, e.g.
+    `?zip=30115&radius=30&industry=roofing`; each result has its `distance`
+    in miles. Businesses are placed at their ZIP code's centroid."""
+    query_params: Dict[str, Any] = dict(request.query_params)
+
+    bus_service = BusinessService()
+    code, status, error_list, parameters, results = bus_service.near(db=db, params=query_params)
+    total = parameters.pop("total", None) if isinstance(parameters, dict) else None
+    return FastJSONResponse(
+        status_code=code,
+        content={
+            "status": status,
+            "code": code,
+            "errors": error_list,
+            "params": parameters,
+            "data": results,
+            "total": total
+        }
+    )
+
+@business_router.get("/changes")
+def read_business_changes(since: Optional[str] = None, limit: Optional[int] = None, fields: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """Businesses inserted, updated or deleted after the `since` sync token, oldest first.
+
+    Omit `since` to start from the beginning. Page through with `data.next`
+    until `data.has_more` is false, then keep `data.next` for the next sync.
+    `fields` limits the business columns returned, as on GET /businesses."""
+    change_service = ChangeService()
+    status, code, error_list, parameters, result = change_service.get(db=db, since=since, limit=limit, fields=fields)
+    return FastJSONResponse(
+        status_code=code,
+        content={
+            "status": status,
+            "code": code,
+            "errors": error_list,
+            "params": parameters,
+            "data": result
+        }
+    )
+
+@business_router.get("/export")
+def read_businesses_export(fields: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """Read all businesses for export, optionally only the comma separated `fields`."""
+    export = Exporter()
+    try:
+        fieldnames = BusinessService().parse_fields(fields) if fields else EXPORT_FIELDS
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Value error: {e}")
+    try:
+        # Only the exported columns are read, never the notes payload unless asked for
+        businesses = db.execute(select_columns(select(Business), Business, fieldnames)).mappings().all()
+        log.info(f"Exporting {len(businesses)} businesses to CSV")
+        response = export.to_csv(businesses, fieldnames)
+        return FileResponse(path=response['path'], media_type='text/csv', filename=response['filename'])
+    except FileNotFoundError as e:
+        log.error(f"File not found: {e}")
+        raise HTTPException(status_code=404, detail=f"File not found: {e}")
+    except PermissionError as e:
+        log.error(f"Permission error: {e}")
+        raise HTTPException(status_code=403, detail=f"Permission error: {e}")
+    except SQLAlchemyError as e:
+        log.error(f"Error reading businesses for export: {e}")
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    except Exception as e:
+        log.error(f"Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
+
+def _lookup_businesses(request: Request, key: str, value: str, db: Session) -> FastJSONResponse:
+    query_params: Dict[str, Any] = dict(request.query_params)
+
+    bus_service = BusinessService()
+    code, status, error_list, parameters, results = bus_service.lookup(db=db, key=key, value=value, params=query_params)
+    next_cursor = parameters.pop("next_cursor", None) if isinstance(parameters, dict) else None
+    return FastJSONResponse(
+        status_code=code,
+        content={
+            "status": status,
+            "code": code,
+            "errors": error_list,
+            "params": parameters,
+            "data": results,
+            "next_cursor": next_cursor
+        }
+    )
+
+@business_router.get("/by-phone/{phone}")
+def read_businesses_by_phone(request: Request, phone: str, db: Session = Depends(get_read_db)):
+    """Businesses with this phone number, however either side is formatted.
+
+    Like GET /businesses, takes `fields`, `include` and paging parameters."""
+    return _lookup_businesses(request, "phone_key", phone, db)
+
+@business_router.get("/by-domain/{domain}")
+def read_businesses_by_domain(request: Request, domain: str, db: Session = Depends(get_read_db)):
+    """Businesses whose website is on this registrable domain (shop.abc.com and abc.com both match abc.com)."""
+    return _lookup_businesses(request, "domain_key", domain, db)
+
+@business_router.get("/by-email/{email}")
+def read_businesses_by_email(request: Request, email: str, db: Session = Depends(get_read_db)):
+    """Businesses with this email address, ignoring case."""
+    return _lookup_businesses(request, "email_key", email, db)
+
+@business_router.get("/by-name/{name}")
+def read_businesses_by_name(request: Request, name: str, db: Session = Depends(get_read_db)):
+    """Businesses whose name matches this one once case, punctuation and words like LLC are dropped."""
+    return _lookup_businesses(request, "name_key", name, db)
+
 @business_router.get("/{name}")
-def get_business(name: str, db: Session = Depends(get_db)):
-    """Get a business by name."""
+def get_business(name: str, include: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a business by name.
+
+    Pass `include=sources,contacts` to embed its sources and contacts."""
+    bus_service = BusinessService()
+    try:
+        include_names = bus_service.parse_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
-        business = db.query(Business).filter(Business.name == name).first()
+        business = bus_service.with_includes(db.query(Business), include_names).filter(Business.name == name).first()
         if business is None:
             raise HTTPException(status_code=404, detail="Business not found")
-        return business
+        # BUSINESS_FIELDS only, never the derived lookup and geo columns
+        return FastJSONResponse(content=bus_service.business_dict(business, include_names))
     except SQLAlchemyError as e:
         log.error(f"Error reading business: {e}")
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     
+@business_router.delete("")
+def delete_businesses(criteria: BusinessDeleteSchema, db: Session = Depends(get_db)):
+    """Delete every business matching the body's criteria, e.g. a bad scrape batch:
+    `{"source": "GAF", "filters": {"zip": "30301"}, "created_after": "2026-10-01T00:00:00"}`.
+
+    Criteria combine with AND and at least one is required. Pass
+    `"dry_run": true` to get the counts without deleting anything."""
+    bus_service = BusinessService()
+    status, code, error_list, parameters, result = bus_service.remove_many(db, criteria)
+    return FastJSONResponse(
+        status_code=code,
+        content={
+            "status": status,
+            "code": code,
+            "errors": error_list,
+            "params": parameters,
+            "data": result
+        }
+    )
+
 @business_router.delete("/{id_or_name}")
 def delete_business(id_or_name: str, db: Session = Depends(get_db)):
     """Delete a business by ID or name."""
@@ -128,63 +396,32 @@ def delete_business(id_or_name: str, db: Session = Depends(get_db)):
     try:
         if id:
             business = db.query(Business).filter(Business.id == id).first()
-        if name:
+        else:
             business = db.query(Business).filter(Business.name == name).first()
-            id = business.id if business else None
-        
-        if business is None:
-            raise HTTPException(status_code=404, detail="Business not found")
-
-        from app.models.joins import BusinessSource
-        db.query(BusinessSource).filter(BusinessSource.business_id == id).delete()
-        
-        db.delete(business)
-        db.commit()
-
-        return JSONResponse(
-            status_code=204, 
-            content={
-                "status": "success",
-                "code": 204,
-                "errors": [],
-                "params": {id_or_name},
-                "data": {}
-            }
-        )
     except SQLAlchemyError as e:
-        log.error(f"Error deleting business: {e}")
-        db.rollback()
+        log.error(f"Error reading business to delete: {e}")
         raise HTTPException(status_code=500, detail=f"Database error = {e}")
-    except Exception as e:
-        log.error(f"Unexpected error: {e}")
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Unexpected error = {e}")
+    if business is None:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    # Facet counts, the tombstone and every join table are handled by the service, on the writer
+    status, code, error_list, parameters, result = business_service.remove(db, business)
+    if status == 'error':
+        raise HTTPException(status_code=code, detail="; ".join(error_list))
 
+    return JSONResponse(
+        status_code=204, 
+        content={
+            "status": "success",
+            "code": 204,
+            "errors": [],
+            "params": {"id_or_name": id_or_name},
+            "data": {}
+        }
+    )
         
-@business_router.get("/export")
-def read_businesses_export(db: Session = Depends(get_db)):
-    """Read all businesses for export."""
-    export = Exporter()
-    try:
-        businesses = db.query(Business).all()
-        log.info(f"Exporting {len(businesses)} businesses to CSV")
-        response = export.to_csv(businesses)
-        return FileResponse(path=response['path'], media_type='text/csv', filename=response['filename'])
-    except FileNotFoundError as e:
-        log.error(f"File not found: {e}")
-        raise HTTPException(status_code=404, detail=f"File not found: {e}")
-    except PermissionError as e:
-        log.error(f"Permission error: {e}")
-        raise HTTPException(status_code=403, detail=f"Permission error: {e}")
-    except SQLAlchemyError as e:
-        log.error(f"Error reading businesses for export: {e}")
-        raise HTTPException(status_code=500, detail=f"Database error: {e}")
-    except Exception as e:
-        log.error(f"Unexpected error: {e}")
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
-    
 @business_router.get("/export/{params}")
-def export_businesses(params: str, db: Session = Depends(get_db)):
+def export_businesses(params: str, db: Session = Depends(get_read_db)):
     """Export a business by name into CSV with optional filters."""
     export = Exporter()
     try:
@@ -213,40 +450,24 @@ def export_businesses(params: str, db: Session = Depends(get_db)):
                         value = unquote_plus(value)
                         query_params[key] = value
             
-        # Build dynamic query
-        query = db.query(Business)
-        
         # Apply name filter if it exists
         if original_params and not '=' in original_params:
-            decoded_params = unquote_plus(original_params)  # Decode the search term
-            query = query.filter(Business.name.ilike(f"%{decoded_params}%"))
-            
-        # Apply additional filters from query parameters
-        for key, value in query_params.items():
-            if hasattr(Business, key):
-                query = query.filter(getattr(Business, key).ilike(f"%{value}%"))
-        
-        businesses = query.all()
+            query_params['name'] = original_params
+
+        # Same filters as GET /businesses, served by the search index where there is one
+        bus_service = BusinessService()
+        query, invalid_params = bus_service.build_query(query_params, db.get_bind())
+        if invalid_params:
+            log.warning(f"Ignoring unknown export filters: {invalid_params}")
+
+        # Default fieldnames if not provided
+        fieldnames = bus_service.parse_fields(",".join(fieldnames)) if fieldnames else EXPORT_FIELDS
+        businesses = db.execute(select_columns(query, Business, fieldnames)).mappings().all()
         log.info(f"Found {len(businesses)} businesses matching criteria")
         
         if not businesses:
             log.error(f"404 - No businesses found matching criteria")
             raise HTTPException(status_code=404, detail=f"No businesses found matching criteria: {params}")
-        
-        if not fieldnames:
-            # Default fieldnames if not provided
-            fieldnames = [
-                'name',
-                'address',
-                'address2',
-                'city',
-                'state',
-                'zip',
-                'phone',
-                'email',
-                'website',
-                'industry'
-            ]
 
         response = export.to_csv(businesses, fieldnames, filename)
         log.info(f"Exported {len(businesses)} businesses to CSV")
@@ -276,14 +497,22 @@ def export_businesses(params: str, db: Session = Depends(get_db)):
         log.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
 
-@business_router.get("/business/{business_id}", response_model=BusinessSchema)
-def read_business(business_id: int, db: Session = Depends(get_db)):
-    """Read a specific business by ID."""
+@business_router.get("/business/{business_id}")
+def read_business(business_id: UUID, include: Optional[str] = None, db: Session = Depends(get_db)):
+    """Read a specific business by ID.
+
+    Pass `include=sources,contacts` to embed its sources and contacts."""
+    bus_service = BusinessService()
+    try:
+        include_names = bus_service.parse_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
-        business = db.query(Business).filter(Business.id == business_id).first()
+        business = bus_service.with_includes(db.query(Business), include_names).filter(Business.id == business_id).first()
         if business is None:
             raise HTTPException(status_code=404, detail="Business not found")
-        return business
+        # Business.sources holds BusinessSource link rows, so serialize as GET /businesses/{name} does
+        return FastJSONResponse(content=bus_service.business_dict(business, include_names))
     except SQLAlchemyError as e:
         log.error(f"Error reading business: {e}")
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
\ No newline at end of file
@@ -0,0 +1,211 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_pool_status, get_read_db, get_sessionmaker
+from app.core.facets import rebuild as rebuild_facets
+from app.core.geo import locate_missing
+from app.core.profiling import get_slow_queries
+from app.core.timeouts import get_query_stats
+from app.core.writer import write_queue
+from app.services.resolver import resolve_new
+from app.services.logger import Logger
+
+log = Logger('router-internal', log_level='DEBUG')
+
+internal_router = APIRouter()
+
+@internal_router.get("/db/pool")
+def get_db_pool():
+    """Report connection pool usage for the shared database engine."""
+    try:
+        status = get_pool_status()
+        if write_queue.enabled:
+            status["write_queue_pending"] = write_queue.pending()
+        status["statements"] = get_query_stats()
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "code": 200,
+                "errors": [],
+                "params": {},
+                "data": status
+            }
+        )
+    except Exception as e:
+        log.error(f"Error reading pool status: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "code": 500,
+                "errors": [str(e)],
+                "params": {},
+                "data": None
+            }
+        )
+
+@internal_router.get("/db/slow-queries")
+def get_db_slow_queries(order_by: str = "max", limit: int = None):
+    """Report the most expensive statement fingerprints seen by this process."""
+    params = {"order_by": order_by, "limit": limit}
+    try:
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "code": 200,
+                "errors": [],
+                "params": params,
+                "data": get_slow_queries(order_by, limit)
+            }
+        )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "code": 400,
+                "errors": [str(e)],
+                "params": params,
+                "data": None
+            }
+        )
+    except Exception as e:
+        log.error(f"Error reading slow queries: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "code": 500,
+                "errors": [str(e)],
+                "params": params,
+                "data": None
+            }
+        )
+
+def _rebuild_facets(db) -> int:
+    rows = rebuild_facets(db)
+    db.commit()
+    return rows
+
+@internal_router.post("/facets/rebuild")
+def rebuild_business_facets():
+    """Recompute the business facet counts, e.g. after businesses were changed outside the API."""
+    db = get_sessionmaker()()
+    try:
+        rows = write_queue.submit(_rebuild_facets, db)
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "code": 200,
+                "errors": [],
+                "params": {},
+                "data": {"rows": rows}
+            }
+        )
+    except Exception as e:
+        db.rollback()
+        log.error(f"Error rebuilding business facets: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "code": 500,
+                "errors": [str(e)],
+                "params": {},
+                "data": None
+            }
+        )
+    finally:
+        db.close()
+
+def _locate_batch(db, after) -> tuple[int, object]:
+    result = locate_missing(db, after=after)
+    db.commit()
+    return result
+
+@internal_router.post("/geo/locate")
+def locate_businesses():
+    """Set coordinates on businesses that lack them from the ZIP centroids, e.g. after loading zip_codes."""
+    db = get_sessionmaker()()
+    located, after = 0, None
+    try:
+        # One queued write per batch, so other writers get a turn in between
+        while True:
+            count, after = write_queue.submit(_locate_batch, db, after)
+            located += count
+            if after is None:
+                break
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "code": 200,
+                "errors": [],
+                "params": {},
+                "data": {"located": located}
+            }
+        )
+    except Exception as e:
+        db.rollback()
+        log.error(f"Error locating businesses after {located}: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "code": 500,
+                "errors": [str(e)],
+                "params": {},
+                "data": {"located": located}
+            }
+        )
+    finally:
+        db.close()
+
+@internal_router.get("/duplicates")
+def get_duplicate_businesses(since: Optional[datetime] = None, ids: List[UUID] = Query([]), db: Session = Depends(get_read_db)):
+    """Cluster new businesses (created since `since`, or the given ids) with their likely duplicates.
+
+    The whole-table run takes minutes; use scripts/resolve_duplicates.py for it."""
+    params = {"since": since.isoformat() if since else None, "ids": [str(business_id) for business_id in ids]}
+    if since is None and not ids:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "code": 400,
+                "errors": ["Pass since or ids to pick the new businesses."],
+                "params": params,
+                "data": None
+            }
+        )
+    try:
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "code": 200,
+                "errors": [],
+                "params": params,
+                "data": resolve_new(db, since=since, business_ids=ids)
+            }
+        )
+    except Exception as e:
+        log.error(f"Error resolving duplicate businesses: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "code": 500,
+                "errors": [str(e)],
+                "params": params,
+                "data": None
+            }
+        )
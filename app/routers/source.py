@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 
 from fastapi.responses import JSONResponse
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_read_db
 from app.models.source import Source
 from app.schemas.source import SourceSchemaRef
 from app.services.logger import Logger
@@ -18,8 +19,8 @@ log = Logger('router-source', log_level='DEBUG')
 source_router = APIRouter()
 
 @source_router.get("")
-def get_sources(
-    db: Session = Depends(get_db),
+async def get_sources(
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = 0,
     limit: int = 100,
     search: str = None,
@@ -27,7 +28,7 @@ def get_sources(
     """Get a list of sources."""
     try:
         sources = SourceService()
-        status, code, error_list, parameters, results = sources.get(db=db, skip=skip, limit=limit, search=search)
+        status, code, error_list, parameters, results = await sources.get_async(db=db, skip=skip, limit=limit, search=search)
         log.debug(f"Code: {code}, Status: {status}, Errors: {error_list}, Parameters: {parameters}, Results: {results}")
 
         response = SourceResponse(
@@ -65,16 +66,16 @@ def get_sources(
         )
 
 @source_router.get("/{source_name}", response_model=SourceResponse)
-def get_source(
+async def get_source(
     source_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = 0,
     limit: int = 100,
 ):
     """Get a specific source by name."""
     try:
         sources = SourceService()
-        status, code, error_list, parameters, results = sources.get(db=db, skip=skip, limit=limit, search=source_name)
+        status, code, error_list, parameters, results = await sources.get_async(db=db, skip=skip, limit=limit, search=source_name)
         log.debug(f"Code: {code}, Status: {status}, Errors: {error_list}, Parameters: {parameters}, Results: {results}")
 
         response = SourceResponse(
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, field_validator, model_serializer
 from pydantic.networks import EmailStr, HttpUrl
-from typing import Optional, List
+from typing import Dict, Optional, List
+from datetime import datetime
 import uuid
 
 from pydantic import ConfigDict
@@ -126,3 +127,11 @@ class BusinessContactSchema(BaseModel):
         max_recursion=1,
     )
 
+class BusinessDeleteSchema(BaseModel):
+    """Which businesses DELETE /businesses removes: those matching every criterion given."""
+    ids: List[uuid.UUID] = Field(default=[], description="Only these businesses.")
+    source: Optional[str] = Field(None, description="Only businesses linked to the source with this exact name.")
+    filters: Dict[str, str] = Field(default={}, description="Exact column values, e.g. {\"zip\": \"30301\"}.")
+    created_after: Optional[datetime] = Field(None, description="Only businesses created at or after this time.")
+    created_before: Optional[datetime] = Field(None, description="Only businesses created before this time.")
+    dry_run: bool = Field(False, description="Count what would be deleted without deleting it.")
@@ -9,6 +9,8 @@ class APIResponse(BaseModel):
     
 class BusinessResponse(APIResponse):
     data: Optional[Dict[str, Any]] = Field({}, description="Data returned by the API, if any")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+    total: Optional[int] = Field(None, description="Approximate number of matching businesses; null when the filters cannot be counted cheaply")
 
 class SourceResponse(APIResponse):
     data: Optional[Dict[str, Any]] = Field({}, description="List of sources returned by the API")
\ No newline at end of file
@@ -1,26 +1,73 @@
+import base64
+import io
+import json
+from collections import Counter
 from uuid import UUID
 from datetime import datetime
+import numpy as np
+from app.core.changes import record_deletes
 from app.core.config import config
-from sqlalchemy.orm import Session
+from app.core.database import dialect_insert
+from app.core.facets import apply_deltas, business_deltas
+from app.core.geo import GEO_COLUMNS, cells_within, bounding_box, haversine_miles, locate, zip_centroids, zip5
+from app.core.search import search_filters
+from app.core.serializer import dumps, rows_to_dicts, select_columns
+from app.core.timeouts import renew_deadline
+from app.core.writer import single_writer
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import Select, case, delete, func, literal, select, tuple_
+from typing import Iterator, List, Optional
+from pydantic import ValidationError
+from app.models import generate_uuid
 from app.models.contact import Business
-from app.schemas.contact import BusinessSchema, BusinessSchemaRead, BusinessSchemaCreate
+from app.schemas.contact import BusinessDeleteSchema, BusinessSchema, BusinessSchemaRead, BusinessSchemaCreate
 from app.services.logger import Logger
 from app.services.formatter import Formatter
 from app.services.exporter import Exporter
-from app.services.source import SourceService
+from app.services.facets import FacetService
+from app.services.source import source_registry
 from app.models.source import Source
-from app.models.joins import BusinessSource
+from app.models.joins import BusinessContact, BusinessSource
 from app.schemas.source import SourceData
 from app.schemas.core import APIResponse, BusinessResponse
 
 from urllib.parse import unquote_plus
 
 log = Logger('service-business')
+
+# Businesses are paged in (name, id) order; name is unique, id breaks ties if that ever changes
+CURSOR_SORT_KEY = 'name'
+# Columns of a business in list responses, in response order (as BusinessSchemaRead)
+BUSINESS_FIELDS = ('id', 'name', 'address', 'address2', 'city', 'state', 'zip', 'phone', 'website', 'email', 'industry', 'notes')
+# Relationships a read can ask for with include=, each loaded for the whole page in two queries
+BUSINESS_INCLUDES = {
+    "sources": selectinload(Business.sources).selectinload(BusinessSource.source),
+    "contacts": selectinload(Business.contacts).selectinload(BusinessContact.contact),
+}
+# Rows fetched per server-side cursor batch by stream()
+STREAM_BATCH_SIZE = 1000
+# Postgres temp table the bulk ingest COPYs each batch into
+BULK_STAGING_TABLE = 'businesses_ingest'
+# Merge policies for add(on_conflict=...)
+UPSERT_POLICIES = ('keep', 'fill', 'overwrite')
+# Businesses removed per transaction by remove_many()
+DELETE_BATCH_SIZE = 1000
+# Lookup key columns and the column each is derived from, by the Formatter method of the same name
+LOOKUP_KEYS = {'phone_key': 'phone', 'domain_key': 'website', 'email_key': 'email', 'name_key': 'name', 'zip_key': 'zip'}
+# Columns derived from another column at write time, and the column each follows
+DERIVED_COLUMNS = {**LOOKUP_KEYS, **{column: 'zip' for column in GEO_COLUMNS}}
+# GET /businesses/near radius in miles, by default and at most
+NEAR_RADIUS_MILES = 25
+MAX_NEAR_RADIUS_MILES = 250
 format = Formatter()
-sources = SourceService()
+
+def _copy_value(value) -> str:
+    """Render a value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
 
 class BusinessService:
     def __init__(self):
@@ -30,6 +77,8 @@ class BusinessService:
         """Serialize a Business object to a dictionary."""
         business_dict = business.__dict__.copy()
         business_dict.pop('_sa_instance_state', None)
+        for key in [*LOOKUP_KEYS, 'geo_cell']:
+            business_dict.pop(key, None)
 
         keys_to_process = list(business_dict.keys())
 
@@ -49,7 +98,48 @@ class BusinessService:
 
         return processed_dict
 
+    def _normalize(self, data: dict) -> dict:
+        """Format a BusinessSchemaCreate dump into Business column values.
+
+        add() and the bulk ingest both go through here so a record is stored
+        the same way whichever endpoint it came in on."""
+        # No per-field debug logging here: the bulk ingest runs this for every record
+        name = format.name(str(data['name']))
+        industry = format.name(str(data["industry"])) or "" if data.get("industry") else ""
+        email = format.email(data["email"]) or "" if data.get("email") else ""
+        phone_number = format.phone(data["phone"]) or "" if data.get("phone") else ""
+        if data.get("address"):
+            address, address2, city, state, zip = format.address_parts(data["address"])
+            zip = format.zip(zip) or ""
+        else:
+            address = address2 = city = state = zip = ""
+        website = format.website(data["website"]) or "" if data.get("website") else ""
+
+        values = {
+            "name": name, "industry": industry, "email": email, "phone": phone_number,
+            "address": address, "address2": address2, "city": city, "state": state, "zip": zip,
+            "website": website, "notes": str(data),
+        }
+        return {**values, **self.lookup_keys(values)}
+
+    def lookup_keys(self, values) -> dict:
+        """The lookup key columns for a business's values (a dict or a Business)."""
+        get = values.get if isinstance(values, dict) else lambda column: getattr(values, column)
+        return {key: getattr(format, key)(get(column)) for key, column in LOOKUP_KEYS.items()}
+
+    def _facet_rows(self, db: Session, *where) -> list:
+        """The facet columns of matching businesses, once per linked source (source_id None if unlinked)."""
+        return db.execute(
+            select(Business.id, Business.state, Business.industry, Business.email, Business.phone, Business.website, BusinessSource.source_id)
+            .outerjoin(BusinessSource, BusinessSource.business_id == Business.id)
+            .where(*where)
+        ).all()
+
+    @single_writer
     def update(self, db: Session, business: Business, data: BusinessSchema) -> Business:
+        # Load the existing links once rather than once per incoming source
+        linked = {bs.source_id for bs in business.sources}
+        deltas = business_deltas(business, linked, -1)
         business.name = data.name
         business.industry = data.industry
         business.email = data.email
@@ -61,16 +151,65 @@ class BusinessService:
         business.zip = data.zip
         business.website = data.website
         business.notes = data.notes
-        for source_id in data.sources:
-            if source_id not in [bs.source_id for bs in business.sources]:
-                business.sources.append(source_id)
+        for key, value in self.lookup_keys(business).items():
+            setattr(business, key, value)
+        geo = locate(db, [{"zip": business.zip}])[0]
+        for column in GEO_COLUMNS:
+            setattr(business, column, geo[column])
+        for source in data.sources:
+            if source.id is not None and source.id not in linked:
+                business.sources.append(BusinessSource(source_id=source.id))
+                linked.add(source.id)
+        apply_deltas(db, business_deltas(business, linked, 1, deltas))
         db.commit()
         db.refresh(business)
         log.info(f"Updated business: {business.name} (ID: {business.id})")
         return business
 
-    def add(self, db: Session, data: BusinessSchemaCreate) -> BusinessSchema:
-        """Add a new business to the database."""
+    def _upsert(self, db: Session, values: dict, on_conflict: str) -> tuple[Business, str]:
+        """INSERT ... ON CONFLICT (name) DO UPDATE for add(), merging per `on_conflict`.
+
+        One statement whichever way it goes; the RETURNING row carries the id
+        generated here only if it was inserted. Returns the row and whether it
+        was created, updated or left unchanged."""
+        business_id = generate_uuid()
+        now = datetime.now()
+        stmt = dialect_insert(db, Business).values(id=business_id, created=now, updated=now, **values)
+        existing, incoming = Business.__table__.c, stmt.excluded
+        merged = [column for column in values if column != 'name' and column not in DERIVED_COLUMNS]
+        if on_conflict == 'keep':
+            # A no-op update rather than DO NOTHING, so RETURNING still yields the stored row
+            set_ = {"name": incoming.name}
+        elif on_conflict == 'fill':
+            set_ = {column: func.coalesce(func.nullif(existing[column], ''), incoming[column]) for column in merged}
+            # Each derived column follows whichever value its column kept
+            set_.update({
+                key: case((func.nullif(existing[column], '').is_(None), incoming[key]), else_=existing[key])
+                for key, column in DERIVED_COLUMNS.items() if column != 'name'
+            })
+            set_["updated"] = incoming.updated
+        else:
+            set_ = {column: func.coalesce(func.nullif(incoming[column], ''), existing[column]) for column in merged}
+            set_.update({
+                key: case((func.nullif(incoming[column], '').is_(None), existing[key]), else_=incoming[key])
+                for key, column in DERIVED_COLUMNS.items() if column != 'name'
+            })
+            set_["updated"] = incoming.updated
+        stmt = stmt.on_conflict_do_update(index_elements=['name'], set_=set_).returning(Business)
+        business = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+
+        if business.id == business_id:
+            return business, 'created'
+        return business, 'unchanged' if on_conflict == 'keep' else 'updated'
+
+    @single_writer
+    def add(self, db: Session, data: BusinessSchemaCreate, on_conflict: Optional[str] = None) -> BusinessSchema:
+        """Add a new business to the database.
+
+        By default a name that already exists is a 409. With `on_conflict` the
+        add becomes an upsert that merges into the existing row instead:
+        `keep` leaves it as is, `fill` only sets its empty fields, and
+        `overwrite` replaces every field the new record has a value for."""
         log.info(f"Adding new business: {data}")
         errors = []
         status = 'success'
@@ -78,70 +217,57 @@ class BusinessService:
         params = data
         result_data = {}
 
+        if on_conflict is not None and on_conflict not in UPSERT_POLICIES:
+            errors.append(f"on_conflict must be one of {', '.join(UPSERT_POLICIES)}, not '{on_conflict}'.")
+            return 'error', 400, errors, params, result_data
+
         try:
-            name = format.name(str(params['name']))
-            existing_business: Business = db.query(Business).filter(Business.name == name).first()
-            log.debug(f"Existing business: {existing_business}")
+            values = locate(db, [self._normalize(data)])[0]
+            name = values['name']
+            if on_conflict is None:
+                existing_business: Business = db.query(Business).filter(Business.name == name).first()
+                log.debug(f"Existing business: {existing_business}")
 
-            if existing_business:
-                log.warning(f"Business with name '{name}' already exists.")
-                errors.append(f"Business with name '{name}' already exists.")
-                return 'error', 409, errors, {"name": name}, self._serialize_business(existing_business)
+                if existing_business:
+                    log.warning(f"Business with name '{name}' already exists.")
+                    errors.append(f"Business with name '{name}' already exists.")
+                    return 'error', 409, errors, {"name": name}, self._serialize_business(existing_business)
 
-            #source = db.execute(select(Source).where(Source.id == data.source_id)).scalar_one_or_none()
-            _, _, _, _, source = sources.get(db, search=data['source'])
+            source = source_registry.lookup(db, data['source'], partial=True)
             log.debug(f"Source: {source}")
-            
-            if not source or 'sources' not in source or not source['sources']:
-                log.error(f"Invalid source structure: {source}")
-                errors.append("Invalid source structure.")
+
+            if source is None:
+                log.error(f"Unknown source: {data['source']}")
+                errors.append(f"Unknown source '{data['source']}'.")
                 return 'error', 500, errors, params, result_data
-            
-            source_id = source['sources'][0]['id']
+
+            source_id, source_name = source
             log.debug(f"Source ID: {source_id} (type: {type(source_id)})")
-            
-            log.debug(f"Name: {name}")
-            if data.get("industry"):
-                industry = format.name(str(data.get("industry"))) or ""
-                log.debug(f"Industry: {industry}")
-            else: 
-                industry = ""
-            if data.get("email"):
-                email = format.email(data.get("email")) or ""
-                log.debug(f"Email: {email}")
-            else:
-                email = ""
-            if data.get("phone"):
-                phone_number = format.phone(data.get("phone")) or ""
-                log.debug(f"Phone: {phone_number}")
-            else:
-                phone_number = ""
-            if data.get("address"):
-                address, address2, city, state, zip = format.address_parts(data.get("address"))
-                zip = format.zip(zip) or ""
-                log.debug(f"Address: {address}, Address2: {address2}, City: {city}, State: {state}, Zip: {zip}")
-            else:
-                address = address2 = city = state = zip = ""
-            if data.get("website"):
-                website = format.website(data.get("website")) or ""
-                log.debug(f"Website: {website}")
+
+            if on_conflict is not None:
+                # The row as it was, to take it out of the facet counts if the merge changes it
+                before = self._facet_rows(db, Business.name == name)
+                business, action = self._upsert(db, values, on_conflict)
+                code = 201 if action == 'created' else 200
+                log.info(f"Upserted business ({action}): {business.name} (ID: {business.id})")
+                # An existing business may already be linked to this source
+                db.execute(dialect_insert(db, BusinessSource).values(business_id=business.id, source_id=source_id)
+                           .on_conflict_do_nothing(index_elements=['business_id', 'source_id']))
+                linked = {str(row.source_id) for row in before if row.source_id is not None}
+                deltas = business_deltas(before[0], linked, -1) if before else Counter()
+                apply_deltas(db, business_deltas(business, linked | {str(source_id)}, 1, deltas))
             else:
-                website = ""
-            
-            business = Business(
-                name=name, industry=industry, email=email, phone=phone_number,
-                address=address, address2=address2, city=city, state=state, zip=zip,
-                website=website, notes=str(data)
-            )
-            log.debug(f"Business object: {business}")
-            db.add(business)
-            db.flush()
-            db.refresh(business)
-            log.info(f"Added new business: {business.name} (ID: {business.id})")
-            
-            # Create a new BusinessSource object and associate it with the business
-            business_source = BusinessSource(business_id=business.id, source_id=source_id)
-            db.add(business_source)
+                business = Business(**values)
+                log.debug(f"Business object: {business}")
+                db.add(business)
+                db.flush()
+                db.refresh(business)
+                log.info(f"Added new business: {business.name} (ID: {business.id})")
+
+                # Create a new BusinessSource object and associate it with the business
+                business_source = BusinessSource(business_id=business.id, source_id=source_id)
+                db.add(business_source)
+                apply_deltas(db, business_deltas(business, [source_id]))
             db.commit()
             db.refresh(business)
             log.info(f"Added source to business: {business.name} (ID: {business.id})")
@@ -158,11 +284,13 @@ class BusinessService:
                 "zip": business.zip,
                 "website": business.website,
                 "industry": business.industry,
-                "source": source['sources'][0]['name'] if source['sources'] else None,
+                "source": source_name,
                 "notes": business.notes,
             }
+            if on_conflict is not None:
+                business_dict["action"] = action
 
-            return 'success', 201, errors, data, business_dict
+            return 'success', code, errors, data, business_dict
         except SQLAlchemyError as e:
             log.error(f"Error adding business: {e}")
             errors.append(f"Error adding business: {e}")
@@ -172,10 +300,85 @@ class BusinessService:
             errors.append(f"Unexpected error: {e}")
             return 'error', 500, [str(e)], params, result_data
         
-    def get(self, db: Session, params: dict = None) -> Optional[List[Business]]:
-        errors = []
-        original_params = params.copy() if params else {}
-        
+    def _encode_cursor(self, business: Business) -> str:
+        """Opaque keyset cursor for the row after which the next page starts."""
+        payload = json.dumps([getattr(business, CURSOR_SORT_KEY), str(business.id)], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode_cursor(self, cursor: str) -> tuple[str, UUID]:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            sort_value, business_id = json.loads(payload)
+            return sort_value, UUID(business_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    def parse_include(self, include: Optional[str]) -> list[str]:
+        """Validate a comma separated include= value, returning the relationship names."""
+        names = [name.strip() for name in (include or "").split(",") if name.strip()]
+        unknown = [name for name in names if name not in BUSINESS_INCLUDES]
+        if unknown:
+            raise ValueError(f"Unknown include {unknown}, choose from {', '.join(BUSINESS_INCLUDES)}")
+        return list(dict.fromkeys(names))
+
+    def with_includes(self, query, include: list[str]):
+        """Add the selectinload() options for the included relationships to an entity select or Query."""
+        return query.options(*(BUSINESS_INCLUDES[name] for name in include))
+
+    def parse_fields(self, fields: Optional[str]) -> tuple[str, ...]:
+        """Validate a comma separated fields= value, returning the columns to select (all of BUSINESS_FIELDS if empty)."""
+        names = [name.strip() for name in (fields or "").split(",") if name.strip()]
+        unknown = [name for name in names if name not in BUSINESS_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}, choose from {', '.join(BUSINESS_FIELDS)}")
+        return tuple(dict.fromkeys(names)) or BUSINESS_FIELDS
+
+    def _projection(self, fields: tuple[str, ...]) -> tuple[str, ...]:
+        """The columns to select for `fields`: the fields, then any paging keys they lack.
+
+        rows_to_dicts() zips rows with `fields`, so the trailing keys stay out of the response."""
+        return fields + tuple(key for key in ('id', CURSOR_SORT_KEY) if key not in fields)
+
+    def _page_query(self, query: Select, limit: int, skip: int, cursor: Optional[str], include: list[str], fields: tuple[str, ...]) -> Select:
+        """The select for one page: entities with eager loads when relationships are included, plain columns otherwise."""
+        page = self._paginate(query, limit, skip, cursor)
+        columns = self._projection(fields)
+        if include:
+            # Entities, so selectinload can fetch the relationships of the whole page at once
+            return self.with_includes(page, include).options(load_only(*(getattr(Business, column) for column in columns)))
+        return select_columns(page, Business, columns)
+
+    def business_dict(self, business: Business, include: list[str] = (), fields: tuple[str, ...] = BUSINESS_FIELDS) -> dict:
+        """A loaded Business as a list response dict, with its included relationships."""
+        data = rows_to_dicts([tuple(getattr(business, field) for field in fields)], fields)[0]
+        if "sources" in include:
+            data["sources"] = [
+                {"id": link.source_id, "name": link.source.name, "url": link.source.url}
+                for link in business.sources if link.source is not None
+            ]
+        if "contacts" in include:
+            data["contacts"] = [
+                {"id": link.contact_id, "first_name": link.contact.first_name, "last_name": link.contact.last_name,
+                 "email": link.contact.email, "phone": link.contact.phone, "title": link.contact.title}
+                for link in business.contacts if link.contact is not None
+            ]
+        return data
+
+    def _paginate(self, query: Select, limit: int, skip: int, cursor: Optional[str]) -> Select:
+        """Order the query by (sort key, id) and apply either the cursor or the skip offset.
+
+        Fetches one row past the page so _get_result() can tell whether another page follows."""
+        sort_column = getattr(Business, CURSOR_SORT_KEY)
+        query = query.order_by(sort_column, Business.id)
+        if cursor:
+            sort_value, business_id = self._decode_cursor(cursor)
+            query = query.where(tuple_(sort_column, Business.id) > tuple_(literal(sort_value, sort_column.type), literal(business_id, Business.id.type)))
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit + 1)
+
+    def _get_pagination(self, params: dict, errors: list) -> tuple[int, int]:
+        """Pop and validate the limit and skip paging parameters."""
         if 'limit' in params:
             limit = params.pop('limit')
             if not isinstance(limit, int):
@@ -185,7 +388,7 @@ class BusinessService:
                     log.warning(f"Invalid limit value: {limit}. Setting to default (10).")
                     limit = 10
                     errors.append("Limit must be an integer. Used default (10).")
-            elif limit < 1 or limit > 100:
+            if limit < 1 or limit > 100:
                 log.warning(f"Invalid limit value: {limit}. Setting to default (10).")
                 limit = 10
                 errors.append("Limit must be between 1 and 100. Used default (10).")
@@ -201,90 +404,119 @@ class BusinessService:
                     log.warning(f"Invalid skip value: {skip}. Setting to default (0).")
                     skip = 0
                     errors.append("Skip must be an integer. Used default (0).")
-            elif skip < 0:
+            if skip < 0:
                 log.warning(f"Invalid skip value: {skip}. Setting to default (0).")
                 skip = 0
                 errors.append("Skip must be a non-negative integer. Used default (0).")
         else:
             skip = 0
 
-        try:
-            # Build dynamic query
-            query = db.query(Business)
-            if params:    
-                # Apply filters from query parameters
-                invalid_params = []
-                for key, value in params.items():
-                    if hasattr(Business, key):
-                        # Make sure the value is properly decoded and sanitized
-                        value = unquote_plus(value)
-
-                        query = query.filter(getattr(Business, key).ilike(f"%{value}%"))
-                    else:
-                        invalid_params.append(key)
-                
-                if invalid_params:
-                    log.warning(f"Invalid query parameters: {invalid_params}")
-                    errors.append(f"Invalid query parameters: {invalid_params}")
-                    # Return error response if there are invalid parameters
-                    return 400, 'error', errors, original_params, None
-                
-                query = query.offset(skip).limit(limit)
-                businesses = query.all()
-                log.info(f"Found {len(businesses)} businesses matching criteria")
-                
+        return limit, skip
+
+    def build_query(self, params: dict, bind=None) -> tuple[Select, list]:
+        """Build the filtered business query from query parameters.
+
+        Every parameter is a case-insensitive substring filter; pass the
+        session's bind so SQLite can serve them from the search index.
+        Returns the statement and the list of parameters that are not Business columns."""
+        filters = {}
+        invalid_params = []
+        for key, value in params.items():
+            if hasattr(Business, key):
+                # Make sure the value is properly decoded and sanitized
+                filters[key] = unquote_plus(value)
             else:
-                log.debug("No query parameters provided, returning all businesses")
-                businesses = query.offset(skip).limit(limit).all()
+                invalid_params.append(key)
+        query = select(Business).where(*search_filters(Business, filters, bind))
+        return query, invalid_params
 
-            if not businesses:
-                log.warning("No businesses found matching criteria {original_params}")
-                errors.append("No businesses found matching criteria.")
-                return 404, 'error', errors, original_params, None
+    def _get_result(self, businesses: list, params: dict, original_params: dict, errors: list, limit: int, skip: int, cursor: Optional[str] = None, include: list[str] = (), fields: tuple[str, ...] = BUSINESS_FIELDS) -> tuple:
+        """Build the get() response tuple for a page of businesses."""
+        has_more = len(businesses) > limit
+        businesses = businesses[:limit]
+        log.info(f"Found {len(businesses)} businesses matching criteria")
+        if not businesses:
+            log.warning(f"No businesses found matching criteria {original_params}")
+            errors.append("No businesses found matching criteria.")
+            return 404, 'error', errors, original_params, None
 
-            log.debug(f"Business objects: {businesses}")
-            log.info(f"Returning {len(businesses)} businesses")
+        log.info(f"Returning {len(businesses)} businesses")
 
-            business_list = []
-            for business in businesses:
-                business_dict = business.__dict__.copy()
-                business_dict.pop('_sa_instance_state', None)
+        params.update({"limit": limit, "skip": skip})
+        if cursor:
+            params["cursor"] = cursor
+        if include:
+            params["include"] = ",".join(include)
+        if fields is not BUSINESS_FIELDS:
+            params["fields"] = ",".join(fields)
+        # The router lifts this out of params into the response envelope
+        params["next_cursor"] = self._encode_cursor(businesses[-1]) if has_more else None
+        if include:
+            data = [self.business_dict(business, include, fields) for business in businesses]
+        else:
+            data = rows_to_dicts(businesses, fields)
+        return 200, 'success', errors, params, data
 
-                keys_to_process = list(business_dict.keys())
+    def get(self, db: Session, params: dict = None) -> Optional[List[Business]]:
+        errors = []
+        params = params if params is not None else {}
+        original_params = params.copy()
+        limit, skip = self._get_pagination(params, errors)
+        cursor = params.pop('cursor', None)
 
-                processed_dict = {}
-                for key in keys_to_process:
-                    value = business_dict[key]
-                    
-                    if value == '' or value is None:
-                        continue
+        try:
+            include = self.parse_include(params.pop('include', None))
+            fields = self.parse_fields(params.pop('fields', None))
+            # Build dynamic query
+            query, invalid_params = self.build_query(params, db.get_bind())
+            if invalid_params:
+                log.warning(f"Invalid query parameters: {invalid_params}")
+                errors.append(f"Invalid query parameters: {invalid_params}")
+                # Return error response if there are invalid parameters
+                return 400, 'error', errors, original_params, None
 
-                    if isinstance(value, UUID):
-                        processed_dict[key] = str(value)
-                    else:
-                        processed_dict[key] = value
+            # Approximate, from the facet aggregates, so paging never needs a COUNT(*)
+            total_query = FacetService().total_query(params)
+            if total_query is not None:
+                params["total"] = int(db.execute(total_query).scalar())
 
-                try:
-                    business_model = BusinessSchemaRead.model_validate(processed_dict)
-
-                    business_data = business_model.model_dump()
-
-                    for key, value in business_data.items():
-                        if isinstance(value, UUID):
-                            business_data[key] = str(value)
-
-                    business_list.append(business_data)
-                except Exception as e:
-                    log.error(f"Error validating business model: {e}")
-                    
-                    for key, value in processed_dict.items():
-                        if isinstance(value, UUID):
-                            processed_dict[key] = str(value)
-                    business_list.append(processed_dict)
-
-            params.update({"limit": limit, "skip": skip})
-            data = business_list
-            return 200, 'success', errors, params, data
+            result = db.execute(self._page_query(query, limit, skip, cursor, include, fields))
+            businesses = result.scalars().all() if include else result.all()
+            return self._get_result(businesses, params, original_params, errors, limit, skip, cursor, include, fields)
+        except SQLAlchemyError as e:
+            log.error(f"Error reading businesses: {e}")
+            return 500, 'error', [f"Database error: {e}"], original_params, None
+        except ValueError as e:
+            log.error(f"Value error: {e}")
+            return 400, 'error', [f"Value error: {e}"], original_params, None
+        except Exception as e:
+            log.error(f"Unexpected error: {e}")
+            return 500, 'error', [f"Unexpected error: {e}"], original_params, None
+
+    async def get_async(self, db: AsyncSession, params: dict = None) -> Optional[List[Business]]:
+        """Async variant of get() for use with an AsyncSession."""
+        errors = []
+        params = params if params is not None else {}
+        original_params = params.copy()
+        limit, skip = self._get_pagination(params, errors)
+        cursor = params.pop('cursor', None)
+
+        try:
+            include = self.parse_include(params.pop('include', None))
+            fields = self.parse_fields(params.pop('fields', None))
+            query, invalid_params = self.build_query(params, db.get_bind())
+            if invalid_params:
+                log.warning(f"Invalid query parameters: {invalid_params}")
+                errors.append(f"Invalid query parameters: {invalid_params}")
+                return 400, 'error', errors, original_params, None
+
+            total_query = FacetService().total_query(params)
+            if total_query is not None:
+                params["total"] = int((await db.execute(total_query)).scalar())
+
+            result = await db.execute(self._page_query(query, limit, skip, cursor, include, fields))
+            businesses = result.scalars().all() if include else result.all()
+            return self._get_result(businesses, params, original_params, errors, limit, skip, cursor, include, fields)
         except SQLAlchemyError as e:
             log.error(f"Error reading businesses: {e}")
             return 500, 'error', [f"Database error: {e}"], original_params, None
@@ -295,32 +527,452 @@ class BusinessService:
             log.error(f"Unexpected error: {e}")
             return 500, 'error', [f"Unexpected error: {e}"], original_params, None
     
+    def lookup(self, db: Session, key: str, value: str, params: dict = None) -> tuple:
+        """Businesses whose `key` lookup column (see LOOKUP_KEYS) equals `value` normalized the same way.
+
+        An indexed exact match, so "(404) 555-1234" finds a business stored as
+        "4045551234". Takes the paging, fields and include parameters of get()."""
+        errors = []
+        params = params if params is not None else {}
+        original_params = {LOOKUP_KEYS[key]: value, **params}
+        normalized = getattr(format, key)(value)
+        if normalized is None:
+            log.warning(f"Invalid {LOOKUP_KEYS[key]} lookup: {value}")
+            return 400, 'error', [f"'{value}' is not a valid {LOOKUP_KEYS[key]}."], original_params, None
+        limit, skip = self._get_pagination(params, errors)
+        cursor = params.pop('cursor', None)
+
+        try:
+            include = self.parse_include(params.pop('include', None))
+            fields = self.parse_fields(params.pop('fields', None))
+            if params:
+                log.warning(f"Invalid query parameters: {list(params)}")
+                return 400, 'error', [f"Invalid query parameters: {list(params)}"], original_params, None
+
+            query = select(Business).where(getattr(Business, key) == normalized)
+            result = db.execute(self._page_query(query, limit, skip, cursor, include, fields))
+            businesses = result.scalars().all() if include else result.all()
+            params[key] = normalized
+            return self._get_result(businesses, params, original_params, errors, limit, skip, cursor, include, fields)
+        except SQLAlchemyError as e:
+            log.error(f"Error looking up businesses by {key}: {e}")
+            return 500, 'error', [f"Database error: {e}"], original_params, None
+        except ValueError as e:
+            log.error(f"Value error: {e}")
+            return 400, 'error', [f"Value error: {e}"], original_params, None
+
+    def _near_center(self, db: Session, params: dict) -> tuple[float, float]:
+        """Pop the search center from the zip= or lat= and lon= parameters."""
+        zip_code, latitude, longitude = params.pop('zip', None), params.pop('lat', None), params.pop('lon', None)
+        if zip_code is not None:
+            if latitude is not None or longitude is not None:
+                raise ValueError("Pass zip or lat and lon, not both")
+            centroid = zip_centroids(db, [zip_code]).get(zip5(zip_code))
+            if centroid is None:
+                raise ValueError(f"No coordinates for ZIP code '{zip_code}'")
+            return centroid
+        if latitude is None or longitude is None:
+            raise ValueError("Pass zip, or lat and lon")
+        latitude, longitude = float(latitude), float(longitude)
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError(f"lat and lon out of range: {latitude}, {longitude}")
+        return latitude, longitude
+
+    def near(self, db: Session, params: dict = None) -> tuple:
+        """Businesses within `radius` miles of a ZIP centroid or a lat/lon, nearest first.
+
+        The geo_cell index picks the candidates, the bounding box trims them in
+        SQL and one vectorized haversine keeps those inside the circle. Other
+        parameters filter as in get() (e.g. industry=roofing); fields, limit
+        and skip apply to the sorted result. Each business gets its distance."""
+        errors = []
+        params = params if params is not None else {}
+        original_params = params.copy()
+        limit, skip = self._get_pagination(params, errors)
+
+        try:
+            fields = self.parse_fields(params.pop('fields', None))
+            radius = float(params.pop('radius', NEAR_RADIUS_MILES))
+            if not 0 < radius <= MAX_NEAR_RADIUS_MILES:
+                raise ValueError(f"radius must be more than 0 and at most {MAX_NEAR_RADIUS_MILES} miles")
+            latitude, longitude = self._near_center(db, params)
+            query, invalid_params = self.build_query(params, db.get_bind())
+            if invalid_params:
+                log.warning(f"Invalid query parameters: {invalid_params}")
+                errors.append(f"Invalid query parameters: {invalid_params}")
+                return 400, 'error', errors, original_params, None
+
+            min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+            query = query.where(
+                Business.geo_cell.in_(cells_within(latitude, longitude, radius)),
+                Business.latitude.between(min_lat, max_lat),
+                Business.longitude.between(min_lon, max_lon),
+            ).order_by(Business.name, Business.id)
+            # Businesses in one ZIP share a distance; the name order breaks those ties
+            rows = db.execute(select_columns(query, Business, fields + ('latitude', 'longitude'))).all()
+        except SQLAlchemyError as e:
+            log.error(f"Error finding businesses near ({params}): {e}")
+            return 500, 'error', [f"Database error: {e}"], original_params, None
+        except ValueError as e:
+            log.error(f"Value error: {e}")
+            return 400, 'error', [f"Value error: {e}"], original_params, None
+
+        distances = haversine_miles(
+            latitude, longitude,
+            np.fromiter((row[-2] for row in rows), dtype=float, count=len(rows)),
+            np.fromiter((row[-1] for row in rows), dtype=float, count=len(rows)),
+        )
+        inside = np.flatnonzero(distances <= radius)
+        nearest = inside[np.argsort(distances[inside], kind='stable')]
+        page = nearest[skip:skip + limit]
+        log.info(f"Found {len(nearest)} businesses within {radius} miles of ({latitude}, {longitude}) from {len(rows)} candidates")
+        if not len(page):
+            errors.append("No businesses found matching criteria.")
+            return 404, 'error', errors, original_params, None
+
+        data = rows_to_dicts((rows[i][:-2] for i in page), fields)
+        for business, i in zip(data, page):
+            business["distance"] = round(float(distances[i]), 2)
+        params.update({"lat": latitude, "lon": longitude, "radius": radius, "limit": limit, "skip": skip, "total": len(nearest)})
+        return 200, 'success', errors, params, data
+
+    @single_writer
     def remove(self, db: Session, business: Business) -> tuple[str, int, list, dict, dict]:
-        """Remove a business from the database."""
-        log.info(f"Removing business: {business.name} (ID: {business.id})")
+        """Remove a business and its source and contact links from the database.
+
+        Goes through the same batch delete as remove_many(), so the facet
+        counts and the change feed tombstone are updated with it."""
+        # Read before the delete; the instance is gone once it commits
+        business_id, name = business.id, business.name
+        log.info(f"Removing business: {name} (ID: {business_id})")
         errors = []
-        code = 200
-        params = {
-            "business": business.model_dump()
-        }
-        data = {
-            "business": None
-        }
+        params = {"id": str(business_id), "name": name}
+        data = {"businesses": 0, "source_links": 0, "contact_links": 0}
 
         try:
-            db.delete(business)
-            db.commit()
-            log.info(f"Removed business: {business.name} (ID: {business.id})")
-            return 'success', code, errors, params, data
+            counts = self._delete_batch(db, [Business.id == business_id], 1)
+            data.update(counts)
+            log.info(f"Removed business: {name} (ID: {business_id})")
+            return 'success', 200, errors, params, data
         except SQLAlchemyError as e:
+            db.rollback()
             log.error(f"Error removing business: {e}")
-            errors.append(f"Error removing business: {e}")
-            return 'error', 500, [str(e)], params, data
-        except Exception as e:
-            log.error(f"Unexpected error: {e}")
-            errors.append(f"Unexpected error: {e}")
+            return 'error', 500, [f"Error removing business: {e}"], params, data
+
+    def _delete_filters(self, db: Session, criteria: BusinessDeleteSchema, errors: list) -> list:
+        """WHERE clauses for the businesses a bulk delete matches; criteria combine with AND."""
+        where = []
+        if criteria.ids:
+            where.append(Business.id.in_(criteria.ids))
+        if criteria.source is not None:
+            # Exact name only: a partial match deleting another source's businesses is not undoable
+            source = source_registry.lookup(db, criteria.source)
+            if source is None:
+                errors.append(f"Unknown source '{criteria.source}'.")
+            else:
+                where.append(Business.id.in_(select(BusinessSource.business_id).where(BusinessSource.source_id == source[0])))
+        unknown = [key for key in criteria.filters if key not in BUSINESS_FIELDS or key in ('id', 'notes')]
+        if unknown:
+            errors.append(f"Invalid filters: {unknown}")
+        where += [getattr(Business, key) == value for key, value in criteria.filters.items() if key not in unknown]
+        if criteria.created_after is not None:
+            where.append(Business.created >= criteria.created_after)
+        if criteria.created_before is not None:
+            where.append(Business.created < criteria.created_before)
+        if not where and not errors:
+            errors.append("Pass ids, source, filters or a created range; deleting every business is not supported.")
+        return where
+
+    @single_writer
+    def _delete_batch(self, db: Session, where: list, batch_size: int) -> Counter:
+        """Delete up to `batch_size` matching businesses and their join rows in one transaction."""
+        rows = db.execute(select(Business.id, Business.name).where(*where).order_by(Business.id).limit(batch_size)).all()
+        if not rows:
+            return Counter()
+        ids = [row.id for row in rows]
+        businesses = {}
+        for row in self._facet_rows(db, Business.id.in_(ids)):
+            business, source_ids = businesses.setdefault(row.id, (row, []))
+            if row.source_id is not None:
+                source_ids.append(row.source_id)
+        deltas = Counter()
+        for business, source_ids in businesses.values():
+            business_deltas(business, source_ids, -1, deltas)
+        record_deletes(db, rows)
+
+        counts = Counter()
+        counts["source_links"] = db.execute(delete(BusinessSource).where(BusinessSource.business_id.in_(ids)), execution_options={"synchronize_session": False}).rowcount
+        counts["contact_links"] = db.execute(delete(BusinessContact).where(BusinessContact.business_id.in_(ids)), execution_options={"synchronize_session": False}).rowcount
+        counts["businesses"] = db.execute(delete(Business).where(Business.id.in_(ids)), execution_options={"synchronize_session": False}).rowcount
+        apply_deltas(db, deltas)
+        db.commit()
+        return counts
+
+    def remove_many(self, db: Session, criteria: BusinessDeleteSchema, batch_size: int = DELETE_BATCH_SIZE) -> tuple[str, int, list, dict, dict]:
+        """Delete every business matching `criteria`, with their source and contact links.
+
+        Set-based DELETEs, `batch_size` businesses per transaction, each batch
+        queued as its own write so other writers are not held up for the
+        whole purge. With criteria.dry_run the matches are only counted."""
+        errors = []
+        params = criteria.model_dump(mode="json")
+        data = {"dry_run": criteria.dry_run, "businesses": 0, "source_links": 0, "contact_links": 0}
+
+        try:
+            where = self._delete_filters(db, criteria, errors)
+            if errors:
+                log.warning(f"Invalid bulk delete: {errors}")
+                return 'error', 400, errors, params, data
+
+            if criteria.dry_run:
+                matched = select(Business.id).where(*where)
+                data["businesses"] = db.execute(select(func.count()).select_from(matched.subquery())).scalar()
+                data["source_links"] = db.execute(select(func.count()).select_from(BusinessSource).where(BusinessSource.business_id.in_(matched))).scalar()
+                data["contact_links"] = db.execute(select(func.count()).select_from(BusinessContact).where(BusinessContact.business_id.in_(matched))).scalar()
+                log.info(f"Bulk delete dry run: {data}")
+                return 'success', 200, errors, params, data
+
+            data["batches"] = 0
+            while True:
+                counts = self._delete_batch(db, where, batch_size)
+                if not counts["businesses"]:
+                    break
+                data["batches"] += 1
+                for key in ("businesses", "source_links", "contact_links"):
+                    data[key] += counts[key]
+                if counts["businesses"] < batch_size:
+                    break
+            log.info(f"Bulk deleted {data['businesses']} businesses in {data['batches']} batches")
+            return 'success', 200, errors, params, data
+        except SQLAlchemyError as e:
+            # Batches already committed stay deleted; the counts say how far it got
+            db.rollback()
+            log.error(f"Error bulk deleting businesses after {data['businesses']}: {e}")
+            return 'error', 500, [f"Database error: {e}"], params, data
+
+    @single_writer
+    def link_sources(self, db: Session, business_ids: List[UUID], source_id: UUID) -> tuple[str, int, list, dict, dict]:
+        """Associate many businesses with a source in one statement, skipping links that already exist."""
+        errors = []
+        business_ids = list(dict.fromkeys(UUID(str(business_id)) for business_id in business_ids))
+        source_id = UUID(str(source_id))
+        params = {"business_ids": [str(business_id) for business_id in business_ids], "source_id": str(source_id)}
+        data = {"linked": 0, "skipped": len(business_ids)}
+
+        if not business_ids:
+            return 'success', 200, errors, params, data
+
+        try:
+            stmt = dialect_insert(db, BusinessSource).values(
+                [{"business_id": business_id, "source_id": source_id} for business_id in business_ids]
+            ).on_conflict_do_nothing(index_elements=["business_id", "source_id"]).returning(BusinessSource.business_id)
+            linked = db.execute(stmt).scalars().all()
+            if linked:
+                # Only the per-source counts change; the businesses were counted already
+                deltas = Counter()
+                for business in self._facet_rows(db, Business.id.in_(linked), BusinessSource.source_id == source_id):
+                    business_deltas(business, [source_id], 1, deltas, total=False)
+                apply_deltas(db, deltas)
+            db.commit()
+            data["linked"] = len(linked)
+            data["skipped"] = len(business_ids) - len(linked)
+            log.info(f"Linked {data['linked']} businesses to source {source_id} ({data['skipped']} already linked)")
+            return 'success', 200, errors, params, data
+        except SQLAlchemyError as e:
+            db.rollback()
+            log.error(f"Error linking businesses to source: {e}")
             return 'error', 500, [str(e)], params, data
-    
+
+    def _copy_businesses(self, db: Session, rows: List[dict]) -> list:
+        """COPY rows into a staging table and move them into businesses, skipping existing names.
+
+        Returns (id, name) for each row inserted."""
+        columns = ", ".join(rows[0])
+        conn = db.connection()
+        # Per connection, emptied at every commit, so it is created once per pooled connection
+        conn.exec_driver_sql(f"CREATE TEMP TABLE IF NOT EXISTS {BULK_STAGING_TABLE} (LIKE businesses INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row.values()))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {BULK_STAGING_TABLE} ({columns}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+        return conn.exec_driver_sql(
+            f"INSERT INTO businesses ({columns}) SELECT {columns} FROM {BULK_STAGING_TABLE} ON CONFLICT DO NOTHING RETURNING id, name"
+        ).all()
+
+    @single_writer
+    def add_many(self, db: Session, rows: List[dict], source_ids: List[UUID]) -> tuple[dict, dict]:
+        """
+        Insert normalized businesses and their source links in one transaction.
+
+        `rows` are _normalize() outputs with unique names; `source_ids` holds
+        the source of each row. Uses COPY on Postgres (psycopg2) and a
+        multi-row INSERT elsewhere; names that already exist are skipped, not
+        errors. Returns {name: id} for the rows created and for the ones that
+        already existed. Coordinates are set from the ZIP centroids on the way in.
+        """
+        now = datetime.now()
+        try:
+            rows = [{"id": generate_uuid(), **row, "created": now, "updated": now} for row in locate(db, rows)]
+            if db.get_bind().dialect.driver == 'psycopg2':
+                inserted = self._copy_businesses(db, rows)
+            else:
+                stmt = dialect_insert(db, Business).on_conflict_do_nothing(index_elements=['name'])
+                inserted = db.execute(stmt.returning(Business.id, Business.name), rows).all()
+            created = {name: business_id for business_id, name in inserted}
+
+            links = [
+                {"business_id": created[row['name']], "source_id": source_id}
+                for row, source_id in zip(rows, source_ids) if row['name'] in created
+            ]
+            if links:
+                db.execute(dialect_insert(db, BusinessSource).on_conflict_do_nothing(index_elements=['business_id', 'source_id']), links)
+            deltas = Counter()
+            for row, source_id in zip(rows, source_ids):
+                if row['name'] in created:
+                    business_deltas(row, [source_id], 1, deltas)
+            apply_deltas(db, deltas)
+
+            existing = {}
+            skipped = [row['name'] for row in rows if row['name'] not in created]
+            if skipped:
+                existing = dict(db.execute(select(Business.name, Business.id).where(Business.name.in_(skipped))).all())
+            db.commit()
+            log.info(f"Bulk inserted {len(created)} businesses ({len(skipped)} already existed)")
+            return created, existing
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+
+    def stream(self, db: Session, query: Select, batch_size: int = STREAM_BATCH_SIZE, fields: tuple[str, ...] = BUSINESS_FIELDS) -> Iterator[bytes]:
+        """Yield the rows of a build_query() statement as NDJSON, one chunk per fetched batch.
+
+        Rows are read through a server-side cursor (yield_per), so memory stays
+        flat however large the result, and the next batch is only fetched once
+        the previous one has been sent. Only the `fields` columns are selected.
+        Takes ownership of `db` and closes it when the stream ends or the
+        client goes away."""
+        page = select_columns(query.order_by(Business.name, Business.id), Business, fields)
+        sent = 0
+        try:
+            conn = db.connection()
+            result = conn.execution_options(yield_per=batch_size).execute(page)
+            for rows in result.partitions():
+                yield b"".join(dumps(row) + b"\n" for row in rows_to_dicts(rows, fields))
+                sent += len(rows)
+                renew_deadline(conn)
+            log.info(f"Streamed {sent} businesses")
+        except SQLAlchemyError as e:
+            # Headers are long gone; aborting the response is the only way to tell the client
+            log.error(f"Error streaming businesses after {sent} rows: {e}")
+            raise
+        finally:
+            db.close()
+
     def export_to_csv(data: List[Business], filename: str = None) -> str:
         export = Exporter()
-        return export.to_csv(data)
\ No newline at end of file
+        return export.to_csv(data)
+
+class BusinessIngest:
+    """
+    One POST /businesses/bulk upload, fed to add_batch() a batch at a time.
+
+    Each record is validated against BusinessSchemaCreate and normalized like
+    add() does, then the batch is written by BusinessService.add_many() in its
+    own transaction. Every record gets an outcome, in input order: created,
+    duplicate (the name exists already or came earlier in the upload),
+    invalid, or failed (its batch hit a database error).
+    """
+
+    def __init__(self, db: Session, service: BusinessService = None):
+        self.db = db
+        self.service = service or BusinessService()
+        self.results = []
+        self.counts = {"created": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+        self.errors = []
+        # Source name -> id, or None when no source matches
+        self._source_ids = {}
+        # Names already handled in this upload -> business id
+        self._seen = {}
+
+    def _source_id(self, name: str) -> Optional[UUID]:
+        if name not in self._source_ids:
+            source = source_registry.lookup(self.db, name, partial=True)
+            self._source_ids[name] = source[0] if source else None
+        return self._source_ids[name]
+
+    def _outcome(self, index: int, status: str, **fields) -> dict:
+        self.counts[status] += 1
+        outcome = {"index": index, "status": status, **fields}
+        self.results.append(outcome)
+        return outcome
+
+    def add_batch(self, records: list):
+        """Validate, normalize and insert a batch of raw records."""
+        rows, source_ids, pending, repeats = [], [], [], []
+        for record in records:
+            index = len(self.results)
+            if isinstance(record, Exception):
+                self._outcome(index, "invalid", errors=[str(record)])
+                continue
+            try:
+                data = BusinessSchemaCreate.model_validate(record).model_dump()
+            except ValidationError as e:
+                errors = [f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}" for error in e.errors()]
+                self._outcome(index, "invalid", errors=errors)
+                continue
+
+            values = self.service._normalize(data)
+            name = values['name']
+            if not name:
+                self._outcome(index, "invalid", errors=["name: Name is empty after formatting."])
+                continue
+            if name in self._seen:
+                repeats.append(self._outcome(index, "duplicate", name=name, id=None))
+                continue
+            source_id = self._source_id(data['source'])
+            if source_id is None:
+                self._outcome(index, "invalid", name=name, errors=[f"source: Unknown source '{data['source']}'."])
+                continue
+
+            self._seen[name] = None
+            rows.append(values)
+            source_ids.append(source_id)
+            pending.append(self._outcome(index, "created", name=name, id=None))
+
+        if rows:
+            try:
+                created, existing = self.service.add_many(self.db, rows, source_ids)
+            except SQLAlchemyError as e:
+                log.error(f"Error bulk inserting businesses: {e}")
+                self.errors.append(f"Database error: {e}")
+                for outcome in pending:
+                    # Nothing was written, so a later record with the same name may retry
+                    self._seen.pop(outcome["name"], None)
+                    self.counts["created"] -= 1
+                    self.counts["failed"] += 1
+                    outcome.update(status="failed", errors=[f"Database error: {e}"])
+            else:
+                for outcome in pending:
+                    name = outcome["name"]
+                    if name not in created:
+                        # Inserted by someone else since the upload started
+                        self.counts["created"] -= 1
+                        self.counts["duplicate"] += 1
+                        outcome["status"] = "duplicate"
+                    business_id = created.get(name) or existing.get(name)
+                    self._seen[name] = outcome["id"] = str(business_id) if business_id else None
+        for outcome in repeats:
+            outcome["id"] = self._seen.get(outcome["name"])
+
+    def result(self, params: dict = None) -> tuple[str, int, list, dict, dict]:
+        """The upload's response tuple: counts plus one outcome per record."""
+        status = 'error' if self.counts["failed"] or self.errors else 'success'
+        code = 200 if status == 'success' else 500
+        log.info(f"Bulk ingest finished: {self.counts}")
+        return status, code, self.errors, params or {}, {**self.counts, "results": self.results}
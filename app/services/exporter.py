@@ -2,7 +2,7 @@ import csv
 import os
 import re
 from datetime import datetime
-from typing import List
+from typing import List, Mapping, Sequence
 from app.core.config import config
 from app.services.logger import Logger
 
@@ -13,13 +13,19 @@ from app.services.formatter import Formatter
 
 log = Logger('service-exporter')
 
+# Columns written when an export does not name its fields
+EXPORT_FIELDS = ('name', 'address', 'address2', 'city', 'state', 'zip', 'phone', 'email', 'website', 'industry')
+
 
 class Exporter:
     def __init__ (self):
         pass
 
-    def to_csv(self, data: List[Business], fieldnames: List[str], filename: str = None) -> str:
-        """Exports data to a CSV file."""
+    def to_csv(self, data: List[Business | Mapping], fieldnames: Sequence[str] = EXPORT_FIELDS, filename: str = None) -> str:
+        """Exports data to a CSV file.
+
+        `data` holds Business objects or row mappings (e.g. from a column
+        select); only the `fieldnames` columns are written."""
         log.info(f"Exporting data to CSV: {filename}")
         if filename:
             # Verify the filename passed by the user is safe
@@ -58,43 +64,33 @@ class Exporter:
                     mode='w',
                     newline='') as file:
                 
-                # Convert model instances to dictionaries and clean them
+                # Convert model instances or row mappings to dictionaries and clean them
                 rows = []
                 for item in data:
-                    # Filter out SQLAlchemy internal attributes
-                    row_dict = {k: v for k, v in item.__dict__.items() 
-                               if not k.startswith('_sa_')
-                               and not k.startswith('id')
-                               and k != 'notes'}  
-                    
-                    # Format individual fields if needed
-                    if 'name' in row_dict:
-                        log.debug(f"Formatting name: {str(row_dict['name'])}")
-                        row_dict['name'] = formatter.name(str(row_dict['name']))
-                    if 'phone' in row_dict:
-                        log.debug(f"Formatting phone: {row_dict['phone']}")
-                        row_dict['phone'] = formatter.phone(str(row_dict['phone']))
-                    if 'address' in row_dict:
-                        log.debug(f"Formatting address: {row_dict['address']}")
-                        row_dict['address'] = formatter.name(str(row_dict['address']))
-                    if 'address2' in row_dict:
-                        log.debug(f"Formatting address2: {row_dict['address2']}")
-                        row_dict['address2'] = formatter.name(str(row_dict['address2']))
-                    if 'city' in row_dict:
-                        log.debug(f"Formatting city: {row_dict['city']}")
-                        row_dict['city'] = formatter.name(str(row_dict['city']))
-                    if 'zip' in row_dict:
-                        log.debug(f"Formatting zip: {row_dict['zip']}")
-                        row_dict['zip'] = formatter.zip(str(row_dict['zip']))
-                    if 'website' in row_dict:
-                        log.debug(f"Formatting website: {row_dict['website']}")
-                        row_dict['website'] = formatter.website(str(row_dict['website']))
-                    if 'industry' in row_dict:
-                        log.debug(f"Formatting industry: {row_dict['industry']}")
-                        row_dict['industry'] = formatter.name(str(row_dict['industry']))
-                    
+                    if isinstance(item, Mapping):
+                        row_dict = {k: v for k, v in item.items() if k in fieldnames}
+                    else:
+                        # Filter out SQLAlchemy internal attributes and columns not exported
+                        row_dict = {k: v for k, v in item.__dict__.items()
+                                   if not k.startswith('_sa_')
+                                   and k in fieldnames}
+
+                    # Format individual fields if needed; empty values stay empty
+                    for field, format_value in (
+                        ('name', formatter.name),
+                        ('phone', formatter.phone),
+                        ('address', formatter.name),
+                        ('address2', formatter.name),
+                        ('city', formatter.name),
+                        ('zip', formatter.zip),
+                        ('website', formatter.website),
+                        ('industry', formatter.name),
+                    ):
+                        if row_dict.get(field):
+                            row_dict[field] = format_value(str(row_dict[field]))
+
                     rows.append(row_dict)
-                
+
                 writer = csv.DictWriter(file, fieldnames=fieldnames)
                 writer.writeheader()
                 for row in rows:
@@ -0,0 +1,161 @@
+"""
+Facet counts for GET /businesses/facets and totals for the business list.
+
+Counts come from the business_facet_counts aggregates (see app.core.facets)
+whenever the filters are facets themselves; filters on other columns fall
+back to a GROUP BY over businesses.
+"""
+from typing import Optional
+from urllib.parse import unquote_plus
+from uuid import UUID
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.facets import ALL_SOURCES, FACETS, FLAG_COLUMNS, flag
+from app.core.search import search_filters
+from app.models.contact import Business
+from app.models.facets import BusinessFacetCount
+from app.models.joins import BusinessSource
+from app.services.logger import Logger
+from app.services.source import source_registry
+
+log = Logger('service-facets', log_level='INFO')
+
+# Business list filters the aggregates can total without touching businesses
+TOTAL_FILTERS = ("state", "industry")
+
+_TRUE = ("true", "1", "yes")
+_FALSE = ("false", "0", "no")
+
+class FacetService:
+    def __init__(self):
+        pass
+
+    def _parse_by(self, by: Optional[str], errors: list) -> list:
+        facets = [facet.strip() for facet in (by or "").split(",") if facet.strip()]
+        if not facets:
+            errors.append(f"by is required: a comma separated list of {', '.join(FACETS)}.")
+        unknown = [facet for facet in facets if facet not in FACETS]
+        if unknown:
+            errors.append(f"Unknown facets: {unknown}. Choose from {', '.join(FACETS)}.")
+        return list(dict.fromkeys(facets))
+
+    def _parse_filters(self, db: Session, params: dict, errors: list) -> tuple[dict, dict, Optional[UUID]]:
+        """Split the filters into column substring filters, has_* flags and a source id."""
+        columns, flags, source_id = {}, {}, None
+        for key, value in params.items():
+            value = unquote_plus(value)
+            if key in FLAG_COLUMNS:
+                if value.lower() not in _TRUE + _FALSE:
+                    errors.append(f"{key} must be true or false, not '{value}'.")
+                flags[key] = value.lower() in _TRUE
+            elif key == "source":
+                source = source_registry.lookup(db, value, partial=True)
+                if source is None:
+                    errors.append(f"Unknown source '{value}'.")
+                else:
+                    source_id = source[0]
+            elif hasattr(Business, key):
+                columns[key] = value
+            else:
+                errors.append(f"Invalid query parameters: ['{key}']")
+        return columns, flags, source_id
+
+    def _from_aggregates(self, by: list, columns: dict, flags: dict, source_id: Optional[UUID]) -> tuple[Select, Select]:
+        """Facet and total queries over business_facet_counts."""
+        counts = BusinessFacetCount
+        where = [getattr(counts, key).ilike(f"%{value}%") for key, value in columns.items()]
+        where += [getattr(counts, key) == value for key, value in flags.items()]
+        if source_id is not None:
+            facet_where = total_where = [*where, counts.source_id == str(source_id)]
+        else:
+            # Per-source rows count a business once per source, the others once in all
+            facet_where = [*where, counts.source_id != ALL_SOURCES if "source" in by else counts.source_id == ALL_SOURCES]
+            total_where = [*where, counts.source_id == ALL_SOURCES]
+
+        dimensions = [counts.source_id if facet == "source" else getattr(counts, facet) for facet in by]
+        count = func.sum(counts.count)
+        facets = select(*dimensions, count).where(*facet_where).group_by(*dimensions).having(count > 0).order_by(count.desc(), *dimensions)
+        return facets, select(func.coalesce(count, 0)).where(*total_where)
+
+    def _from_businesses(self, db: Session, by: list, columns: dict, flags: dict, source_id: Optional[UUID]) -> tuple[Select, Select]:
+        """Facet and total queries grouping businesses directly."""
+        expressions = {
+            "state": func.coalesce(Business.state, ""),
+            "industry": func.coalesce(Business.industry, ""),
+            "source": BusinessSource.source_id,
+            **{facet: flag(getattr(Business, column)) for facet, column in FLAG_COLUMNS.items()},
+        }
+        where = search_filters(Business, columns, db.get_bind())
+        where += [expressions[key] == value for key, value in flags.items()]
+        joined = "source" in by or source_id is not None
+        if source_id is not None:
+            where.append(BusinessSource.source_id == source_id)
+
+        dimensions = [expressions[facet] for facet in by]
+        count = func.count()
+        facets = select(*dimensions, count).select_from(Business)
+        total = select(func.count(func.distinct(Business.id))).select_from(Business)
+        if joined:
+            facets = facets.join(BusinessSource, BusinessSource.business_id == Business.id)
+            total = total.join(BusinessSource, BusinessSource.business_id == Business.id)
+        facets = facets.where(*where).group_by(*dimensions).order_by(count.desc(), *dimensions)
+        return facets, total.where(*where)
+
+    def _facet_value(self, db: Session, facet: str, value):
+        if facet == "source":
+            return source_registry.name_of(db, value) if value else None
+        if facet in FLAG_COLUMNS:
+            return bool(value)
+        return value or None
+
+    def get(self, db: Session, by: Optional[str], params: dict = None) -> tuple[str, int, list, dict, dict]:
+        """Count businesses per combination of the `by` facets, narrowed by `params` filters.
+
+        Filters on facets (state, industry, source, has_*) are answered from
+        the aggregates; filters on any other business column group the
+        businesses table instead."""
+        errors = []
+        params = params if params is not None else {}
+        original_params = {"by": by, **params}
+
+        facets = self._parse_by(by, errors)
+        columns, flags, source_id = self._parse_filters(db, params, errors)
+        if errors:
+            log.warning(f"Invalid facet request: {errors}")
+            return 'error', 400, errors, original_params, None
+
+        try:
+            from_aggregates = set(columns) <= set(TOTAL_FILTERS)
+            if from_aggregates:
+                facet_query, total_query = self._from_aggregates(facets, columns, flags, source_id)
+            else:
+                facet_query, total_query = self._from_businesses(db, facets, columns, flags, source_id)
+            rows = db.execute(facet_query).all()
+            total = int(db.execute(total_query).scalar() or 0)
+        except SQLAlchemyError as e:
+            log.error(f"Error counting business facets: {e}")
+            return 'error', 500, [f"Database error: {e}"], original_params, None
+
+        data = {
+            "by": facets,
+            "total": total,
+            "counted_from": "aggregates" if from_aggregates else "businesses",
+            "facets": [
+                {**{facet: self._facet_value(db, facet, value) for facet, value in zip(facets, row[:-1])}, "count": int(row[-1])}
+                for row in rows
+            ],
+        }
+        log.info(f"Counted {len(rows)} facets by {facets} from {data['counted_from']}")
+        return 'success', 200, errors, original_params, data
+
+    def total_query(self, filters: dict) -> Optional[Select]:
+        """A count of the businesses the list endpoint would return for `filters`, from the aggregates.
+
+        None when a filter is on a column the aggregates do not carry."""
+        if not set(filters) <= set(TOTAL_FILTERS):
+            return None
+        counts = BusinessFacetCount
+        where = [getattr(counts, key).ilike(f"%{unquote_plus(value)}%") for key, value in filters.items()]
+        return select(func.coalesce(func.sum(counts.count), 0)).where(counts.source_id == ALL_SOURCES, *where)
@@ -1,8 +1,18 @@
 import re
+from urllib.parse import urlsplit
 from app.services.logger import Logger
-from typing import Tuple
+from typing import Optional, Tuple
 
-log = Logger('service-formatter')
+# Debug logging every formatted value dominated bulk ingest time
+log = Logger('service-formatter', log_level='INFO')
+
+# Public suffixes with two labels, so "abc.co.uk" (not "co.uk") is the registrable domain
+MULTI_LABEL_SUFFIXES = {
+    "co.uk", "org.uk", "me.uk", "ac.uk", "gov.uk", "com.au", "net.au", "org.au",
+    "co.nz", "com.mx", "com.br", "co.jp", "co.in", "co.za", "com.cn",
+}
+# Words dropped from name keys because they do not tell two companies apart
+NAME_KEY_STOPWORDS = {"llc", "inc", "co", "corp", "corporation", "company", "ltd", "the", "and", "of"}
 
 class Formatter:
     def __init__(self):
@@ -151,4 +161,47 @@ class Formatter:
             address1 = address1 if address1 else "General Delivery"
             address2 = ''
         log.debug(f"Extracted address parts: {address1}, {address2}, {city}, {state}, {zip_code}")
-        return (address1, address2, city, state, zip_code)
\ No newline at end of file
+        return (address1, address2, city, state, zip_code)
+
+    # Lookup keys: exact-match forms of a value for the indexed *_key columns.
+    # No debug logging, these run for every record of a bulk ingest.
+
+    def phone_key(self, number: Optional[str]) -> Optional[str]:
+        """The 10 digits of a US phone number however it is written, or None."""
+        digits = re.sub(r'\D', '', number or '')
+        if len(digits) == 11 and digits[0] == '1':
+            digits = digits[1:]
+        if len(digits) != 10 or len(set(digits)) == 1:
+            return None
+        return digits
+
+    def domain_key(self, website: Optional[str]) -> Optional[str]:
+        """The registrable domain of a website or email domain (https://www.shop.abc.com/x -> abc.com), or None."""
+        website = (website or '').strip().lower()
+        if not website:
+            return None
+        host = urlsplit(website if '//' in website else f'//{website}').hostname or ''
+        labels = [label for label in host.split('.') if label]
+        if len(labels) < 2:
+            return None
+        keep = 3 if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES and len(labels) > 2 else 2
+        return '.'.join(labels[-keep:])
+
+    def zip_key(self, zip_code: Optional[str]) -> Optional[str]:
+        """The 5-digit ZIP of a ZIP or ZIP+4 value, or None."""
+        digits = re.sub(r'\D', '', zip_code or '')
+        return digits[:5] if len(digits) in (5, 9) else None
+
+    def email_key(self, email: Optional[str]) -> Optional[str]:
+        """An email address trimmed and lower-cased, or None."""
+        email = (email or '').strip().lower()
+        return email if '@' in email else None
+
+    def name_key(self, name: Optional[str]) -> Optional[str]:
+        """A company name reduced for matching: lower-cased, initials joined (A.B.C. -> abc),
+        punctuation and words like LLC or "the" dropped. "ABC Roofing, LLC" -> "abc roofing"."""
+        name = (name or '').casefold().replace('&', ' and ')
+        name = re.sub(r'\b(\w)\.(?=\w\.)', r'\1', name)
+        name = re.sub(r'[^\w\s]', ' ', name)
+        words = [word for word in name.split() if word not in NAME_KEY_STOPWORDS]
+        return ' '.join(words) or None
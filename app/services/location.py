@@ -1,27 +1,61 @@
 from typing import Optional
 from app.services.logger import Logger
 from app.core.database import get_db
+from app.core.writer import single_writer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import Depends
-from sqlalchemy import func
+from sqlalchemy import Select, func, select
 
 from app.models.location import ZipCode
 
 log = Logger('service-location', log_level='DEBUG')
 
 class LocationService:
-    def __init__(self, db: Session = Depends(get_db)):
+    def __init__(self, db: Session | AsyncSession = Depends(get_db)):
         self.db = db
         self.location = None
         pass
+
+    def _zip_query(self, zip_code: str | int) -> Select:
+        """
+        Build the query for a location by its zip code.
+        """
+        return select(ZipCode).where(ZipCode.zip == str(zip_code)).limit(1)
+
+    def _city_query(self, city: str, state: str) -> Select:
+        """
+        Build the query for a location by its city and state.
+        """
+        return select(ZipCode).where(func.lower(ZipCode.city) == city.lower(), func.lower(ZipCode.state) == state.lower()).limit(1)
+
+    def _parse_location(self, location: str | int) -> Select:
+        """
+        Build the query for a zip code or 'city,state' identifier.
+        """
+        if (isinstance(location, str) and location.isdigit()) or (isinstance(location, int) and len(str(location)) == 5):
+            # Assuming it's a zip code
+            return self._zip_query(location)
+        elif isinstance(location, str) and ',' in location:
+            # Assuming it's a city and state combination (e.g., "Nashville,TN")
+            city, state = location.split(',', 1)
+            city = city.strip(",").strip()
+            state = state.strip()
+
+            if not city or not state:
+                log.error(f"Invalid location format: {location}")
+                raise ValueError("Invalid location format. Expected 'city,state'.")
+
+            return self._city_query(city, state)
+        log.error(f"Invalid location format: {location}")
+        raise ValueError("Invalid location format. Expected zip code or 'city,state'.")
     
     def _get_location_by_zip(self, zip_code: str | int) -> Optional[ZipCode]:
         """
         Retrieve a location by its zip code.
         """
-        zip_code = str(zip_code)
-        zip_code_object = self.db.query(ZipCode).filter(ZipCode.zip == zip_code).first()
+        zip_code_object = self.db.execute(self._zip_query(zip_code)).scalars().first()
         if zip_code_object:
             return zip_code_object
         log.warning(f"Location not found for zip: {zip}")
@@ -32,7 +66,7 @@ class LocationService:
         Retrieve a location by its city name.
         """
         try:
-            zip_code_object = self.db.query(ZipCode).filter(func.lower(ZipCode.city) == city.lower(), func.lower(ZipCode.state) == state.lower()).first()
+            zip_code_object = self.db.execute(self._city_query(city, state)).scalars().first()
             if zip_code_object:
                 return zip_code_object
             log.warning(f"Location not found for city: {city}, state: {state}")
@@ -53,6 +87,7 @@ class LocationService:
         log.warning(f"Attribute '{attribute}' not found in location object.")
         return None
     
+    @single_writer
     def add(self, location: ZipCode) -> ZipCode:
         """
         Add a new location to the database.
@@ -78,23 +113,9 @@ class LocationService:
         """
         zip_code_object = None
         try:
-            if (isinstance(location, str) and location.isdigit()) or (isinstance(location, int) and len(str(location)) == 5):
-                # Assuming it's a zip code
-                zip_code_object = self._get_location_by_zip(location)
-            elif isinstance(location, str) and ',' in location:
-                # Assuming it's a city and state combination (e.g., "Nashville,TN")
-                city, state = location.split(',', 1)
-                city = city.strip(",").strip()
-                state = state.strip()
-
-                if not city or not state:
-                    log.error(f"Invalid location format: {location}")
-                    raise ValueError("Invalid location format. Expected 'city,state'.")
-                
-                zip_code_object = self._get_location_by_city(city, state)
-            else:
-                log.error(f"Invalid location format: {location}")
-                raise ValueError("Invalid location format. Expected zip code or 'city,state'.")
+            zip_code_object = self.db.execute(self._parse_location(location)).scalars().first()
+            if not zip_code_object:
+                log.warning(f"Location not found: {location}")
             
             if zip_code_object and attribute:
                 # If an attribute is specified, return the specific attribute value
@@ -123,6 +144,31 @@ class LocationService:
             log.error(f"Unexpected error: {e}")
             return None
     
+    async def get_async(self, location: str | int, attribute: str = None) -> Optional[ZipCode]:
+        """
+        Async variant of get() for a LocationService created with an AsyncSession.
+        """
+        try:
+            result = await self.db.execute(self._parse_location(location))
+            zip_code_object = result.scalars().first()
+            if not zip_code_object:
+                log.warning(f"Location not found: {location}")
+
+            if zip_code_object and attribute:
+                return self._get_attribute(zip_code_object, attribute)
+
+            return zip_code_object
+        except ValueError:
+            log.error(f"Invalid location format: {location}")
+            return None
+        except SQLAlchemyError as e:
+            log.error(f"Database error: {e}")
+            return None
+        except Exception as e:
+            log.error(f"Unexpected error: {e}")
+            return None
+    
+    @single_writer
     def update(self, location: str | int, **kwargs) -> Optional[ZipCode]:
         """
         Update a location based on the provided identifier (zip code or city/state).
@@ -150,6 +196,7 @@ class LocationService:
             self.db.rollback()
             return None
     
+    @single_writer
     def delete(self, location: str | int) -> bool:
         """
         Delete a location based on the provided identifier (zip code or city/state).
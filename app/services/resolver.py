@@ -0,0 +1,258 @@
+"""
+Batch entity resolution for businesses that are the same company under
+different names, e.g. "ABC Roofing LLC" from GAF and "A.B.C. Roofing &
+Restoration" from Owens Corning.
+
+Businesses are never compared all against all. Each one is put in blocks
+keyed by its normalized phone number, its website domain, and its ZIP code
+plus the first word of its name; only businesses sharing a block are
+scored, on name similarity. A shared phone or domain is strong evidence,
+so a looser name match is enough there than for a shared ZIP. Matching
+pairs are joined into clusters with a union-find, so A~B and B~C make one
+cluster even if A and C never shared a block.
+
+Blocks larger than MAX_BLOCK_SIZE (a call center number, a directory
+domain) say little about identity and would make the work quadratic, so
+they are skipped and counted in the stats instead.
+
+resolve_all() scans the whole table; resolve_new() only scores businesses
+created since a point in time against the rows that share a block with them.
+"""
+from datetime import datetime
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from app.core.timeouts import renew_deadline
+from app.models.contact import Business
+from app.services.formatter import Formatter
+from app.services.logger import Logger
+
+log = Logger('service-resolver', log_level='INFO')
+
+# Blocks with more members than this are skipped rather than compared pairwise
+MAX_BLOCK_SIZE = 100
+# Name similarity a pair needs, by the strongest block it shares
+MATCH_THRESHOLDS = {"phone": 0.5, "domain": 0.5, "zip": 0.8}
+# Rows fetched per batch when scanning businesses
+SCAN_BATCH_SIZE = 5000
+# New businesses looked up per candidate query in resolve_new()
+LOOKUP_BATCH_SIZE = 500
+
+# Domains many unrelated businesses share, which identify nobody
+SHARED_DOMAINS = {
+    "facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com", "youtube.com",
+    "google.com", "business.site", "yelp.com", "angi.com", "homeadvisor.com", "houzz.com",
+    "bbb.org", "nextdoor.com", "wixsite.com", "squarespace.com", "godaddysites.com", "weebly.com",
+}
+# The stored lookup keys rather than the raw values; the key functions accept both
+_KEY_COLUMNS = (Business.id, Business.name, Business.phone_key, Business.domain_key, Business.zip_key, Business.created)
+
+format = Formatter()
+
+def phone_key(phone: Optional[str]) -> Optional[str]:
+    """The 10-digit NANP number in a phone value, or None."""
+    return format.phone_key(phone)
+
+def domain_key(website: Optional[str]) -> Optional[str]:
+    """The registrable domain of a website, or None for empty and shared domains."""
+    domain = format.domain_key(website)
+    return None if domain in SHARED_DOMAINS else domain
+
+def zip_key(zip_code: Optional[str]) -> Optional[str]:
+    """The 5-digit ZIP of a ZIP or ZIP+4 value, or None."""
+    return format.zip_key(zip_code)
+
+@lru_cache(maxsize=100_000)
+def name_tokens(name: str) -> tuple[str, ...]:
+    """Comparable words of a company name, as in Formatter.name_key()."""
+    return tuple((format.name_key(name) or "").split())
+
+@lru_cache(maxsize=100_000)
+def _trigrams(name: str) -> frozenset:
+    text = f"  {' '.join(name_tokens(name))} "
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+def name_similarity(a: str, b: str) -> float:
+    """0..1 similarity of two company names.
+
+    The better of a word score (the mean of the overlap coefficient and the
+    Jaccard index, so "ABC Roofing" fully inside "ABC Roofing Restoration"
+    scores high but not 1) and a character trigram Dice score for typos."""
+    words_a, words_b = set(name_tokens(a)), set(name_tokens(b))
+    if not words_a or not words_b:
+        return 0.0
+    shared = len(words_a & words_b)
+    words = (shared / min(len(words_a), len(words_b)) + shared / len(words_a | words_b)) / 2
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    grams = 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+    return max(words, grams)
+
+def block_keys(name: str, phone: Optional[str], website: Optional[str], zip_code: Optional[str]) -> list[tuple[str, str]]:
+    """The (kind, key) blocks a business belongs in."""
+    keys = []
+    if (phone := phone_key(phone)):
+        keys.append(("phone", phone))
+    if (domain := domain_key(website)):
+        keys.append(("domain", domain))
+    tokens = name_tokens(name or "")
+    if (zip_code := zip_key(zip_code)) and tokens:
+        keys.append(("zip", f"{zip_code}:{tokens[0]}"))
+    return keys
+
+class BusinessResolver:
+    """
+    One resolution run: feed it businesses with add(), then read clusters().
+
+    Businesses added with new=False are only compared with new ones, which
+    is how resolve_new() scores fresh rows against the existing table.
+    """
+
+    def __init__(self, max_block_size: int = MAX_BLOCK_SIZE):
+        self.max_block_size = max_block_size
+        # Businesses are numbered in the order added; blocks, pairs and the
+        # union-find work on those numbers rather than hashing UUIDs
+        self.ids, self.names, self.created, self.keys = [], [], [], []
+        self.new = set()
+        self.blocks = {}
+        self.pairs = {}
+        self.stats = {"businesses": 0, "blocks": 0, "skipped_blocks": 0, "comparisons": 0, "matches": 0}
+        self._index = {}
+        self._parent = []
+
+    def add(self, rows: Iterable, new: bool = True):
+        """Add (id, name, phone, website, zip, created) rows to the run."""
+        for business_id, name, phone, website, zip_code, created in rows:
+            if business_id in self._index:
+                continue
+            n = self._index[business_id] = len(self.ids)
+            keys = block_keys(name, phone, website, zip_code)
+            self.ids.append(business_id)
+            self.names.append(name)
+            self.created.append(created)
+            self.keys.append(dict(keys))
+            self._parent.append(n)
+            if new:
+                self.new.add(n)
+            for key in keys:
+                self.blocks.setdefault(key, []).append(n)
+        self.stats["businesses"] = len(self.ids)
+
+    def _find(self, n: int) -> int:
+        parent = self._parent
+        root = n
+        while parent[root] != root:
+            root = parent[root]
+        while parent[n] != root:
+            parent[n], n = root, parent[n]
+        return root
+
+    def score(self):
+        """Compare the businesses within each block and union the matches."""
+        seen = set()
+        for (kind, key), members in self.blocks.items():
+            if len(members) < 2:
+                continue
+            self.stats["blocks"] += 1
+            if len(members) > self.max_block_size:
+                self.stats["skipped_blocks"] += 1
+                log.debug(f"Skipping {kind} block {key} with {len(members)} businesses")
+                continue
+            for a, b in combinations(members, 2):
+                if a not in self.new and b not in self.new:
+                    continue
+                if (a, b) in seen:
+                    continue
+                seen.add((a, b))
+                self.stats["comparisons"] += 1
+                # A pair may share more than this block; the strongest shared evidence sets the bar
+                keys_a, keys_b = self.keys[a], self.keys[b]
+                shared = [
+                    kind for kind in MATCH_THRESHOLDS
+                    if kind in keys_a and keys_a[kind] == keys_b.get(kind) and len(self.blocks[(kind, keys_a[kind])]) <= self.max_block_size
+                ]
+                similarity = name_similarity(self.names[a], self.names[b])
+                if similarity >= min(MATCH_THRESHOLDS[kind] for kind in shared):
+                    self.pairs[(a, b)] = {"score": round(similarity, 3), "blocks": shared}
+                    root_a, root_b = self._find(a), self._find(b)
+                    if root_a != root_b:
+                        self._parent[root_b] = root_a
+        self.stats["matches"] = len(self.pairs)
+
+    def clusters(self) -> list[dict]:
+        """Merge clusters, largest first. The oldest business of each is its canonical row."""
+        members, pairs = {}, {}
+        for (a, b), match in self.pairs.items():
+            root = self._find(a)
+            members.setdefault(root, set()).update((a, b))
+            pairs.setdefault(root, []).append({"a": str(self.ids[a]), "b": str(self.ids[b]), **match})
+        clusters = []
+        for root, group in members.items():
+            ordered = sorted(group, key=lambda n: (self.created[n] or datetime.max, str(self.ids[n])))
+            clusters.append({
+                "canonical": str(self.ids[ordered[0]]),
+                "businesses": [{"id": str(self.ids[n]), "name": self.names[n], "new": n in self.new} for n in ordered],
+                "pairs": pairs[root],
+            })
+        clusters.sort(key=lambda cluster: (-len(cluster["businesses"]), cluster["canonical"]))
+        return clusters
+
+    def result(self) -> dict:
+        self.score()
+        clusters = self.clusters()
+        self.stats["clusters"] = len(clusters)
+        log.info(f"Entity resolution: {self.stats}")
+        return {"stats": dict(self.stats), "clusters": clusters}
+
+def resolve_all(db: Session, batch_size: int = SCAN_BATCH_SIZE, max_block_size: int = MAX_BLOCK_SIZE) -> dict:
+    """Find duplicate clusters across every business."""
+    resolver = BusinessResolver(max_block_size)
+    conn = db.connection()
+    result = conn.execution_options(yield_per=batch_size).execute(select(*_KEY_COLUMNS))
+    for rows in result.partitions():
+        resolver.add(rows)
+        renew_deadline(conn)
+    return resolver.result()
+
+def resolve_new(db: Session, since: Optional[datetime] = None, business_ids: Iterable = (), max_block_size: int = MAX_BLOCK_SIZE) -> dict:
+    """Find duplicates of new businesses, among themselves and the rest of the table.
+
+    New means created since `since` or listed in `business_ids` (e.g. the
+    ids a bulk upload returned). Existing businesses are only loaded when
+    they share a phone number, website domain, or ZIP and first name word
+    with a new one, each looked up through an index."""
+    resolver = BusinessResolver(max_block_size)
+    business_ids = list(business_ids)
+    new = [Business.created >= since] if since is not None else []
+    if business_ids:
+        new.append(Business.id.in_(business_ids))
+    if not new:
+        raise ValueError("Pass since or business_ids to pick the new businesses")
+    new_rows = db.execute(select(*_KEY_COLUMNS).where(or_(*new))).all()
+    resolver.add(new_rows)
+    for start in range(0, len(new_rows), LOOKUP_BATCH_SIZE):
+        batch = new_rows[start:start + LOOKUP_BATCH_SIZE]
+        keys = {"phone": set(), "domain": set(), "zip": {}}
+        for _, name, phone, website, zip_code, _ in batch:
+            for kind, key in block_keys(name, phone, website, zip_code):
+                if kind == "zip":
+                    zip_code, token = key.split(":", 1)
+                    keys["zip"].setdefault(zip_code, set()).add(token)
+                else:
+                    keys[kind].add(key)
+        # Phones and domains are exact matches on the indexed lookup keys
+        conditions = []
+        if keys["phone"]:
+            conditions.append(Business.phone_key.in_(keys["phone"]))
+        if keys["domain"]:
+            conditions.append(Business.domain_key.in_(keys["domain"]))
+        # A ZIP block is the ZIP plus the first name word, so only same-named rows in the ZIP are
+        # candidates; both are read from the (zip_key, name_key) index
+        for zip_code, tokens in keys["zip"].items():
+            names = [or_(Business.name_key == token, Business.name_key.startswith(f"{token} ", autoescape=True)) for token in tokens]
+            conditions.append(and_(Business.zip_key == zip_code, or_(*names)))
+        if conditions:
+            resolver.add(db.execute(select(*_KEY_COLUMNS).where(or_(*conditions))).all(), new=False)
+    return resolver.result()
@@ -26,7 +26,7 @@ class GAFScraper:
         self.location = location
         self.radius = radius
         self.db = db
-        self.source = source if source else add_or_find_source(db, SourceSchema(name="GAF", url="https://www.gaf.com/en-us/roofing-contractors/residential"))
+        self.source = source if source else add_or_find_source(SourceSchema(name="GAF", url="https://www.gaf.com/en-us/roofing-contractors/residential"), db)
         log.debug(f"Source: {self.source}")
         self.scraper = ScrapingService()
 
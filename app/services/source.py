@@ -1,23 +1,163 @@
 from app.models.source import Source
 from app.schemas.source import SourceSchemaBase, SourceSchema
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Select, func, select
+import threading
 import uuid
+from typing import Optional
 from urllib.parse import unquote_plus
 from app.services.logger import Logger
+from app.core.writer import single_writer
 
 log = Logger('service-source', log_level='INFO')
 
+class SourceRegistry:
+    """
+    In-process cache of source names to ids, shared by the business service
+    and the scrapers.
+
+    Sources are few and almost never change, so the whole table is loaded on
+    first use and kept in memory, keyed by exact name and by a normalized
+    form (case and whitespace folded). Sources added through SourceService.add
+    or add_or_find_source are registered as they are written; a name the cache
+    does not know triggers one reload, in case another process added it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names = {}
+        self._exact = {}
+        self._normalized = {}
+        self._loaded = False
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return " ".join(name.split()).casefold()
+
+    def _match(self, name: str, partial: bool) -> Optional[uuid.UUID]:
+        source_id = self._exact.get(name) or self._normalized.get(self.normalize(name))
+        if source_id is None and partial and name.strip():
+            # Same semantics as the old `name ILIKE '%search%'` lookup; the
+            # shortest containing name is the closest match
+            needle = self.normalize(name)
+            matches = [key for key in self._normalized if needle in key]
+            if matches:
+                source_id = self._normalized[min(matches, key=lambda key: (len(key), key))]
+        return source_id
+
+    def load(self, db: Session):
+        """(Re)load every source from the database."""
+        rows = db.execute(select(Source.id, Source.name)).all()
+        with self._lock:
+            self._names = {source_id: name for source_id, name in rows}
+            self._exact = {name: source_id for source_id, name in rows}
+            self._normalized = {self.normalize(name): source_id for source_id, name in rows}
+            self._loaded = True
+        log.debug(f"Loaded {len(rows)} sources into the registry")
+
+    def register(self, source_id: uuid.UUID, name: str):
+        """Record a source that has just been written."""
+        with self._lock:
+            self._names[source_id] = name
+            self._exact[name] = source_id
+            self._normalized.setdefault(self.normalize(name), source_id)
+
+    def clear(self):
+        with self._lock:
+            self._names, self._exact, self._normalized = {}, {}, {}
+            self._loaded = False
+
+    def lookup(self, db: Session, name: str, partial: bool = False) -> Optional[tuple[uuid.UUID, str]]:
+        """Find a source by name, returning its (id, name) or None.
+
+        `partial` also accepts sources whose name contains `name`."""
+        if not self._loaded:
+            self.load(db)
+        source_id = self._match(name, partial)
+        if source_id is None:
+            self.load(db)
+            source_id = self._match(name, partial)
+        if source_id is None:
+            return None
+        return source_id, self._names[source_id]
+
+    def name_of(self, db: Session, source_id: uuid.UUID) -> Optional[str]:
+        """The name of a source by id, or None if there is no such source."""
+        source_id = uuid.UUID(str(source_id))
+        if source_id not in self._names:
+            self.load(db)
+        return self._names.get(source_id)
+
+source_registry = SourceRegistry()
+
 class SourceService:
     def __init__(self):
         pass
 
+    def _parse_pagination(self, skip, limit, errors: list) -> tuple[int, int]:
+        """Coerce the paging parameters to integers, falling back to defaults."""
+        try:
+            skip = int(skip) if skip is not None else 0
+            limit = int(limit) if limit is not None else 100
+        except ValueError as e:
+            log.error(f"Invalid pagination parameters: {e}. Using defaults (0, 100).")
+            errors.append(f"Invalid pagination parameters: {e}. Using defaults (0, 100).")
+            skip = 0
+            limit = 100
+        return skip, limit
+
+    def _build_query(self, search: str = None) -> Select:
+        """Build the source query with an optional name search."""
+        query = select(Source)
+        log.debug(f"Initial query: {query}")
+
+        if search and isinstance(search, str):
+            log.debug(f"Search term: {search}")
+            search = search.strip()
+            search = unquote_plus(search)
+            if search:
+                query = query.where(Source.name.ilike(f"%{search}%"))
+        return query
+
+    def _get_result(self, source_list: list, total_count: int, errors: list, params: dict, data: dict) -> tuple[str, int, list, dict, dict]:
+        """Build the get() response tuple for a list of sources."""
+        status = 'success'
+        code = 200
+        log.debug(f"Total count of sources: {total_count}")
+        data["total"] = total_count
+        log.debug(f"Source list: {source_list}")
+
+        if not source_list:
+            log.warning("No sources found.")
+            errors.append("No sources found.")
+            code = 404
+            status = 'error'
+
+        sources = []
+        for source in source_list:
+            log.debug(f"Processing source: {source}")
+            source_obj = SourceSchemaBase.model_validate(source)
+            source_dict = source_obj.model_dump()
+            source_dict["id"] = str(source_dict["id"]) if source_dict["id"] else None
+            sources.append(source_dict)
+            log.debug(f"Source dict: {source_dict}")
+        data["sources"] = sources
+        log.debug(f"Final data: {data}")
+
+        return (
+            status, 
+            code, 
+            errors, 
+            params, 
+            data
+        )
+
     def get(self, db: Session, skip: int = 0, limit: int = 100, search: str = None) -> tuple[str, int, list, dict, dict]:
         """Get sources from the database with optional pagination and search."""
         log.info(f"Getting sources with pagination: skip={skip}, limit={limit}, search={search}")
         errors = []
-        status = 'success'
-        code = 200
         params = {
             "skip": skip,
             "limit": limit,
@@ -28,58 +168,55 @@ class SourceService:
             "sources": []
         }
 
-        try:
-            skip = int(skip) if skip is not None else 0
-            limit = int(limit) if limit is not None else 100
-        except ValueError as e:
-            log.error(f"Invalid pagination parameters: {e}. Using defaults (0, 100).")
-            errors.append(f"Invalid pagination parameters: {e}. Using defaults (0, 100).")
-            skip = 0
-            limit = 100
+        skip, limit = self._parse_pagination(skip, limit, errors)
         
         try:
-            query = db.query(Source)
-            log.debug(f"Initial query: {query}")
-
-            if search and isinstance(search, str):
-                log.debug(f"Search term: {search}")
-                search = search.strip()
-                search = unquote_plus(search)
-                if search:
-                    query = query.filter(Source.name.ilike(f"%{search}%"))
-
-            total_count = query.count()
-            log.debug(f"Total count of sources: {total_count}")
-            data["total"] = total_count
+            query = self._build_query(search)
+            total_count = db.execute(select(func.count()).select_from(query.subquery())).scalar()
                         
-            #source_list = query.offset(skip).limit(limit).all()
-            source_list = query.all()
-            log.debug(f"Source list: {source_list}")
-
-            if not source_list:
-                log.warning("No sources found.")
-                errors.append("No sources found.")
-                code = 404
-                status = 'error'
-
-            sources = []
-            for source in source_list:
-                log.debug(f"Processing source: {source}")
-                source_obj = SourceSchemaBase.model_validate(source)
-                source_dict = source_obj.model_dump()
-                source_dict["id"] = str(source_dict["id"]) if source_dict["id"] else None
-                sources.append(source_dict)
-                log.debug(f"Source dict: {source_dict}")
-            data["sources"] = sources
-            log.debug(f"Final data: {data}")
-
+            #source_list = db.execute(query.offset(skip).limit(limit)).scalars().all()
+            source_list = db.execute(query).scalars().all()
+            return self._get_result(source_list, total_count, errors, params, data)
+        except SQLAlchemyError as e:
+            log.error(f"Error getting sources: {e}")
             return (
-                status, 
-                code, 
-                errors, 
+                "error", 
+                500, 
+                [str(e)], 
+                params,
+                data
+            )
+        except Exception as e:
+            log.error(f"Unexpected error: {e}")
+            return (
+                "error", 
+                500, 
+                [str(e)], 
                 params, 
                 data
             )
+
+    async def get_async(self, db: AsyncSession, skip: int = 0, limit: int = 100, search: str = None) -> tuple[str, int, list, dict, dict]:
+        """Async variant of get() for use with an AsyncSession."""
+        log.info(f"Getting sources with pagination: skip={skip}, limit={limit}, search={search}")
+        errors = []
+        params = {
+            "skip": skip,
+            "limit": limit,
+            "search": search
+        }
+        data = {
+            "total": 0,
+            "sources": []
+        }
+
+        skip, limit = self._parse_pagination(skip, limit, errors)
+
+        try:
+            query = self._build_query(search)
+            total_count = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar()
+            source_list = (await db.execute(query)).scalars().all()
+            return self._get_result(source_list, total_count, errors, params, data)
         except SQLAlchemyError as e:
             log.error(f"Error getting sources: {e}")
             return (
@@ -99,6 +236,7 @@ class SourceService:
                 data
             )
 
+    @single_writer
     def add(self, db: Session, source: SourceSchema) -> tuple[str, int, list, dict, dict]:
         """Add a new source to the database."""
         log.info(f"Adding new source: {source}")
@@ -140,6 +278,7 @@ class SourceService:
                     db.add(new_source)
                     db.commit()
                     db.refresh(new_source)
+                    source_registry.register(new_source.id, new_source.name)
                     log.info(f"Added new source: {new_source.name} (ID: {new_source.id})")
                     source_obj = SourceSchemaBase.model_validate(new_source)
                     source_dict = source_obj.model_dump()
@@ -258,17 +397,20 @@ class SourceService:
             )
 
 #TODO: Refactor to eliminate this function and use the add method instead
+@single_writer
 def add_or_find_source(source: SourceSchema, db: Session) -> uuid.UUID:
     source_name = source.name
     source_url = source.url
-    existing_source = db.query(Source).filter(Source.name == source_name).first()
+    existing_source = source_registry.lookup(db, source_name)
     if not existing_source:
         new_source = Source(name=source_name, url=source_url)
         db.add(new_source)
         db.commit()
         db.refresh(new_source)
+        source_registry.register(new_source.id, new_source.name)
         log.info(f"Added new source: {new_source.name} (ID: {new_source.id})")
         return new_source.id
     else:
-        log.info(f"Found existing source: {existing_source.name} (ID: {existing_source.id})")
-        return existing_source.id
\ No newline at end of file
+        source_id, name = existing_source
+        log.info(f"Found existing source: {name} (ID: {source_id})")
+        return source_id
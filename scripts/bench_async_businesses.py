@@ -0,0 +1,107 @@
+"""
+Compare requests/sec for the sync and async GET /businesses paths.
+
+Both handlers are mounted on a throwaway app served by uvicorn, then hammered
+with a fixed number of concurrent httpx clients.
+
+    python scripts/bench_async_businesses.py --concurrency 200 --duration 15
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import get_async_db, get_db
+from app.services.business import BusinessService
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('bench-async-businesses')
+
+bench_app = FastAPI()
+
+@bench_app.get("/sync/businesses")
+def sync_businesses(request: Request, db: Session = Depends(get_db)):
+    code, status, errors, params, data = BusinessService().get(db=db, params=dict(request.query_params))
+    return JSONResponse(status_code=code, content={"status": status, "code": code, "errors": errors, "params": params, "data": data})
+
+@bench_app.get("/async/businesses")
+async def async_businesses(request: Request, db: AsyncSession = Depends(get_async_db)):
+    code, status, errors, params, data = await BusinessService().get_async(db=db, params=dict(request.query_params))
+    return JSONResponse(status_code=code, content={"status": status, "code": code, "errors": errors, "params": params, "data": data})
+
+async def run_load(url: str, concurrency: int, duration: float) -> dict:
+    """Fire requests from `concurrency` workers for `duration` seconds."""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(latencies[count // 2] * 1000, 1) if count else 0.0,
+        "p99_ms": round(latencies[int(count * 0.99) - 1] * 1000, 1) if count else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--query", default="limit=100", help="Query string passed to GET /businesses")
+    args = parser.parse_args()
+
+    server = uvicorn.Server(uvicorn.Config(bench_app, host=args.host, port=args.port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.1)
+
+    try:
+        for mode in ("sync", "async"):
+            url = f"http://{args.host}:{args.port}/{mode}/businesses?{args.query}"
+            # Warm up the pool before measuring
+            asyncio.run(run_load(url, min(args.concurrency, 10), 1.0))
+            result = asyncio.run(run_load(url, args.concurrency, args.duration))
+            log.info(f"{mode:>5}: {result}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+if __name__ == "__main__":
+    main()
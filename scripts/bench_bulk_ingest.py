@@ -0,0 +1,103 @@
+"""
+Measure POST /businesses/bulk throughput against one POST /businesses per record.
+
+Streams synthetic NDJSON records through the app (in process, via the test
+client) into the database configured in .env, then deletes them again. Run
+it against a scratch database; on Postgres the bulk path loads with COPY.
+
+    python scripts/bench_bulk_ingest.py --records 100000 --single 500
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db_engine
+from app.main import app
+from app.models.contact import Business
+from app.models.joins import BusinessSource
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('bench-bulk-ingest')
+
+TRADES = ["Roofing", "Exteriors", "Construction", "Restoration", "Gutters"]
+STATES = ["GA", "TN", "FL", "AL", "SC"]
+
+def records(rng: random.Random, prefix: str, start: int, count: int, source: str):
+    for n in range(start, start + count):
+        yield {
+            "name": f"{prefix} {rng.choice(TRADES)} {n}",
+            "industry": rng.choice(TRADES),
+            "phone": f"({rng.randrange(200, 999)}) 555-{rng.randrange(1000, 9999)}",
+            "address": f"{n} Main St, Springfield, {rng.choice(STATES)} {rng.randrange(10000, 99999)}",
+            "website": f"www.bench{n}.com",
+            "email": f"info@bench{n}.com",
+            "source": source,
+        }
+
+def ndjson_body(rows, chunk_records: int = 500):
+    """Yield the records as NDJSON in chunks, like a streaming client would."""
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(row))
+        if len(chunk) == chunk_records:
+            yield ("\n".join(chunk) + "\n").encode()
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode()
+
+def cleanup(prefix: str):
+    with Session(get_db_engine()) as db:
+        ids = select(Business.id).where(Business.name.like(f"{prefix}%"))
+        db.execute(delete(BusinessSource).where(BusinessSource.business_id.in_(ids)))
+        deleted = db.execute(delete(Business).where(Business.name.like(f"{prefix}%"))).rowcount
+        db.commit()
+    log.info(f"Removed {deleted} benchmark businesses")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000, help="Records to send through the bulk endpoint")
+    parser.add_argument("--single", type=int, default=500, help="Records to send one POST /businesses at a time")
+    parser.add_argument("--source", default="Bench", help="Source name the records are attributed to")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    prefix = f"Bench {uuid.uuid4().hex[:8]}"
+    client = TestClient(app)
+    client.post("/sources", json={"name": args.source, "url": "https://example.com"})
+
+    try:
+        if args.single:
+            started = time.perf_counter()
+            for row in records(rng, prefix, 0, args.single, args.source):
+                client.post("/businesses", json=row)
+            elapsed = time.perf_counter() - started
+            log.info(f"POST /businesses: {args.single} records in {elapsed:.2f}s, {args.single / elapsed:,.0f} records/s")
+
+        started = time.perf_counter()
+        response = client.post(
+            "/businesses/bulk",
+            content=ndjson_body(records(rng, prefix, args.single, args.records, args.source)),
+            headers={"content-type": "application/x-ndjson"},
+        )
+        elapsed = time.perf_counter() - started
+        data = response.json()["data"]
+        counts = {key: value for key, value in data.items() if key != "results"}
+        log.info(f"POST /businesses/bulk: {args.records} records in {elapsed:.2f}s, {args.records / elapsed:,.0f} records/s {counts}")
+    finally:
+        cleanup(prefix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Time the GET /businesses substring filters with and without search indexes.
+
+Loads synthetic businesses into a scratch database in steps (1M, then 10M
+rows by default) and at each size runs the same filters through
+BusinessService.build_query twice: once as plain ILIKE scans and once on the
+indexed path (the FTS5 trigram table on SQLite, pg_trgm GIN indexes on
+Postgres). Point --url at an empty scratch database; its businesses table is
+dropped at the end.
+
+    python scripts/bench_business_search.py --url sqlite:///bench_search.db --rows 1000000 10000000
+    python scripts/bench_business_search.py --url postgresql://localhost/bizlist_bench
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from sqlalchemy import create_engine, insert
+
+from app.core.search import SEARCH_COLUMNS, SQLITE_SEARCH_TABLE, ensure_sqlite_search
+from app.models import uuid7
+from app.models.contact import Business
+from app.services.business import BusinessService
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('bench-business-search')
+
+WORDS = ["Summit", "Peak", "Eagle", "Pioneer", "Liberty", "Heritage", "Precision", "Superior", "Allied", "Premier",
+         "Coastal", "Mountain", "Valley", "River", "Golden", "Patriot", "Reliable", "Quality", "Family", "Legacy"]
+TRADES = ["Roofing", "Exteriors", "Construction", "Contracting", "Home Improvement", "Restoration", "Builders", "Gutters"]
+SUFFIXES = ["LLC", "Inc", "Co", "Group", "& Sons", "Services"]
+STATES = ["GA", "TN", "FL", "AL", "SC", "NC", "TX", "OH", "PA", "CO"]
+
+def business_rows(rng: random.Random, start: int, count: int) -> list[dict]:
+    rows = []
+    for n in range(start, start + count):
+        # Names are unique, so the running number goes in the name
+        rows.append({
+            "id": uuid7(),
+            "name": f"{rng.choice(WORDS)} {rng.choice(TRADES)} {n} {rng.choice(SUFFIXES)}",
+            "industry": rng.choice(TRADES),
+            "city": f"{rng.choice(WORDS)}ville {n % 3000}",
+            "state": rng.choice(STATES),
+            "zip": f"{rng.randrange(10000, 99999)}",
+            "phone": f"{rng.randrange(2000000000, 9999999999)}",
+        })
+    return rows
+
+def filter_sets(rng: random.Random, count: int) -> dict[str, list[dict]]:
+    return {
+        "name word": [{"name": rng.choice(WORDS).lower()} for _ in range(count)],
+        "name number": [{"name": str(rng.randrange(100_000, 999_999))} for _ in range(count)],
+        "city + state": [{"city": f"ville {rng.randrange(3000)}", "state": rng.choice(STATES)} for _ in range(count)],
+        "industry + name": [{"industry": rng.choice(TRADES)[:5], "name": rng.choice(WORDS)} for _ in range(count)],
+    }
+
+def time_queries(engine, filters: list[dict], indexed: bool, limit: int) -> list[float]:
+    service = BusinessService()
+    timings = []
+    with engine.connect() as conn:
+        for params in filters:
+            query, _ = service.build_query(dict(params), engine if indexed else None)
+            started = time.perf_counter()
+            conn.execute(query.limit(limit)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def create_indexes(engine):
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for column in SEARCH_COLUMNS:
+                conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS ix_businesses_{column}_trgm ON businesses USING gin ({column} gin_trgm_ops)")
+            conn.exec_driver_sql("ANALYZE businesses")
+    else:
+        ensure_sqlite_search(engine)
+
+def drop_indexes(engine):
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for column in SEARCH_COLUMNS:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_businesses_{column}_trgm")
+        else:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}")
+            for suffix in ("ai", "ad", "au"):
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_{suffix}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL", "sqlite:///bench_search.db"))
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000], help="Table sizes to measure at")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per filter type")
+    parser.add_argument("--limit", type=int, default=10, help="Page size, as in GET /businesses")
+    parser.add_argument("--batch", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = create_engine(args.url)
+    Business.__table__.drop(engine, checkfirst=True)
+    drop_indexes(engine)
+    Business.__table__.create(engine)
+
+    loaded = 0
+    try:
+        for size in sorted(args.rows):
+            # Load without the indexes, then build them once per step
+            drop_indexes(engine)
+            while loaded < size:
+                count = min(args.batch, size - loaded)
+                with engine.begin() as conn:
+                    conn.execute(insert(Business), business_rows(rng, loaded, count))
+                loaded += count
+                if loaded % 500_000 < count:
+                    log.info(f"Loaded {loaded} rows")
+
+            filters = filter_sets(rng, args.queries)
+            scan = {name: time_queries(engine, sets, False, args.limit) for name, sets in filters.items()}
+            started = time.perf_counter()
+            create_indexes(engine)
+            log.info(f"Built search indexes at {size} rows in {time.perf_counter() - started:.1f}s")
+            indexed = {name: time_queries(engine, sets, True, args.limit) for name, sets in filters.items()}
+
+            log.info(f"{size} rows ({engine.dialect.name}), median / p95 ms over {args.queries} queries:")
+            for name in filters:
+                s, i = sorted(scan[name]), sorted(indexed[name])
+                p95 = lambda t: t[min(len(t) - 1, int(len(t) * 0.95))]
+                log.info(f"  {name:<16} scan {statistics.median(s):>9.1f} / {p95(s):>9.1f}   indexed {statistics.median(i):>9.1f} / {p95(i):>9.1f}")
+    finally:
+        drop_indexes(engine)
+        Business.__table__.drop(engine, checkfirst=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Per-row cost of serializing businesses for GET /businesses and exports.
+
+Compares the old path (ORM objects -> __dict__ copy -> BusinessSchemaRead
+validate/dump -> JSONResponse) with the tuple select + rows_to_dicts() +
+dumps() path, including the query itself, at a page of 100 rows and at an
+export-sized result. Uses a scratch in-memory SQLite database by default.
+
+    python scripts/bench_business_serializer.py --rows 50000 --pages 200
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from uuid import UUID
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.serializer import dumps, orjson, rows_to_dicts, select_columns
+from app.models import uuid7
+from app.models.contact import Business
+from app.schemas.contact import BusinessSchemaRead
+from app.services.business import BUSINESS_FIELDS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('bench-business-serializer')
+
+def legacy_serialize(businesses) -> list[dict]:
+    """The list serializer as it was before the tuple path, for comparison."""
+    business_list = []
+    for business in businesses:
+        business_dict = business.__dict__.copy()
+        business_dict.pop('_sa_instance_state', None)
+        processed_dict = {}
+        for key, value in business_dict.items():
+            if value == '' or value is None:
+                continue
+            processed_dict[key] = str(value) if isinstance(value, UUID) else value
+        business_data = BusinessSchemaRead.model_validate(processed_dict).model_dump()
+        for key, value in business_data.items():
+            if isinstance(value, UUID):
+                business_data[key] = str(value)
+        business_list.append(business_data)
+    return business_list
+
+def legacy(db: Session, limit: int) -> bytes:
+    businesses = db.execute(select(Business).order_by(Business.name).limit(limit)).scalars().all()
+    body = JSONResponse(content={"data": legacy_serialize(businesses)}).body
+    db.expunge_all()
+    return body
+
+def fast(db: Session, limit: int) -> bytes:
+    query = select_columns(select(Business).order_by(Business.name).limit(limit), Business, BUSINESS_FIELDS)
+    return dumps({"data": rows_to_dicts(db.execute(query).all(), BUSINESS_FIELDS)})
+
+def seed(engine, rows: int, rng: random.Random):
+    Business.__table__.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        for start in range(0, rows, 10_000):
+            conn.execute(insert(Business), [{
+                "id": uuid7(),
+                "name": f"Business {n:07d}",
+                "industry": rng.choice(["Roofing", "Gutters", "Siding"]),
+                "address": f"{n} Main St",
+                "address2": rng.choice(["", "Suite 100"]),
+                "city": "Atlanta",
+                "state": "GA",
+                "zip": "30301",
+                "phone": f"404555{n % 10000:04d}",
+                "website": f"https://b{n}.example.com",
+                "email": rng.choice(["", f"info@b{n}.example.com"]),
+                "notes": "",
+            } for n in range(start, min(start + 10_000, rows))])
+
+def measure(engine, fn, limit: int, repeats: int) -> list[float]:
+    """Microseconds per row for each run."""
+    timings = []
+    with Session(engine) as db:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn(db, limit)
+            timings.append((time.perf_counter() - started) * 1e6 / limit)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows in the table, and the export size")
+    parser.add_argument("--pages", type=int, default=200, help="Timed runs at limit=100")
+    parser.add_argument("--exports", type=int, default=5, help="Timed runs at the export size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    seed(engine, args.rows, random.Random(args.seed))
+
+    with Session(engine) as db:
+        if json.loads(legacy(db, 100)) != json.loads(fast(db, 100)):
+            raise SystemExit("The two serializers disagree on the response shape")
+
+    log.info(f"Encoder: {'orjson' if orjson else 'json'}; per-row cost in microseconds (median / p95), query included")
+    for label, limit, repeats in (("limit=100", 100, args.pages), (f"export {args.rows}", args.rows, args.exports)):
+        results = {name: sorted(measure(engine, fn, limit, repeats)) for name, fn in (("legacy", legacy), ("fast", fast))}
+        p95 = lambda t: t[min(len(t) - 1, int(len(t) * 0.95))]
+        old, new = results["legacy"], results["fast"]
+        log.info(f"  {label:<14} legacy {statistics.median(old):7.1f} / {p95(old):7.1f}   "
+                 f"fast {statistics.median(new):7.1f} / {p95(new):7.1f}   "
+                 f"({statistics.median(old) / statistics.median(new):.1f}x)")
+
+if __name__ == "__main__":
+    main()
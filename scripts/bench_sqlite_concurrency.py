@@ -0,0 +1,117 @@
+"""
+Measure SQLite read throughput while a bulk insert is running.
+
+Runs the same workload twice against a scratch database file: once with
+SQLite's default settings and once with the tuned profile from
+app.core.database.configure_sqlite (WAL, synchronous=NORMAL, mmap, cache and
+busy timeout). One writer thread inserts businesses in small committed
+batches, like a scraper would, while reader threads run filtered
+GET /businesses style queries.
+
+    python scripts/bench_sqlite_concurrency.py --seed 50000 --readers 8 --duration 10
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import config
+from app.core.database import configure_sqlite
+from app.models import Base
+from app.models.contact import Business
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('bench-sqlite-concurrency')
+
+STATES = ["GA", "TN", "FL", "AL", "SC", "NC"]
+
+def business_rows(start: int, count: int) -> list[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Bench Roofing {i}",
+            "industry": "Roofing",
+            "city": f"City {i % 500}",
+            "state": STATES[i % len(STATES)],
+            "zip": f"{30000 + i % 1000:05d}",
+            "phone": f"404{i % 10000000:07d}",
+        }
+        for i in range(start, start + count)
+    ]
+
+def run(profile: str, path: str, seed: int, readers: int, duration: float, batch: int) -> dict:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 5}, pool_size=readers + 2)
+    if profile == "tuned":
+        configure_sqlite(engine, dict(config.sqlite, tuning=True))
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for start in range(0, seed, 10000):
+            conn.execute(insert(Business), business_rows(start, min(10000, seed - start)))
+
+    stop = threading.Event()
+    counts = {"reads": 0, "read_errors": 0, "writes": 0, "write_errors": 0}
+    lock = threading.Lock()
+
+    def writer():
+        next_id = seed
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(Business), business_rows(next_id, batch))
+                next_id += batch
+                with lock:
+                    counts["writes"] += batch
+            except OperationalError:
+                with lock:
+                    counts["write_errors"] += 1
+
+    def reader(n: int):
+        query = select(Business).where(Business.state.ilike(f"%{STATES[n % len(STATES)]}%")).limit(100)
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(query).all()
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                with lock:
+                    counts["read_errors"] += 1
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    counts["reads_per_sec"] = round(counts["reads"] / duration, 1)
+    counts["rows_written_per_sec"] = round(counts["writes"] / duration, 1)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=50000, help="Rows loaded before the timed run")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch", type=int, default=50, help="Rows per committed insert batch")
+    args = parser.parse_args()
+
+    for profile in ("default", "tuned"):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run(profile, os.path.join(tmp, "bench.db"), args.seed, args.readers, args.duration, args.batch)
+        log.info(f"{profile:>7}: {result}")
+
+if __name__ == "__main__":
+    main()
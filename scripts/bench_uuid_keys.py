@@ -0,0 +1,96 @@
+"""
+Compare insert throughput for random (v4) and time-ordered (v7) UUID keys.
+
+Loads the same number of business-shaped rows into two scratch tables, one
+keyed with uuid4 and one with the app's uuid7 generator, and reports rows/sec
+for each slice of the load plus the final primary key index size. Point it
+at Postgres to see the B-tree effect; the default is a 5M-row run.
+
+    python scripts/bench_uuid_keys.py --url postgresql://localhost/bizlist_bench --rows 5000000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import uuid
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, create_engine, insert, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models import uuid7
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('bench-uuid-keys')
+
+def scratch_table(metadata: MetaData, name: str) -> Table:
+    return Table(
+        name, metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("name", String(255), nullable=False),
+        Column("city", String(255)),
+        Column("state", String(255)),
+        Column("zip", String(20)),
+        Column("phone", String(20)),
+        Column("created", DateTime),
+    )
+
+def index_size(engine, table: Table) -> str:
+    if engine.dialect.name != "postgresql":
+        return "n/a"
+    with engine.connect() as conn:
+        size = conn.execute(text("SELECT pg_size_pretty(pg_indexes_size(:t))"), {"t": table.name}).scalar()
+    return size
+
+def load(engine, table: Table, make_key, rows: int, batch: int, report_every: int) -> float:
+    started = time.perf_counter()
+    window_start = started
+    window_rows = 0
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        values = [
+            {"id": make_key(), "name": f"Bench Roofing {i}", "city": f"City {i % 500}", "state": "GA", "zip": f"{30000 + i % 1000:05d}", "phone": f"404{i % 10000000:07d}"}
+            for i in range(start, start + count)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(table), values)
+        window_rows += count
+        if window_rows >= report_every or start + count == rows:
+            now = time.perf_counter()
+            log.info(f"  {table.name}: {start + count:>10} rows, {window_rows / (now - window_start):>10.0f} rows/sec")
+            window_start = now
+            window_rows = 0
+    return rows / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL", "sqlite:///bench_uuid_keys.db"))
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--report-every", type=int, default=500_000)
+    parser.add_argument("--keep", action="store_true", help="Leave the scratch tables in place")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    metadata = MetaData()
+    tables = {
+        "uuid4": (scratch_table(metadata, "bench_businesses_uuid4"), uuid.uuid4),
+        "uuid7": (scratch_table(metadata, "bench_businesses_uuid7"), uuid7),
+    }
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    try:
+        for label, (table, make_key) in tables.items():
+            log.info(f"Loading {args.rows} rows with {label} keys")
+            rate = load(engine, table, make_key, args.rows, args.batch, args.report_every)
+            log.info(f"{label}: {rate:.0f} rows/sec overall, primary key index {index_size(engine, table)}")
+    finally:
+        if not args.keep:
+            metadata.drop_all(engine)
+
+if __name__ == "__main__":
+    main()
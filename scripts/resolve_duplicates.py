@@ -0,0 +1,57 @@
+"""
+Find businesses that are the same company under different names.
+
+Runs the blocking entity resolver (app/services/resolver.py) over the
+database configured in .env and writes the merge clusters as JSON. Without
+--since or --ids every business is considered; with them only new businesses
+are, against the rows that share a phone, website domain or ZIP with them.
+Nothing is merged; review the clusters and merge from there.
+
+    python scripts/resolve_duplicates.py --output duplicates.json
+    python scripts/resolve_duplicates.py --since 2026-10-01T00:00:00
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from uuid import UUID
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db_engine
+from app.services.resolver import MAX_BLOCK_SIZE, resolve_all, resolve_new
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+log = logging.getLogger('resolve-duplicates')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only resolve businesses created at or after this time")
+    parser.add_argument("--ids", type=UUID, nargs="+", default=[], help="Only resolve these businesses")
+    parser.add_argument("--max-block-size", type=int, default=MAX_BLOCK_SIZE, help="Skip blocks with more businesses than this")
+    parser.add_argument("--output", help="Write the clusters here instead of stdout")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with Session(get_db_engine()) as db:
+        if args.since or args.ids:
+            result = resolve_new(db, since=args.since, business_ids=args.ids, max_block_size=args.max_block_size)
+        else:
+            result = resolve_all(db, max_block_size=args.max_block_size)
+    log.info(f"Resolved in {time.perf_counter() - started:.1f}s: {result['stats']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        log.info(f"Wrote {len(result['clusters'])} clusters to {args.output}")
+    else:
+        json.dump(result, sys.stdout, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import database
+from app.core.config import config
+from app.models.source import Source
+from app.services.source import source_registry
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    """Build the URL of a SQLite file in the test's temporary directory."""
+    def url(name: str) -> str:
+        return f"sqlite:///{tmp_path / name}.db"
+    return url
+
+@pytest.fixture
+def app_db(sqlite_url, monkeypatch):
+    """Point the app at an empty SQLite primary, with no replicas, instead of the .env database.
+
+    The engines are created on first use, so resetting the module globals is
+    enough for the next request to build fresh ones against the new URL."""
+    monkeypatch.setattr(config, "db_url", sqlite_url("primary"))
+    monkeypatch.setattr(config, "db_replica_urls", [])
+    for name in ("_engine", "_SessionLocal", "_async_engine", "_AsyncSessionLocal", "_replicas"):
+        monkeypatch.setattr(database, name, None)
+    monkeypatch.setattr(database, "_primary_pins", {})
+    source_registry.clear()
+    yield config.db_url
+    source_registry.clear()
+    if database._engine is not None:
+        database._engine.dispose()
+    for replica in database._replicas or []:
+        replica.engine.dispose()
+
+@pytest.fixture
+def client(app_db):
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def source(app_db):
+    """The name of a source that POST /businesses can attribute businesses to."""
+    db = database.get_sessionmaker()()
+    db.add(Source(name="Test Source"))
+    db.commit()
+    db.close()
+    return "Test Source"
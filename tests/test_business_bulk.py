@@ -0,0 +1,41 @@
+import json
+
+def ndjson(records: list) -> str:
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+def test_each_record_gets_an_outcome(client, source):
+    client.post("/businesses", json={"name": "Acme Roofing", "source": source})
+    body = ndjson([
+        {"name": "Bolt Electric", "source": source},
+        {"industry": "Roofing", "source": source},
+        {"name": "Acme Roofing", "source": source},
+        {"name": "Cedar Builders", "source": source},
+    ])
+    response = client.post("/businesses/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["created"], data["duplicate"], data["invalid"], data["failed"]) == (2, 1, 1, 0)
+    assert [result["status"] for result in data["results"]] == ["created", "invalid", "duplicate", "created"]
+    assert [result["index"] for result in data["results"]] == [0, 1, 2, 3]
+
+    names = [business["name"] for business in client.get("/businesses", params={"fields": "name"}).json()["data"]]
+    assert names == ["Acme Roofing", "Bolt Electric", "Cedar Builders"]
+
+def test_json_array_body(client, source):
+    body = json.dumps([{"name": "Bolt Electric", "source": source}, {"name": "Cedar Builders", "source": source}])
+    response = client.post("/businesses/bulk", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 200
+    assert response.json()["data"]["created"] == 2
+
+def test_malformed_ndjson_line_is_one_invalid_record(client, source):
+    body = ndjson([{"name": "Bolt Electric", "source": source}]) + '{"name": "Cedar\n' + ndjson([{"name": "Delta Plumbing", "source": source}])
+    response = client.post("/businesses/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["data"]["results"]] == ["created", "invalid", "created"]
+
+def test_records_before_a_broken_array_are_kept(client, source):
+    body = json.dumps([{"name": "Bolt Electric", "source": source}])[:-1] + ', {"name": "Cedar'
+    response = client.post("/businesses/bulk", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 400
+    assert response.json()["data"]["created"] == 1
+    assert [business["name"] for business in client.get("/businesses").json()["data"]] == ["Bolt Electric"]
@@ -0,0 +1,52 @@
+import pytest
+
+from app.services import changes
+
+NAMES = ["Acme Roofing", "Bolt Electric", "Cedar Builders"]
+
+@pytest.fixture(autouse=True)
+def no_settle_delay(monkeypatch):
+    # The feed normally trails now by a few seconds, for transactions still committing
+    monkeypatch.setattr(changes, "CHANGES_SETTLE_SECONDS", 0)
+
+def read_changes(client, since: str = None, **params) -> dict:
+    response = client.get("/businesses/changes", params={**params, **({"since": since} if since else {})})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+def test_feed_reports_inserts_then_tombstones(client, source):
+    ids = {name: client.post("/businesses", json={"name": name, "source": source}).json()["data"]["id"] for name in NAMES}
+
+    first = read_changes(client)
+    assert [(change["op"], change["business"]["name"]) for change in first["changes"]] == [("insert", name) for name in NAMES]
+    assert first["has_more"] is False
+
+    # One delete through each path; both record a tombstone
+    assert client.delete("/businesses/Acme Roofing").status_code == 204
+    assert client.request("DELETE", "/businesses", json={"ids": [ids["Cedar Builders"]]}).status_code == 200
+
+    second = read_changes(client, first["next"])
+    assert [(change["op"], change["id"], change["name"]) for change in second["changes"]] == [
+        ("delete", ids["Acme Roofing"], "Acme Roofing"),
+        ("delete", ids["Cedar Builders"], "Cedar Builders"),
+    ]
+
+    # Nothing new: the token comes back unchanged
+    third = read_changes(client, second["next"])
+    assert third["changes"] == [] and third["next"] == second["next"]
+
+def test_feed_pages_with_limit(client, source):
+    for name in NAMES:
+        client.post("/businesses", json={"name": name, "source": source})
+
+    page = read_changes(client, limit=2, fields="name")
+    assert [change["business"] for change in page["changes"]] == [{"name": name} for name in NAMES[:2]]
+    assert page["has_more"] is True
+    page = read_changes(client, page["next"], limit=2)
+    assert [change["business"]["name"] for change in page["changes"]] == NAMES[2:]
+    assert page["has_more"] is False
+
+def test_invalid_sync_token_is_a_400(client):
+    response = client.get("/businesses/changes", params={"since": "not-a-token"})
+    assert response.status_code == 400
+    assert "Invalid sync token" in response.json()["errors"][0]
@@ -0,0 +1,50 @@
+import pytest
+
+BUSINESSES = {"Acme Roofing": "Roofing", "Bolt Roofing": "Roofing", "Cedar Siding": "Siding"}
+
+@pytest.fixture
+def businesses(client, source) -> dict:
+    """{name: id} of three businesses, two of them in Roofing."""
+    ids = {}
+    for name, industry in BUSINESSES.items():
+        response = client.post("/businesses", json={"name": name, "industry": industry, "source": source})
+        assert response.status_code == 201
+        ids[name] = response.json()["data"]["id"]
+    return ids
+
+def bulk_delete(client, criteria: dict):
+    return client.request("DELETE", "/businesses", json=criteria)
+
+def remaining(client) -> list[str]:
+    return [business["name"] for business in client.get("/businesses").json()["data"]]
+
+@pytest.mark.parametrize("criteria", [{}, {"filters": {}}, {"dry_run": True}])
+def test_delete_without_criteria_is_refused(client, businesses, criteria):
+    response = bulk_delete(client, criteria)
+    assert response.status_code == 400
+    assert "deleting every business is not supported" in response.json()["errors"][0]
+    assert remaining(client) == sorted(BUSINESSES)
+
+def test_invalid_criteria_are_refused(client, businesses):
+    assert bulk_delete(client, {"filters": {"notes": "x"}}).status_code == 400
+    assert bulk_delete(client, {"source": "No Such Source"}).status_code == 400
+    assert remaining(client) == sorted(BUSINESSES)
+
+def test_dry_run_only_counts(client, businesses):
+    response = bulk_delete(client, {"filters": {"industry": "Roofing"}, "dry_run": True})
+    assert response.status_code == 200
+    assert response.json()["data"]["businesses"] == 2
+    assert response.json()["data"]["source_links"] == 2
+    assert remaining(client) == sorted(BUSINESSES)
+
+def test_delete_matching_businesses(client, businesses, source):
+    response = bulk_delete(client, {"source": source, "filters": {"industry": "Roofing"}})
+    assert response.status_code == 200
+    assert response.json()["data"]["businesses"] == 2
+    assert remaining(client) == ["Cedar Siding"]
+
+def test_delete_single_business(client, businesses):
+    assert client.delete("/businesses/Acme Roofing").status_code == 204
+    assert client.delete(f"/businesses/{businesses['Bolt Roofing']}").status_code == 204
+    assert client.delete("/businesses/Acme Roofing").status_code == 404
+    assert remaining(client) == ["Cedar Siding"]
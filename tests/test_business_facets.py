@@ -0,0 +1,28 @@
+def facets(client, by: str, **params) -> dict:
+    response = client.get("/businesses/facets", params={"by": by, **params})
+    assert response.status_code == 200
+    return {row[by]: row["count"] for row in response.json()["data"]["facets"]}
+
+def test_counts_follow_every_write(client, source):
+    for name, industry in (("Acme Roofing", "Roofing"), ("Bolt Roofing", "Roofing"), ("Cedar Siding", "Siding")):
+        assert client.post("/businesses", json={"name": name, "industry": industry, "source": source}).status_code == 201
+    assert facets(client, "industry") == {"Roofing": 2, "Siding": 1}
+
+    # An overwrite moves the business from one count to the other
+    client.post("/businesses?on_conflict=overwrite", json={"name": "Bolt Roofing", "industry": "Siding", "source": source})
+    assert facets(client, "industry") == {"Roofing": 1, "Siding": 2}
+
+    assert client.delete("/businesses/Acme Roofing").status_code == 204
+    assert client.request("DELETE", "/businesses", json={"filters": {"name": "Cedar Siding"}}).status_code == 200
+    assert facets(client, "industry") == {"Siding": 1}
+    assert facets(client, "source") == {source: 1}
+
+def test_filtered_counts(client, source):
+    client.post("/businesses", json={"name": "Acme Roofing", "industry": "Roofing", "email": "info@acme.com", "source": source})
+    client.post("/businesses", json={"name": "Bolt Roofing", "industry": "Roofing", "source": source})
+    assert facets(client, "has_email", industry="Roofing") == {True: 1, False: 1}
+
+def test_unknown_facet_is_a_400(client):
+    response = client.get("/businesses/facets", params={"by": "color"})
+    assert response.status_code == 400
+    assert client.get("/businesses/facets").status_code == 400
@@ -0,0 +1,27 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def businesses(client, source):
+    client.post("/businesses", json={"name": "Acme Roofing", "phone": "(404) 555-0101", "industry": "Roofing", "source": source})
+    client.post("/businesses", json={"name": "Bolt Electric", "source": source})
+
+def test_fields_select_only_those_columns(client):
+    response = client.get("/businesses", params={"fields": "name,phone"})
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"name": "Acme Roofing", "phone": "4045550101"}, {"name": "Bolt Electric", "phone": None}]
+
+def test_fields_page_by_cursor_without_the_sort_key(client):
+    first = client.get("/businesses", params={"fields": "phone", "limit": 1}).json()
+    assert first["data"] == [{"phone": "4045550101"}]
+    second = client.get("/businesses", params={"fields": "phone", "limit": 1, "cursor": first["next_cursor"]}).json()
+    assert second["data"] == [{"phone": None}] and second["next_cursor"] is None
+
+def test_fields_on_the_ndjson_stream(client):
+    response = client.get("/businesses", params={"fields": "name"}, headers={"accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.text.splitlines() == ['{"name":"Acme Roofing"}', '{"name":"Bolt Electric"}']
+
+def test_unknown_field_is_a_400(client):
+    response = client.get("/businesses", params={"fields": "name,name_key"})
+    assert response.status_code == 400
+    assert "Unknown fields ['name_key']" in response.json()["errors"][0]
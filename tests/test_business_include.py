@@ -0,0 +1,67 @@
+from app.core.audit import audit_queries
+from app.core.database import get_sessionmaker
+from app.models.contact import Business, Contact
+from app.models.joins import BusinessContact, BusinessSource
+from app.models.source import Source
+from app.services.formatter import Formatter
+
+BUSINESSES = 120
+
+def seed_businesses(count: int):
+    """Businesses with two sources and two contacts each."""
+    format = Formatter()
+    db = get_sessionmaker()()
+    try:
+        sources = [Source(name=f"Source {n}", url=f"https://source{n}.example.com") for n in range(3)]
+        db.add_all(sources)
+        for n in range(count):
+            name = f"Roofer {n:03d}"
+            business = Business(name=name, name_key=format.name_key(name), city="Atlanta", state="GA", zip="30301")
+            contacts = [Contact(first_name="Pat", last_name=f"Lee {n}-{m}", email=f"pat{n}-{m}@example.com") for m in range(2)]
+            db.add(business)
+            db.add_all(contacts)
+            db.flush()
+            db.add_all([BusinessSource(business_id=business.id, source_id=source.id) for source in sources[n % 2:n % 2 + 2]])
+            db.add_all([BusinessContact(business_id=business.id, contact_id=contact.id) for contact in contacts])
+        db.commit()
+    finally:
+        db.close()
+
+def test_include_runs_the_same_statements_at_any_page_size(client):
+    seed_businesses(BUSINESSES)
+    # The first request also loads per-process caches; only steady state is compared
+    assert client.get("/businesses?include=sources,contacts&limit=1").status_code == 200
+
+    statements = {}
+    for limit in (5, 50, 100):
+        with audit_queries(f"GET /businesses limit={limit}") as audit:
+            response = client.get(f"/businesses?include=sources,contacts&limit={limit}")
+        assert response.status_code == 200
+        businesses = response.json()["data"]
+        assert len(businesses) == limit
+        assert all(len(business["sources"]) == 2 and len(business["contacts"]) == 2 for business in businesses)
+        statements[limit] = audit.statements
+
+    # Sources and contacts are loaded per page, never per business
+    assert len(set(statements.values())) == 1, statements
+
+def test_read_business_by_id(client):
+    seed_businesses(1)
+    business_id = client.get("/businesses?limit=1").json()["data"][0]["id"]
+
+    response = client.get(f"/businesses/business/{business_id}")
+    assert response.status_code == 200
+    business = response.json()
+    assert business["id"] == business_id and business["name"] == "Roofer 000"
+    # Only the list fields; no lookup keys, coordinates or relationships unless asked for
+    assert "name_key" not in business and "latitude" not in business and "sources" not in business
+
+    response = client.get(f"/businesses/business/{business_id}?include=sources,contacts")
+    assert response.status_code == 200
+    business = response.json()
+    assert sorted(source["name"] for source in business["sources"]) == ["Source 0", "Source 1"]
+    assert len(business["contacts"]) == 2
+
+def test_read_business_by_id_not_found(client):
+    response = client.get("/businesses/business/01a1474e-c69e-724a-b433-4f1a266885ca")
+    assert response.status_code == 404
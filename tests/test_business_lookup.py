@@ -0,0 +1,28 @@
+import pytest
+
+@pytest.fixture
+def business_id(client, source) -> str:
+    response = client.post("/businesses", json={
+        "name": "A.B.C. Roofing, LLC", "phone": "(404) 555-0101", "website": "https://shop.abcroofing.com/contact",
+        "email": "Info@ABCRoofing.com", "source": source,
+    })
+    assert response.status_code == 201
+    return response.json()["data"]["id"]
+
+@pytest.mark.parametrize("path", [
+    "/businesses/by-phone/404.555.0101",
+    "/businesses/by-phone/+1 (404) 555-0101",
+    "/businesses/by-domain/abcroofing.com",
+    "/businesses/by-domain/www.abcroofing.com",
+    "/businesses/by-email/info@abcroofing.com",
+    "/businesses/by-name/ABC Roofing",
+])
+def test_lookup_ignores_formatting(client, business_id, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert [business["id"] for business in response.json()["data"]] == [business_id]
+
+def test_lookup_without_a_match(client, business_id):
+    response = client.get("/businesses/by-phone/404-555-0199")
+    assert response.status_code == 404
+    assert response.json()["data"] is None
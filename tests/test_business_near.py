@@ -0,0 +1,35 @@
+import pytest
+
+from app.core.database import get_sessionmaker
+from app.models.location import ZipCode
+
+@pytest.fixture
+def businesses(client, source):
+    """A business in Atlanta and one in Canton, about 29 miles north."""
+    db = get_sessionmaker()()
+    db.add_all([
+        ZipCode(zip="30301", city="Atlanta", state="GA", latitude=33.75, longitude=-84.39),
+        ZipCode(zip="30115", city="Canton", state="GA", latitude=34.17, longitude=-84.42),
+    ])
+    db.commit()
+    db.close()
+    for name, address in (("Acme Roofing", "1 Main St, Atlanta, GA 30301"), ("Canton Siding", "2 Oak St, Canton, GA 30115")):
+        assert client.post("/businesses", json={"name": name, "address": address, "source": source}).status_code == 201
+
+def near(client, **params):
+    response = client.get("/businesses/near", params={"fields": "name", **params})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+def test_radius_limits_and_orders_by_distance(client, businesses):
+    assert near(client, zip="30301", radius=10) == [{"name": "Acme Roofing", "distance": 0.0}]
+    within = near(client, zip="30301", radius=50)
+    assert [business["name"] for business in within] == ["Acme Roofing", "Canton Siding"]
+    assert 28 < within[1]["distance"] < 30
+
+def test_center_from_coordinates(client, businesses):
+    assert [business["name"] for business in near(client, lat=34.17, lon=-84.42, radius=10)] == ["Canton Siding"]
+
+@pytest.mark.parametrize("params", [{"zip": "30301", "radius": 0}, {"zip": "30301", "radius": 1000}, {"radius": 10}])
+def test_invalid_search_is_a_400(client, businesses, params):
+    assert client.get("/businesses/near", params=params).status_code == 400
@@ -0,0 +1,33 @@
+NAMES = ["Acme Roofing", "Bolt Electric", "Cedar Builders", "Delta Plumbing", "Eagle Siding", "Fox Gutters", "Granite Works"]
+
+def test_cursor_pages_cover_every_business_once(client, source):
+    for name in NAMES:
+        assert client.post("/businesses", json={"name": name, "source": source}).status_code == 201
+
+    names, cursor, pages = [], None, 0
+    while True:
+        response = client.get("/businesses", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        names += [business["name"] for business in body["data"]]
+        cursor, pages = body["next_cursor"], pages + 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == sorted(NAMES)
+
+def test_cursor_page_matches_offset_page(client, source):
+    for name in NAMES:
+        client.post("/businesses", json={"name": name, "source": source})
+
+    cursor = client.get("/businesses", params={"limit": 2}).json()["next_cursor"]
+    by_cursor = client.get("/businesses", params={"limit": 2, "cursor": cursor}).json()["data"]
+    by_skip = client.get("/businesses", params={"limit": 2, "skip": 2}).json()["data"]
+    assert by_cursor == by_skip
+
+def test_invalid_cursor_is_a_400(client):
+    response = client.get("/businesses", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["status"] == "error"
+    assert "Invalid cursor" in response.json()["errors"][0]
@@ -0,0 +1,56 @@
+import pytest
+
+NAME = "Acme Roofing"
+
+@pytest.fixture
+def business(client, source):
+    """An existing business with an industry and phone but no email."""
+    response = client.post("/businesses", json={"name": NAME, "industry": "Roofing", "phone": "(404) 555-0101", "source": source})
+    assert response.status_code == 201
+    return response.json()["data"]
+
+def upsert(client, source, on_conflict: str):
+    return client.post(f"/businesses?on_conflict={on_conflict}",
+                       json={"name": NAME, "industry": "Siding", "email": "info@acme.com", "source": source})
+
+def stored(client) -> dict:
+    response = client.get(f"/businesses/{NAME}")
+    assert response.status_code == 200
+    return response.json()
+
+def test_keep_leaves_the_business_as_is(client, source, business):
+    response = upsert(client, source, "keep")
+    assert response.status_code == 200
+    assert response.json()["data"]["action"] == "unchanged"
+    assert response.json()["data"]["id"] == business["id"]
+    after = stored(client)
+    assert after["industry"] == "Roofing" and not after["email"]
+
+def test_fill_sets_only_empty_fields(client, source, business):
+    response = upsert(client, source, "fill")
+    assert response.status_code == 200
+    assert response.json()["data"]["action"] == "updated"
+    after = stored(client)
+    assert (after["industry"], after["email"]) == ("Roofing", "info@acme.com")
+    # The lookup key follows the filled email
+    assert client.get("/businesses/by-email/INFO@acme.com").json()["data"][0]["id"] == business["id"]
+
+def test_overwrite_replaces_fields_the_record_has(client, source, business):
+    response = upsert(client, source, "overwrite")
+    assert response.status_code == 200
+    assert response.json()["data"]["action"] == "updated"
+    after = stored(client)
+    assert (after["industry"], after["email"]) == ("Siding", "info@acme.com")
+    # The incoming record has no phone, so the stored one stays
+    assert after["phone"] == business["phone"]
+
+def test_upsert_creates_a_missing_business(client, source):
+    response = upsert(client, source, "fill")
+    assert response.status_code == 201
+    assert response.json()["data"]["action"] == "created"
+
+def test_conflict_without_a_policy(client, source, business):
+    response = client.post("/businesses", json={"name": NAME, "source": source})
+    assert response.status_code == 409
+    response = upsert(client, source, "merge")
+    assert response.status_code == 400
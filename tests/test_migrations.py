@@ -0,0 +1,145 @@
+import uuid
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+from app.core.config import config
+from app.services.formatter import Formatter
+
+# The last revision before the business lookup, facet, change feed and geo work. The
+# revisions up to it were generated against Postgres and can't build a SQLite database
+# from empty, so the test starts from that revision's schema, frozen below.
+PRE_BACKLOG_REVISION = '208f379e48f6'
+
+metadata = sa.MetaData()
+sa.Table(
+    'businesses', metadata,
+    sa.Column('id', sa.Uuid, primary_key=True),
+    sa.Column('name', sa.String(255), unique=True, nullable=False),
+    sa.Column('industry', sa.String(255)),
+    sa.Column('address', sa.String(255)),
+    sa.Column('address2', sa.String(255)),
+    sa.Column('city', sa.String(255)),
+    sa.Column('state', sa.String(255)),
+    sa.Column('zip', sa.String(20)),
+    sa.Column('phone', sa.String(20)),
+    sa.Column('website', sa.String(255)),
+    sa.Column('email', sa.String(255)),
+    sa.Column('notes', sa.String),
+    sa.Column('created', sa.DateTime),
+    sa.Column('updated', sa.DateTime),
+)
+sa.Table(
+    'sources', metadata,
+    sa.Column('id', sa.Uuid, primary_key=True),
+    sa.Column('name', sa.String(255), unique=True, nullable=False),
+    sa.Column('url', sa.String(255), unique=True),
+    sa.Column('notes', sa.String),
+)
+sa.Table(
+    'contacts', metadata,
+    sa.Column('id', sa.Uuid, primary_key=True),
+    sa.Column('first_name', sa.String(255), nullable=False),
+    sa.Column('last_name', sa.String(255), nullable=False),
+    sa.Column('email', sa.String(255), unique=True),
+    sa.Column('phone', sa.String(20)),
+    sa.Column('title', sa.String(255)),
+    sa.Column('notes', sa.String),
+)
+# Join tables still had a surrogate id then
+for table, keys in (
+    ('business_sources', {'business_id': 'businesses.id', 'source_id': 'sources.id'}),
+    ('source_contacts', {'source_id': 'sources.id', 'contact_id': 'contacts.id'}),
+    ('business_contacts', {'business_id': 'businesses.id', 'contact_id': 'contacts.id'}),
+):
+    sa.Table(
+        table, metadata,
+        sa.Column('id', sa.Uuid, primary_key=True),
+        *(sa.Column(column, sa.Uuid, sa.ForeignKey(target), nullable=False) for column, target in keys.items()),
+    )
+sa.Table(
+    'zip_codes', metadata,
+    sa.Column('zip', sa.String, primary_key=True),
+    sa.Column('plus4', sa.Integer),
+    sa.Column('city', sa.String, nullable=False),
+    sa.Column('state', sa.String, nullable=False),
+    sa.Column('county', sa.String),
+    sa.Column('latitude', sa.Float),
+    sa.Column('longitude', sa.Float),
+    sa.Column('timezone', sa.String),
+    sa.Column('google_cid', sa.String),
+)
+
+BUSINESS = {
+    'id': uuid.uuid4(), 'name': 'A.B.C. Roofing, LLC', 'industry': 'Roofing', 'state': 'GA', 'zip': '30301-1234',
+    'phone': '(404) 555-0101', 'website': 'https://shop.abcroofing.com/', 'email': 'Info@ABCRoofing.com',
+}
+
+@pytest.fixture
+def pre_backlog_db(sqlite_url, monkeypatch):
+    """A SQLite database at PRE_BACKLOG_REVISION with a business, a duplicated source link and a ZIP centroid."""
+    url = sqlite_url("migrations")
+    engine = sa.create_engine(url)
+    metadata.create_all(engine)
+    source_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(metadata.tables['businesses'].insert(), BUSINESS)
+        conn.execute(metadata.tables['sources'].insert(), {'id': source_id, 'name': 'Owens Corning'})
+        conn.execute(metadata.tables['business_sources'].insert(), [
+            {'id': uuid.uuid4(), 'business_id': BUSINESS['id'], 'source_id': source_id} for _ in range(2)
+        ])
+        conn.execute(metadata.tables['zip_codes'].insert(), {
+            'zip': '30301', 'city': 'Atlanta', 'state': 'GA', 'latitude': 33.75, 'longitude': -84.39,
+        })
+    engine.dispose()
+    # alembic/env.py reads the URL from the environment
+    monkeypatch.setenv("DATABASE_URL", url)
+    alembic_config = Config(f"{config.root_dir}/alembic.ini")
+    alembic_config.set_main_option("script_location", f"{config.root_dir}/alembic")
+    command.stamp(alembic_config, PRE_BACKLOG_REVISION)
+    return url, alembic_config
+
+def inspect(url: str):
+    engine = sa.create_engine(url)
+    inspector = sa.inspect(engine)
+    columns = {column['name'] for column in inspector.get_columns('businesses')}
+    indexes = {index['name'] for index in inspector.get_indexes('businesses')}
+    with engine.connect() as conn:
+        business = conn.execute(sa.text("SELECT * FROM businesses")).mappings().one()
+        links = conn.execute(sa.text("SELECT count(*) FROM business_sources")).scalar()
+    engine.dispose()
+    return columns, indexes, business, links
+
+def test_upgrade_to_head(pre_backlog_db):
+    url, alembic_config = pre_backlog_db
+    format = Formatter()
+
+    # Each revision adds only the columns it shipped with, whatever the models have since
+    command.upgrade(alembic_config, 'd5e8f2a6c391')
+    columns, indexes, business, _ = inspect(url)
+    assert {'phone_key', 'domain_key', 'email_key', 'name_key'} <= columns
+    assert 'zip_key' not in columns and 'ix_businesses_zip_key' not in indexes
+    assert business['phone_key'] == format.phone_key(BUSINESS['phone'])
+    assert business['domain_key'] == format.domain_key(BUSINESS['website'])
+    assert business['email_key'] == format.email_key(BUSINESS['email'])
+    assert business['name_key'] == format.name_key(BUSINESS['name'])
+
+    command.upgrade(alembic_config, 'head')
+    columns, indexes, business, links = inspect(url)
+    assert {'zip_key', 'latitude', 'longitude', 'geo_cell'} <= columns
+    assert 'ix_businesses_zip_key_name_key' in indexes and 'ix_businesses_zip_key' not in indexes
+    assert business['zip_key'] == '30301'
+    assert (business['latitude'], business['longitude']) == (33.75, -84.39)
+    assert business['geo_cell'] is not None
+    # Join tables are keyed on their foreign key pair, so the duplicate link is gone
+    assert links == 1
+
+def test_downgrade_to_pre_backlog(pre_backlog_db):
+    url, alembic_config = pre_backlog_db
+    command.upgrade(alembic_config, 'head')
+    command.downgrade(alembic_config, PRE_BACKLOG_REVISION)
+    columns, indexes, _, links = inspect(url)
+    assert not {'phone_key', 'zip_key', 'latitude', 'geo_cell'} & columns
+    assert links == 1
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import config
+from app.core.middleware import QueryAuditMiddleware
+
+@pytest.fixture
+def audited_app(sqlite_url):
+    """An app whose one route runs a statement `n` times and swallows any error, as a careless service would."""
+    engine = create_engine(sqlite_url("audit"))
+    app = FastAPI()
+    app.add_middleware(QueryAuditMiddleware)
+
+    @app.get("/repeat/{n}")
+    def repeat(n: int):
+        try:
+            with engine.connect() as conn:
+                for _ in range(n):
+                    conn.execute(text("SELECT 1"))
+        except Exception:
+            pass
+        return {"status": "success"}
+
+    yield TestClient(app)
+    engine.dispose()
+
+def audit_mode(monkeypatch, mode: str):
+    monkeypatch.setattr(config, "query_audit", {"mode": mode, "max_statements": 50, "max_repeats": 5})
+
+def test_raise_mode_fails_the_request(audited_app, monkeypatch):
+    audit_mode(monkeypatch, "raise")
+    response = audited_app.get("/repeat/3")
+    assert response.status_code == 200
+    assert response.headers["x-query-count"] == "3"
+
+    # The route caught the QueryAuditError, yet the client still gets the 500
+    response = audited_app.get("/repeat/10")
+    assert response.status_code == 500
+    assert response.json()["status"] == "error"
+    assert "Statement ran more than 5 times" in response.json()["errors"][0]
+
+def test_log_mode_only_counts(audited_app, monkeypatch):
+    audit_mode(monkeypatch, "log")
+    response = audited_app.get("/repeat/10")
+    assert response.status_code == 200
+    assert response.headers["x-query-count"] == "10"
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.config import config
+from app.models import Base
+from app.models.contact import Business
+
+NAME = "Acme Roofing"
+PIN_SECONDS = 1.0
+
+def seed(url: str, industry: str = None):
+    """Create the schema in a SQLite stand-in, with an Acme Roofing in `industry` if given."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    if industry is not None:
+        with Session(engine) as db:
+            db.add(Business(name=NAME, name_key="acme roofing", industry=industry))
+            db.commit()
+    engine.dispose()
+
+def industries(url: str) -> list[str]:
+    engine = create_engine(url)
+    with Session(engine) as db:
+        result = db.scalars(select(Business.industry).where(Business.name == NAME)).all()
+    engine.dispose()
+    return result
+
+@pytest.fixture
+def replicas(source, sqlite_url, monkeypatch):
+    """Two replica stand-ins that each hold an Acme Roofing the primary doesn't have.
+
+    The replicas are never synced, so a response's industry tells which database served it."""
+    urls = [sqlite_url("replica_a"), sqlite_url("replica_b")]
+    seed(urls[0], "Replica A")
+    seed(urls[1], "Replica B")
+    monkeypatch.setattr(config, "db_replica_urls", urls)
+    monkeypatch.setattr(config, "db_primary_pin_seconds", PIN_SECONDS)
+    return urls
+
+def read_industry(client, session: str) -> str:
+    response = client.get(f"/businesses/by-name/{NAME}", headers={"x-client-session": session})
+    assert response.status_code == 200
+    businesses = response.json()["data"]
+    assert len(businesses) == 1
+    return businesses[0]["industry"]
+
+def test_reads_round_robin_across_replicas(client, replicas):
+    served = [read_industry(client, "reader") for _ in range(4)]
+    assert set(served) == {"Replica A", "Replica B"}
+    assert served[0] != served[1] and served[::2] == served[:1] * 2
+
+def test_writes_go_to_the_primary(client, replicas, source):
+    response = client.post("/businesses", json={"name": NAME, "industry": "Primary", "source": source},
+                           headers={"x-client-session": "writer"})
+    assert response.status_code == 201
+    assert industries(config.db_url) == ["Primary"]
+    assert industries(replicas[0]) == ["Replica A"]
+    assert industries(replicas[1]) == ["Replica B"]
+
+def test_reads_pinned_to_the_primary_after_a_write(client, replicas, source):
+    response = client.post("/businesses", json={"name": NAME, "industry": "Primary", "source": source},
+                           headers={"x-client-session": "writer"})
+    assert response.status_code == 201
+
+    # The writer reads its own write for the pin window; other clients keep using the replicas
+    assert [read_industry(client, "writer") for _ in range(3)] == ["Primary"] * 3
+    assert read_industry(client, "reader") in ("Replica A", "Replica B")
+
+    time.sleep(PIN_SECONDS + 0.1)
+    assert {read_industry(client, "writer") for _ in range(2)} == {"Replica A", "Replica B"}